@@ -1,6 +1,6 @@
 import sys
 import os
-from PySide6.QtWidgets import QApplication  # Import QApplication
+import time
 
 # Get the project root directory.
 # The directory containing run.py (PROJECT_ROOT) is automatically added to sys.path
@@ -8,12 +8,56 @@ from PySide6.QtWidgets import QApplication  # Import QApplication
 PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
 SRC_DIR = os.path.join(PROJECT_ROOT, 'src')
 
-# Now we import App from main_app, treating src as a package
-from src.main_app import App
+# When set, the time the window first shows is written to this file and the app quits
+# (scripts/build.py uses it to measure startup of a bundle)
+STARTUP_PROBE_ENV = 'COUNTDOWN_STARTUP_PROBE'
+
+
+def forward_to_running_app(address, launch_commands):
+    # Hands this launch's requests to the app that is already running; -> exit status
+    from src.core.single_instance import forward
+    try:
+        replies = forward(address, launch_commands)
+    except (OSError, ValueError) as e:
+        print(f"Countdown Timer is already running but did not answer: {e}", file=sys.stderr)
+        return 1
+    failed = [reply for reply in replies if not reply.get("ok")]
+    for reply in failed:
+        print(reply.get("error", "request failed"), file=sys.stderr)
+    return 1 if failed else 0
+
 
 if __name__ == "__main__":
+    # A second launch only needs the standard library: it finds the running app on the
+    # single-instance endpoint, forwards its requests and exits before Qt is even imported
+    from src.core.launch import parse_launch_args
+    from src.core.single_instance import claim, instance_address
+    launch_commands, qt_args = parse_launch_args(sys.argv[1:])
+    address = instance_address()
+    try:
+        listener = claim(address)
+    except OSError as e:
+        print(f"Cannot claim {address}, starting without the single-instance check: {e}")
+        listener = False
+    if listener is None:
+        sys.exit(forward_to_running_app(address, launch_commands))
+
+    from PySide6.QtCore import QTimer
+    from PySide6.QtWidgets import QApplication  # Import QApplication
     # If this script is executed directly, create and run the application
-    q_app = QApplication(sys.argv)  # Create QApplication instance first
+    q_app = QApplication(sys.argv[:1] + qt_args)  # Create QApplication instance first; it takes the options run.py does not know
+    # The app's modules are imported once the QApplication exists; modules only needed
+    # later (dialogs, NumPy, ...) are imported on first use, see scripts/import_report.py
+    from src.main_app import App
     window = App()
-    window.show()  # QMainWindow needs to be explicitly shown
+    window.apply_launch_commands(launch_commands)  # Shows the window (QMainWindow needs to be explicitly shown)
+    if listener:
+        window.serve_launch_requests(listener, address)
+    probe_file = os.environ.get(STARTUP_PROBE_ENV)
+    if probe_file:
+        def report_first_window():
+            with open(probe_file, 'w') as f:
+                f.write(repr(time.time()))
+            q_app.quit()
+        QTimer.singleShot(0, report_first_window) # Runs once the show has been processed
     sys.exit(q_app.exec())  # Start the Qt event loop
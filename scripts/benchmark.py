@@ -0,0 +1,321 @@
+import argparse
+import json
+import os
+import platform
+import random
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Headless benchmark suite. Each scenario generates a synthetic board (a timer count, with or
+# without large HTML comments), starts the app on it under Qt's offscreen platform with a
+# simulated clock, and times the operations that scale with the board. Scenarios run in their
+# own process so one scenario's caches and heap never flatter the next.
+#
+#   python -m scripts.benchmark --output results.json
+#   python -m scripts.benchmark --baseline scripts/benchmark_baseline.json   # exit 1 on regressions
+#
+# Times are wall-clock milliseconds (the median of --repeat runs); tick_cpu_ms is process CPU
+# time per steady-state tick. A full run takes several minutes, mostly in the 10,000-timer
+# scenarios; --counts 10 1000 gives a quick check.
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+RESULTS_VERSION = 1
+DEFAULT_COUNTS = (10, 1000, 10000)
+DEFAULT_REPEAT = 3
+DEFAULT_TICKS = 200
+DEFAULT_TOLERANCE = 0.25 # A metric regresses when it is this much slower than the baseline...
+DEFAULT_MIN_DELTA_MS = 2.0 # ...and at least this many ms slower, so tiny timings don't flap
+COMMENT_TARGET_BYTES = 8 * 1024 # Size of each "large" HTML comment
+SEED = 20250301
+CLOCK_START = datetime(2025, 3, 1, 9, 30) # Fixed so countdown values are the same on every run
+GROUP_NAMES = ("Work", "Home", "Travel", "Finance")
+PALETTE = ("#4A90E2", "#50E3C2", "#B8E986", "#F5A623", "#D0021B", "#9013FE", "#417505", "#8B572A")
+METRICS = ("load_ms", "create_cards_ms", "save_ms", "drag_reorder_ms", "dialog_open_cold_ms",
+           "dialog_open_ms", "tick_cpu_ms")
+
+
+def scenario_name(count, html_comments):
+    return f"{count}-{'html' if html_comments else 'plain'}"
+
+
+def html_comment(rng, index):
+    # Rich-text comment of roughly COMMENT_TARGET_BYTES, shaped like the editor's output
+    parts = ["<html><body>", f"<h3>Notes for timer {index}</h3>"]
+    size = 0
+    while size < COMMENT_TARGET_BYTES:
+        words = " ".join(rng.choice(("agenda", "review", "deadline", "budget", "follow-up", "draft",
+                                     "meeting", "milestone", "owner", "status")) for _ in range(40))
+        part = (f'<p style="margin:0px; color:{rng.choice(PALETTE)};"><b>Item {size}</b> {words}</p>'
+                f'<ul><li>{words[:80]}</li><li><i>{words[80:160]}</i></li></ul>')
+        parts.append(part)
+        size += len(part)
+    parts.append("</body></html>")
+    return "".join(parts)
+
+
+def synthetic_config(count, html_comments, seed=SEED):
+    # Deterministic board document: mixed past and future dates, a few groups, recurring and
+    # business-day timers, like a long-lived real config
+    rng = random.Random(seed)
+    today = CLOCK_START.date()
+    timers = {}
+    for index in range(count):
+        end_date = today + timedelta(days=rng.randint(-30, 400))
+        config = {
+            "title": f"Timer {index} {rng.choice(('Launch', 'Renewal', 'Trip', 'Review', 'Payment'))}",
+            "end_date": end_date.strftime("%Y-%m-%d 00:00:00"),
+            "comment": html_comment(rng, index) if html_comments else "",
+            "bg_color_title": rng.choice(PALETTE),
+            "bg_color_time": rng.choice(PALETTE),
+            "text_color_time": "#FFFFFF",
+            "font_size_time": 20,
+            "sort_order": index,
+        }
+        roll = rng.random()
+        if roll < 0.1:
+            config["recurrence"] = {"freq": rng.choice(("weekly", "monthly", "yearly")), "interval": 1}
+        elif roll < 0.2:
+            config["count_mode"] = "business"
+        if rng.random() < 0.3:
+            config["group"] = rng.choice(GROUP_NAMES)
+        timers[f"timer_{index:06d}"] = config
+    return {"schema_version": 2, "global_settings": {"groups": list(GROUP_NAMES)}, "timers": timers}
+
+
+def _median_ms(samples):
+    return round(statistics.median(samples) * 1000.0, 3)
+
+
+def _timed(callback, repeat, between=None):
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        callback()
+        samples.append(time.perf_counter() - start)
+        if between is not None:
+            between()
+    return _median_ms(samples)
+
+
+def run_scenario(count, html_comments, repeat, ticks):
+    # Runs in a fresh process; returns {metric: value} for one scenario
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    from PySide6.QtCore import QMimeData, QPointF, Qt
+    from PySide6.QtGui import QDropEvent
+    from PySide6.QtWidgets import QApplication
+
+    from src import main_app
+    from src.components.timer_card import TimerCard
+    from src.core.clock import SimulatedClock
+
+    qt_app = QApplication.instance() or QApplication([])
+    data_dir = tempfile.mkdtemp(prefix="countdown-bench-")
+    try:
+        main_app.CONFIG_FILE = os.path.join(data_dir, "timers_config.json")
+        main_app.HOLIDAY_FILE = os.path.join(data_dir, "holidays.json") # None there: no local holidays
+        serialized = json.dumps(synthetic_config(count, html_comments), indent=4)
+        with open(main_app.CONFIG_FILE, 'w') as f:
+            f.write(serialized)
+
+        start = time.perf_counter()
+        window = main_app.App(clock=SimulatedClock(CLOCK_START))
+        window.show()
+        qt_app.processEvents()
+        results = {"timers": count, "html_comments": html_comments, "config_bytes": len(serialized),
+                   "startup_ms": round((time.perf_counter() - start) * 1000.0, 3)}
+
+        # Each load replaces the records; the pending reset is delivered once, after the loop
+        results["load_ms"] = _timed(window.load_app_settings_and_timers, repeat)
+        window.timer_store.flush()
+        qt_app.processEvents()
+        # Rebuilds and drops are timed until the board has settled, i.e. including the deferred
+        # deletion of the old cards and the relayout, which the user waits for as well
+        def rebuild_board():
+            window.create_timer_cards()
+            qt_app.processEvents()
+        results["create_cards_ms"] = _timed(rebuild_board, repeat)
+        results["save_ms"] = _timed(window.save_app_settings_and_timers, repeat)
+
+        # Drop the last ungrouped card at the top of the board, as a mouse drag would
+        def drag_reorder():
+            layout = window.timers_layout
+            cards = [layout.itemAt(i).widget() for i in range(layout.count())]
+            source = [card for card in cards if isinstance(card, TimerCard)][-1]
+            mime_data = QMimeData()
+            mime_data.setText(source.card_id)
+            event = QDropEvent(QPointF(10, 0), Qt.DropAction.MoveAction, mime_data,
+                               Qt.MouseButton.LeftButton, Qt.KeyboardModifier.NoModifier)
+            window.dropEvent(event)
+            qt_app.processEvents()
+        results["drag_reorder_ms"] = _timed(drag_reorder, repeat)
+
+        # Opening the settings dialog for a card: the first open builds the shared dialog
+        card = next(iter(window.timers.values()))
+        def open_dialog():
+            dialog = window.get_timer_settings_dialog()
+            dialog.bind(card)
+            dialog.show()
+            qt_app.processEvents()
+        def close_dialog():
+            dialog = window.get_timer_settings_dialog()
+            dialog.hide()
+            dialog.unbind()
+        if window.timer_settings_dialog is not None: # Pre-warmed during startup
+            window.timer_settings_dialog.deleteLater()
+            window.timer_settings_dialog = None
+        results["dialog_open_cold_ms"] = _timed(open_dialog, 1, close_dialog)
+        results["dialog_open_ms"] = _timed(open_dialog, repeat, close_dialog)
+
+        # Steady-state ticks: the clock moves a second at a time, so no countdown changes
+        cpu_start = time.process_time()
+        for _ in range(ticks):
+            window.clock.advance(seconds=1)
+        results["tick_cpu_ms"] = round((time.process_time() - cpu_start) * 1000.0 / ticks, 4)
+
+        # The figures the diagnostics panel's Memory button shows, for the README's table; the
+        # board holds fewer cards than timers once ended timers are archived
+        from src.core.memory import memory_report
+        memory = memory_report(window, measure_rebuild=True)
+        results["memory_cards"] = memory["rebuild"]["cards"]
+        results["heap_per_timer_bytes"] = round(memory["rebuild"]["bytes_per_timer"])
+        results["qobjects_per_timer"] = round(memory["qobjects_per_timer"], 2)
+
+        window.close()
+        return results
+    finally:
+        shutil.rmtree(data_dir, ignore_errors=True) # The config, snapshots and assets the run wrote
+
+
+def environment():
+    try:
+        import PySide6
+        qt_version = PySide6.__version__
+    except ImportError:
+        qt_version = None
+    try:
+        import numpy
+        numpy_version = numpy.__version__
+    except ImportError:
+        numpy_version = None
+    return {
+        "python": platform.python_version(),
+        "pyside6": qt_version,
+        "numpy": numpy_version,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+    }
+
+
+def run_all(counts, comment_modes, repeat, ticks):
+    scenarios = {}
+    for count in counts:
+        for html_comments in comment_modes:
+            name = scenario_name(count, html_comments)
+            print(f"Running {name}...", file=sys.stderr)
+            with tempfile.TemporaryDirectory() as temp_dir:
+                output = os.path.join(temp_dir, "scenario.json")
+                command = [sys.executable, "-m", "scripts.benchmark", "--scenario", name,
+                           "--repeat", str(repeat), "--ticks", str(ticks), "--output", output]
+                completed = subprocess.run(command, cwd=project_root, stdout=subprocess.DEVNULL)
+                if completed.returncode != 0:
+                    print(f"Scenario {name} failed with exit code {completed.returncode}", file=sys.stderr)
+                    continue
+                with open(output, 'r') as f:
+                    scenarios[name] = json.load(f)
+    return {"version": RESULTS_VERSION, "created": datetime.now().isoformat(timespec="seconds"),
+            "environment": environment(), "scenarios": scenarios}
+
+
+def compare(results, baseline, tolerance=DEFAULT_TOLERANCE, min_delta_ms=DEFAULT_MIN_DELTA_MS):
+    # -> list of (scenario, metric, baseline value, current value) that regressed. Scenarios
+    # or metrics missing on either side are not compared.
+    regressions = []
+    for name, expected in baseline.get("scenarios", {}).items():
+        current = results.get("scenarios", {}).get(name)
+        if current is None:
+            continue
+        for metric in METRICS:
+            before, after = expected.get(metric), current.get(metric)
+            if before is None or after is None:
+                continue
+            if after > before * (1.0 + tolerance) and after - before >= min_delta_ms:
+                regressions.append((name, metric, before, after))
+    return regressions
+
+
+def print_table(results, baseline=None):
+    # Summary on stderr, so stdout stays valid JSON without --output
+    header = f"{'scenario':<12}" + "".join(f"{metric:>22}" for metric in METRICS)
+    print(header, file=sys.stderr)
+    for name, values in results["scenarios"].items():
+        row = f"{name:<12}"
+        for metric in METRICS:
+            value = values.get(metric)
+            cell = "-" if value is None else f"{value:.2f}"
+            before = (baseline or {}).get("scenarios", {}).get(name, {}).get(metric)
+            if value is not None and before:
+                cell += f" ({(value - before) / before:+.0%})"
+            row += f"{cell:>22}"
+        print(row, file=sys.stderr)
+
+
+def parse_scenario(name):
+    count, _, mode = name.partition("-")
+    return int(count), mode == "html"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless performance benchmarks for the countdown timer app.")
+    parser.add_argument("--counts", type=int, nargs="+", default=list(DEFAULT_COUNTS), help="timer counts to generate")
+    parser.add_argument("--comments", choices=("plain", "html", "both"), default="both",
+                        help="whether timers carry large HTML comments")
+    parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="runs per timed operation (median is kept)")
+    parser.add_argument("--ticks", type=int, default=DEFAULT_TICKS, help="steady-state ticks to average")
+    parser.add_argument("--output", help="write results JSON here (default: stdout)")
+    parser.add_argument("--baseline", help="results JSON to compare against; exits 1 on regressions")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="allowed slowdown as a fraction of the baseline")
+    parser.add_argument("--min-delta-ms", type=float, default=DEFAULT_MIN_DELTA_MS,
+                        help="slowdowns smaller than this are never regressions")
+    parser.add_argument("--scenario", help=argparse.SUPPRESS) # Internal: run one scenario in this process
+    args = parser.parse_args(argv)
+
+    if args.scenario:
+        count, html_comments = parse_scenario(args.scenario)
+        results = run_scenario(count, html_comments, args.repeat, args.ticks)
+        with open(args.output, 'w') as f:
+            json.dump(results, f)
+        return 0
+
+    comment_modes = {"plain": (False,), "html": (True,), "both": (False, True)}[args.comments]
+    results = run_all(args.counts, comment_modes, args.repeat, args.ticks)
+    serialized = json.dumps(results, indent=4)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(serialized + "\n")
+    else:
+        print(serialized)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)
+    print_table(results, baseline)
+    if baseline is None:
+        return 0
+    regressions = compare(results, baseline, args.tolerance, args.min_delta_ms)
+    for name, metric, before, after in regressions:
+        print(f"REGRESSION {name} {metric}: {before:.2f} -> {after:.2f} ms", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
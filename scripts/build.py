@@ -1,7 +1,17 @@
 import PyInstaller.__main__
+import argparse
+import ast
+import glob
+import importlib
+import importlib.machinery
 import os
+import re
 import shutil
+import statistics
+import subprocess
 import sys
+import tempfile
+import time
 
 # Determine the project root directory (one level up from the scripts directory)
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
@@ -36,17 +46,220 @@ pyinstaller_args = [
     # '--noconfirm', # Overwrite output directory without asking
 ]
 
-# Add the main script to the arguments
-pyinstaller_args.append(main_script)
+# Slim profile: only the Qt modules run.py and src/ import (plus what those load themselves)
+# are bundled, and only the plugin types a Qt Widgets app uses. Everything else PySide6 ships
+# (QtNetwork, QtQml, QtWebEngine, ...) is excluded, which shrinks the bundle and the amount of
+# code the loader has to map at startup.
+SLIM_QT_PLUGIN_DIRS = (
+    'platforms', 'platformthemes', 'platforminputcontexts', 'styles', 'imageformats', 'iconengines',
+    'xcbglintegrations', 'wayland-decoration-client', 'wayland-graphics-integration-client',
+    'wayland-shell-integration',
+)
+# Plugins of the kept types that need Qt libraries the app otherwise never loads (QtPdf,
+# EGLFS, ...) or read formats nobody pastes into a comment; matched without 'lib' and suffix
+SLIM_EXCLUDED_QT_PLUGINS = (
+    'qpdf', 'qtiff', 'qtga', 'qwbmp', 'qicns', 'qeglfs', 'qlinuxfb', 'qminimalegl', 'qvkkhrdisplay', 'qvnc',
+)
+SLIM_EXCLUDED_MODULES = ('tkinter', 'test', 'pydoc_data') # Standard library parts the app never uses
+QT_LIBRARY_PATTERN = re.compile(r'^(lib)?Qt6\w+') # Qt's own shared libraries, e.g. libQt6Pdf.so.6 or Qt6Pdf.dll
+BINARY_SUFFIXES = ('.so', '.pyd', '.dll', '.dylib')
+SOURCE_DIRS = ('src',)
 
-def build():
+# Startup measurement: run.py writes the time its window first shows to this file and quits
+STARTUP_PROBE_ENV = 'COUNTDOWN_STARTUP_PROBE'
+STARTUP_TIMEOUT_S = 60
+
+
+def imported_qt_modules():
+    # Names of the PySide6 modules imported anywhere in run.py or src/, e.g. {'QtCore', 'QtGui'}
+    sources = [main_script]
+    for source_dir in SOURCE_DIRS:
+        sources.extend(glob.glob(os.path.join(project_root, source_dir, '**', '*.py'), recursive=True))
+    modules = set()
+    for path in sources:
+        with open(path, 'r', encoding='utf-8') as f:
+            tree = ast.parse(f.read(), filename=path)
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                names = [alias.name for alias in node.names]
+            elif isinstance(node, ast.ImportFrom) and node.level == 0 and node.module:
+                names = [node.module] + [f"{node.module}.{alias.name}" for alias in node.names]
+            else:
+                continue
+            for name in names:
+                parts = name.split('.')
+                if len(parts) > 1 and parts[0] == 'PySide6' and parts[1].startswith('Qt'):
+                    modules.add(parts[1])
+    return modules
+
+
+def installed_qt_modules():
+    import PySide6
+    package_dir = os.path.dirname(PySide6.__file__)
+    modules = set()
+    for suffix in importlib.machinery.EXTENSION_SUFFIXES:
+        for path in glob.glob(os.path.join(package_dir, 'Qt*' + suffix)):
+            modules.add(os.path.basename(path)[:-len(suffix)])
+    return modules
+
+
+def required_qt_modules(modules):
+    # The imported modules plus the Qt modules they load in turn (QtWidgets loads QtGui, ...)
+    for name in modules:
+        importlib.import_module(f'PySide6.{name}')
+    return {name.split('.')[1] for name in sys.modules if name.startswith('PySide6.Qt') and name.count('.') == 1}
+
+
+def slim_pyinstaller_args():
+    required = required_qt_modules(imported_qt_modules())
+    excluded = sorted(installed_qt_modules() - required)
+    print(f"Bundling Qt modules: {', '.join(sorted(required))}")
+    print(f"Excluding {len(excluded)} other Qt modules")
+    args = ['--exclude-module=PySide6.{}'.format(name) for name in excluded]
+    args.extend('--exclude-module={}'.format(name) for name in SLIM_EXCLUDED_MODULES)
+    return args
+
+
+def _plugin_name(file_name):
+    name = file_name.split('.')[0]
+    return name[3:] if name.startswith('lib') else name
+
+
+def prune_qt_plugins(bundle_dir):
+    # PyInstaller collects every plugin of a type its Qt hooks ask for, and all Qt translations;
+    # drop plugin types outside SLIM_QT_PLUGIN_DIRS, the plugins in SLIM_EXCLUDED_QT_PLUGINS and
+    # the translations (the app has none). Returns the bytes removed.
+    removed = 0
+    for root, dirs, _ in os.walk(bundle_dir):
+        if os.path.basename(root) != 'Qt' or os.path.basename(os.path.dirname(root)) != 'PySide6':
+            continue
+        plugins_dir = os.path.join(root, 'plugins')
+        if os.path.isdir(plugins_dir):
+            for plugin_type in os.listdir(plugins_dir):
+                path = os.path.join(plugins_dir, plugin_type)
+                if plugin_type not in SLIM_QT_PLUGIN_DIRS:
+                    removed += directory_size(path)
+                    shutil.rmtree(path)
+                    continue
+                for file_name in os.listdir(path):
+                    if _plugin_name(file_name) in SLIM_EXCLUDED_QT_PLUGINS:
+                        removed += directory_size(os.path.join(path, file_name))
+                        os.remove(os.path.join(path, file_name))
+        translations_dir = os.path.join(root, 'translations')
+        if os.path.isdir(translations_dir):
+            removed += directory_size(translations_dir)
+            shutil.rmtree(translations_dir)
+        dirs.clear()
+    return removed
+
+
+def prune_unused_qt_libraries(bundle_dir):
+    # Qt libraries collected only for the plugins removed above are no longer loaded by
+    # anything; follow the dependencies of every remaining binary and delete the Qt libraries
+    # nothing reaches (and the links pointing at them). Returns the bytes removed.
+    from PyInstaller.depend import bindepend
+    qt_libraries, pending = {}, []
+    for root, _, files in os.walk(bundle_dir):
+        for name in files:
+            path = os.path.join(root, name)
+            if os.path.islink(path):
+                continue
+            if QT_LIBRARY_PATTERN.match(name):
+                qt_libraries[name] = path
+            elif name.endswith(BINARY_SUFFIXES) or '.so.' in name:
+                pending.append(path)
+    pending.append(os.path.join(bundle_dir, exe_name + ('.exe' if sys.platform == 'win32' else '')))
+    used, seen = set(), set()
+    while pending:
+        path = pending.pop()
+        if path in seen:
+            continue
+        seen.add(path)
+        try:
+            imports = bindepend.get_imports(path)
+        except Exception:
+            continue # Not a binary after all
+        for name, _ in imports:
+            if name in qt_libraries and name not in used:
+                used.add(name)
+                pending.append(qt_libraries[name])
+    removed = 0
+    for name, path in qt_libraries.items():
+        if name not in used:
+            removed += os.path.getsize(path)
+            os.remove(path)
+            print(f"  removed unused {name}")
+    for root, _, files in os.walk(bundle_dir):
+        for name in files:
+            path = os.path.join(root, name)
+            if os.path.islink(path) and not os.path.exists(path):
+                os.remove(path)
+    return removed
+
+
+def directory_size(path):
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            file_path = os.path.join(root, name)
+            if not os.path.islink(file_path):
+                total += os.path.getsize(file_path)
+    return total
+
+
+def report_bundle_size(bundle_dir, top=10):
+    total = directory_size(bundle_dir)
+    print(f"Bundle size: {total / 1048576:.1f} MB in {bundle_dir}")
+    # Largest entries one level into the bundle (and into PyInstaller's _internal folder)
+    entries = []
+    for parent in (bundle_dir, os.path.join(bundle_dir, '_internal')):
+        if os.path.isdir(parent):
+            for name in os.listdir(parent):
+                path = os.path.join(parent, name)
+                if name != '_internal' and not os.path.islink(path):
+                    entries.append((directory_size(path), os.path.relpath(path, bundle_dir)))
+    for size, name in sorted(entries, reverse=True)[:top]:
+        print(f"  {size / 1048576:8.1f} MB  {name}")
+    return total
+
+
+def measure_startup(executable, runs):
+    # Launches the bundle runs times in an empty working directory (so no user data is read)
+    # and returns the milliseconds from launch to the first window. The first launch after a
+    # build is the coldest this script can arrange.
+    timings = []
+    for _ in range(runs):
+        with tempfile.TemporaryDirectory() as work_dir:
+            probe_file = os.path.join(work_dir, 'first_window.txt')
+            env = dict(os.environ, **{STARTUP_PROBE_ENV: probe_file})
+            start = time.time()
+            process = subprocess.Popen([executable], cwd=work_dir, env=env,
+                                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            try:
+                process.wait(STARTUP_TIMEOUT_S)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                print("The app did not show its window in time; is a display available?")
+                return timings
+            if not os.path.exists(probe_file):
+                print(f"The app exited with code {process.returncode} before showing its window")
+                return timings
+            with open(probe_file, 'r') as f:
+                timings.append((float(f.read()) - start) * 1000.0)
+    return timings
+
+
+def build(profile='full', startup_runs=5):
     print("Starting PyInstaller build...")
+    print(f"Profile: {profile}")
     print(f"Project Root: {project_root}")
     print(f"Main Script: {main_script}")
     print(f"Output Directory (dist): {dist_path}")
     print(f"Build Directory (build): {build_path}")
     print(f"Data Directory to include: {data_dir} -> data")
-    
+
     # Ensure dist and build paths are clean if they exist from previous builds
     # PyInstaller's --clean might not remove everything if paths are outside its default structure
     if os.path.exists(dist_path):
@@ -55,16 +268,23 @@ def build():
     if os.path.exists(build_path):
         print(f"Removing existing build directory: {build_path}")
         shutil.rmtree(build_path)
-    
+
     # Create dist_path if it doesn't exist, as PyInstaller expects it for --distpath
     os.makedirs(dist_path, exist_ok=True)
 
-    print(f"Running PyInstaller with arguments: {' '.join(pyinstaller_args)}")
+    args = list(pyinstaller_args)
+    if profile == 'slim':
+        args.extend(slim_pyinstaller_args())
+    # Add the main script to the arguments
+    args.append(main_script)
 
+    print(f"Running PyInstaller with arguments: {' '.join(args)}")
+
+    bundle_dir = os.path.join(dist_path, exe_name)
     try:
-        PyInstaller.__main__.run(pyinstaller_args)
+        PyInstaller.__main__.run(args)
         print("Build successful!")
-        print(f"Executable and accompanying files are in: {os.path.join(dist_path, exe_name)}")
+        print(f"Executable and accompanying files are in: {bundle_dir}")
     except Exception as e:
         print(f"An error occurred during the build process: {e}")
         sys.exit(1)
@@ -81,5 +301,25 @@ def build():
             shutil.rmtree(build_path)
         print("Cleanup complete.")
 
+    if profile == 'slim':
+        removed = prune_qt_plugins(bundle_dir)
+        print(f"Pruned {removed / 1048576:.1f} MB of unused Qt plugins and translations")
+        removed = prune_unused_qt_libraries(bundle_dir)
+        print(f"Pruned {removed / 1048576:.1f} MB of Qt libraries only those plugins needed")
+    report_bundle_size(bundle_dir)
+
+    if startup_runs > 0:
+        executable = os.path.join(bundle_dir, exe_name + ('.exe' if sys.platform == 'win32' else ''))
+        timings = measure_startup(executable, startup_runs)
+        if timings:
+            print(f"Time to first window: first launch {timings[0]:.0f} ms, "
+                  f"median {statistics.median(timings):.0f} ms over {len(timings)} launches")
+
 if __name__ == '__main__':
-    build()
+    parser = argparse.ArgumentParser(description="Build the countdown timer bundle with PyInstaller.")
+    parser.add_argument('--profile', choices=('full', 'slim'), default='full',
+                        help="'slim' bundles only the Qt modules and plugins the app uses")
+    parser.add_argument('--startup-runs', type=int, default=5,
+                        help="launches used to measure time to first window (0 to skip)")
+    cli_args = parser.parse_args()
+    build(cli_args.profile, cli_args.startup_runs)
@@ -0,0 +1,129 @@
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+# Startup import report. Launches run.py under `python -X importtime` on a small synthetic
+# board with the startup probe set, so everything imported before the window first shows is
+# recorded, and prints the costliest modules. As a check it exits 1 when a module that should
+# only be loaded on demand was imported before the first paint, or when the imports took
+# longer than the budget.
+#
+#   python -m scripts.import_report
+#   python -m scripts.import_report --top 30 --budget-ms 600
+
+project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from scripts.benchmark import synthetic_config
+
+# Modules (and their submodules) that must not be imported before the first paint
+DEFERRED_MODULES = (
+    'numpy', # Only loaded for boards of countdown.NUMPY_MIN_ROWS timers or more
+    'src.ui.timer_settings_dialog', # Pre-warmed after startup settles
+    'src.ui.archive_dialog',
+    'src.ui.snapshot_dialog',
+    'src.ui.diagnostics_dialog',
+    'src.ui.notifications', # Once something is due
+    'src.ui.comment_preview', # On the first hover over a comment
+    'src.ui.tray', # When the window is first closed to the tray
+    'src.core.memory',
+    'src.core.control_server', # Only with the control endpoint enabled
+    'asyncio',
+    'tracemalloc',
+)
+DEFAULT_BUDGET_MS = 600.0 # Sum of all import times before the first paint, PySide6 included
+DEFAULT_TIMERS = 50
+DEFAULT_TOP = 20
+RUN_TIMEOUT_S = 60
+
+
+class ImportRecord:
+    def __init__(self, module, self_us, cumulative_us, depth):
+        self.module = module
+        self.self_us = self_us
+        self.cumulative_us = cumulative_us
+        self.depth = depth # Nesting level; 0 for modules imported directly by run.py or the app
+
+
+def parse_importtime(text):
+    # Parses `-X importtime` output ("import time: <self us> | <cumulative us> | <module>",
+    # indented by nesting level); other lines are ignored
+    records = []
+    for line in text.splitlines():
+        if not line.startswith('import time:'):
+            continue
+        fields = line[len('import time:'):].split('|')
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue # The header line
+        name = fields[2].rstrip()
+        module = name.lstrip()
+        depth = (len(name) - len(module) - 1) // 2
+        records.append(ImportRecord(module, int(fields[0]), int(fields[1]), depth))
+    return records
+
+
+def startup_imports(timers=DEFAULT_TIMERS):
+    # Imports made by run.py up to its first window, as ImportRecords in import order
+    with tempfile.TemporaryDirectory() as work_dir:
+        os.makedirs(os.path.join(work_dir, 'data'))
+        with open(os.path.join(work_dir, 'data', 'timers_config.json'), 'w') as f:
+            json.dump(synthetic_config(timers, html_comments=False), f)
+        env = dict(os.environ, COUNTDOWN_STARTUP_PROBE=os.path.join(work_dir, 'first_window.txt'))
+        env.setdefault('QT_QPA_PLATFORM', 'offscreen')
+        env.pop('PYTHONIMPORTTIME', None)
+        completed = subprocess.run([sys.executable, '-X', 'importtime', os.path.join(project_root, 'run.py')],
+                                   cwd=work_dir, env=env, capture_output=True, text=True, timeout=RUN_TIMEOUT_S)
+        if not os.path.exists(env['COUNTDOWN_STARTUP_PROBE']):
+            raise RuntimeError(f"run.py exited with code {completed.returncode} before showing its window:\n"
+                               f"{completed.stderr[-2000:]}")
+    return parse_importtime(completed.stderr)
+
+
+def deferred_imports(records):
+    # Names of the imported modules that DEFERRED_MODULES says should have waited
+    return [record.module for record in records
+            if any(record.module == name or record.module.startswith(name + '.') for name in DEFERRED_MODULES)]
+
+
+def total_ms(records):
+    return sum(record.self_us for record in records) / 1000.0
+
+
+def print_report(records, top):
+    print(f"{len(records)} modules imported before the first window, {total_ms(records):.1f} ms in total")
+    print(f"\nTop {top} by cumulative time (modules imported by the app's own code):")
+    direct = [record for record in records if record.depth == 0]
+    for record in sorted(direct, key=lambda r: r.cumulative_us, reverse=True)[:top]:
+        print(f"  {record.cumulative_us / 1000.0:8.1f} ms  {record.module}")
+    print(f"\nTop {top} by self time:")
+    for record in sorted(records, key=lambda r: r.self_us, reverse=True)[:top]:
+        print(f"  {record.self_us / 1000.0:8.1f} ms  {record.module}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report and check the modules imported before the first window.")
+    parser.add_argument('--top', type=int, default=DEFAULT_TOP, help="modules listed per table")
+    parser.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET_MS,
+                        help="fail when the imports take longer than this")
+    parser.add_argument('--timers', type=int, default=DEFAULT_TIMERS, help="size of the synthetic board")
+    args = parser.parse_args(argv)
+
+    records = startup_imports(args.timers)
+    print_report(records, args.top)
+    failed = False
+    early = deferred_imports(records)
+    if early:
+        print(f"\nFAIL: imported before the first window but meant to load on demand: {', '.join(early)}")
+        failed = True
+    if total_ms(records) > args.budget_ms:
+        print(f"\nFAIL: imports took {total_ms(records):.1f} ms, over the {args.budget_ms:.0f} ms budget")
+        failed = True
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
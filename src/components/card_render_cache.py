@@ -0,0 +1,71 @@
+from collections import OrderedDict
+
+from PySide6.QtCore import QPoint, Qt
+from PySide6.QtGui import QPixmap, QRegion
+from PySide6.QtWidgets import QWidget
+
+from ..core.metrics import metrics
+from .timer_card import TimerCard
+
+# Finished card images, shared by every card that looks the same. Enabled with the
+# "card_render_cache_enabled" global setting; cards then paint (and make their drag preview)
+# by blitting an image from here instead of drawing two styled labels. The key is everything
+# that decides a card's look, see TimerCard.render_key, so a changed colour, title or value
+# simply looks up another entry and nothing has to be invalidated. Entries are evicted least
+# recently used once the images exceed the cache's byte budget.
+DEFAULT_RENDER_CACHE_MB = 16
+TEMPLATE_END_DATE = "2000-01-01 00:00:00" # The template card never counts down
+
+
+class CardRenderCache:
+    def __init__(self, max_bytes=DEFAULT_RENDER_CACHE_MB * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.pixmaps = OrderedDict() # render key -> QPixmap, least recently used first
+        self.total_bytes = 0
+        self.template = None # Off-screen card the images are rendered from, made on first miss
+
+    def pixmap(self, card):
+        key = card.render_key()
+        pixmap = self.pixmaps.get(key)
+        if pixmap is not None:
+            self.pixmaps.move_to_end(key)
+            metrics.incr("render_cache.hits")
+            return pixmap
+        metrics.incr("render_cache.misses")
+        pixmap = self._render(key, card.size())
+        self.pixmaps[key] = pixmap
+        self.total_bytes += self._cost(pixmap)
+        while self.total_bytes > self.max_bytes and len(self.pixmaps) > 1:
+            _, evicted = self.pixmaps.popitem(last=False)
+            self.total_bytes -= self._cost(evicted)
+            metrics.incr("render_cache.evictions")
+        metrics.set_gauge("render_cache.bytes", self.total_bytes)
+        return pixmap
+
+    def clear(self):
+        self.pixmaps.clear()
+        self.total_bytes = 0
+        if self.template is not None:
+            self.template.deleteLater()
+            self.template = None
+        metrics.set_gauge("render_cache.bytes", 0)
+
+    @staticmethod
+    def _cost(pixmap):
+        return pixmap.width() * pixmap.height() * pixmap.depth() // 8
+
+    def _render(self, key, size):
+        title_bg, time_bg, time_text, font_size, title, text, ratio = key
+        if self.template is None:
+            self.template = TimerCard(None, title, TEMPLATE_END_DATE, "render_template", None,
+                                      {"title": title, "end_date": TEMPLATE_END_DATE})
+        template = self.template
+        template.config.update({"title": title, "bg_color_title": title_bg, "bg_color_time": time_bg,
+                                "text_color_time": time_text, "font_size_time": font_size})
+        template.refresh_from_config()
+        template.time_label.setText(text)
+        pixmap = QPixmap(size * ratio)
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(Qt.GlobalColor.transparent) # Only the rounded regions are drawn
+        template.render(pixmap, QPoint(), QRegion(), QWidget.RenderFlag.DrawChildren)
+        return pixmap
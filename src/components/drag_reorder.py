@@ -0,0 +1,142 @@
+from bisect import bisect_right
+
+from PySide6.QtCore import QObject, QPoint, QTimer, Qt
+from PySide6.QtWidgets import QFrame
+
+from .timer_card import TimerCard
+
+# Reordering cards by dragging them on the board. The first time a drag needs a column (the
+# board itself or an expanded group section), the vertical middles of its visible cards are
+# recorded in board coordinates, and from then on the insertion slot under the pointer is a
+# binary search over them. The slot is marked by a thin placeholder line floating above the
+# cards rather than a widget in the layout, so nothing is laid out again until the drop, which
+# moves the one card. Near the top or bottom edge of the scroll area the drag scrolls it.
+AUTOSCROLL_MARGIN = 32 # px from the viewport edge where scrolling starts
+AUTOSCROLL_MAX_STEP = 24 # px per step with the pointer right at the edge
+AUTOSCROLL_INTERVAL_MS = 16
+PLACEHOLDER_HEIGHT = 3
+PLACEHOLDER_STYLE = "background-color: #3875d7; border: none;"
+
+
+def insertion_slot(middles, y):
+    # Cards whose middle is at or above y come before the drop
+    return bisect_right(middles, y)
+
+
+def autoscroll_step(y, viewport_height, margin=AUTOSCROLL_MARGIN, max_step=AUTOSCROLL_MAX_STEP):
+    # Scroll distance for a pointer at y in the viewport: faster closer to an edge, 0 away from both
+    if y < margin:
+        return -max(1, round(max_step * min(1.0, (margin - y) / margin)))
+    if y > viewport_height - margin:
+        return max(1, round(max_step * min(1.0, (y - viewport_height + margin) / margin)))
+    return 0
+
+
+class CardColumn:
+    # Geometry of the visible cards in one layout, in board coordinates
+    def __init__(self, layout, board):
+        parent = layout.parentWidget()
+        offset = QPoint(0, 0) if parent is board else parent.mapTo(board, QPoint(0, 0))
+        area = layout.contentsRect()
+        self.layout = layout
+        self.left = offset.x() + area.x()
+        self.width = area.width()
+        self.middles = []
+        self.indices = [] # Layout index of each card
+        self.edges = [] # Placeholder position for each slot: above the first card, between cards, below the last
+        bottom = offset.y() + area.y()
+        for i in range(layout.count()):
+            card = layout.itemAt(i).widget()
+            if not isinstance(card, TimerCard) or card.isHidden():
+                continue
+            geometry = card.geometry()
+            top = offset.y() + geometry.y()
+            self.edges.append((bottom + top) // 2 if self.middles else top - 1)
+            self.middles.append(top + geometry.height() / 2)
+            self.indices.append(i)
+            bottom = top + geometry.height()
+        self.edges.append(bottom + 1 if self.middles else bottom)
+
+    def slot(self, y):
+        return insertion_slot(self.middles, y)
+
+    def layout_index(self, slot):
+        if slot < len(self.indices):
+            return self.indices[slot]
+        return self.indices[-1] + 1 if self.indices else 0
+
+
+class DragReorder(QObject):
+    def __init__(self, app):
+        super().__init__(app)
+        self.app = app
+        self.columns = {} # layout -> CardColumn, recorded during the current drag
+        self.placeholder = None # Created on the first drag
+        self.autoscroll_timer = None
+        self.viewport_pos = None # Last pointer position over the scroll area's viewport
+
+    def column(self, layout):
+        column = self.columns.get(layout)
+        if column is None:
+            column = self.columns[layout] = CardColumn(layout, self.app.scrollable_timers_widget)
+        return column
+
+    def insertion_index(self, layout, y):
+        # Layout index a card dropped at board y should take
+        return self.column(layout).layout_index(self.column(layout).slot(y))
+
+    def hover(self, pos):
+        # A card drag is over the board at pos (board coordinates)
+        layout, _ = self.app._drop_target(pos)
+        if layout is None:
+            self._hide_placeholder() # Over a collapsed section, which just takes the card
+        else:
+            column = self.column(layout)
+            self._show_placeholder(column, column.edges[column.slot(pos.y())])
+        viewport = self.app.scroll_area.viewport()
+        self.viewport_pos = self.app.scrollable_timers_widget.mapTo(viewport, pos.toPoint())
+        if autoscroll_step(self.viewport_pos.y(), viewport.height()):
+            if self.autoscroll_timer is None:
+                self.autoscroll_timer = QTimer(self)
+                self.autoscroll_timer.setInterval(AUTOSCROLL_INTERVAL_MS)
+                self.autoscroll_timer.timeout.connect(self._autoscroll)
+            if not self.autoscroll_timer.isActive():
+                self.autoscroll_timer.start()
+        elif self.autoscroll_timer is not None:
+            self.autoscroll_timer.stop()
+
+    def end(self):
+        # The drag left the board, was dropped or the cards were rebuilt
+        self.columns = {}
+        self.viewport_pos = None
+        if self.autoscroll_timer is not None:
+            self.autoscroll_timer.stop()
+        self._hide_placeholder()
+
+    def _autoscroll(self):
+        viewport = self.app.scroll_area.viewport()
+        step = autoscroll_step(self.viewport_pos.y(), viewport.height()) if self.viewport_pos is not None else 0
+        scroll_bar = self.app.scroll_area.verticalScrollBar()
+        previous = scroll_bar.value()
+        if step:
+            scroll_bar.setValue(previous + step)
+        if scroll_bar.value() == previous: # Away from the edges, or at the end of the board
+            self.autoscroll_timer.stop()
+            return
+        # The pointer stayed put while the board moved under it
+        board_pos = self.app.scrollable_timers_widget.mapFrom(viewport, self.viewport_pos)
+        self.hover(board_pos.toPointF())
+
+    def _show_placeholder(self, column, y):
+        if self.placeholder is None:
+            self.placeholder = QFrame(self.app.scrollable_timers_widget)
+            self.placeholder.setStyleSheet(PLACEHOLDER_STYLE)
+            self.placeholder.setAttribute(Qt.WidgetAttribute.WA_TransparentForMouseEvents)
+        self.placeholder.setGeometry(column.left, y - PLACEHOLDER_HEIGHT // 2, column.width, PLACEHOLDER_HEIGHT)
+        if self.placeholder.isHidden():
+            self.placeholder.show()
+            self.placeholder.raise_()
+
+    def _hide_placeholder(self):
+        if self.placeholder is not None:
+            self.placeholder.hide()
@@ -0,0 +1,97 @@
+from PySide6.QtWidgets import QFrame, QHBoxLayout, QLabel, QMenu, QSizePolicy, QToolButton, QVBoxLayout, QWidget
+from PySide6.QtCore import Qt
+
+from ..core.countdown import ENDED
+
+GROUP_HEADER_STYLE = """
+    QToolButton { border: none; font-weight: bold; padding: 2px 0px; }
+    QLabel { color: #606060; padding: 2px 4px; }
+"""
+
+
+def badge_text(summary):
+    # Compact "<count> · <days>" for the header; the tooltip spells it out
+    if summary.nearest is None:
+        return f"{summary.count}"
+    nearest = "Ended" if summary.nearest == ENDED else f"{summary.nearest}d"
+    return f"{summary.count} · {nearest}"
+
+
+def badge_tooltip(summary):
+    timers = f"{summary.count} timer" + ("" if summary.count == 1 else "s")
+    if summary.nearest is None:
+        return timers
+    if summary.nearest == ENDED:
+        return f"{timers}, all ended"
+    return f"{timers}, next ends in {summary.nearest} day" + ("" if summary.nearest == 1 else "s")
+
+
+class GroupSection(QFrame):
+    # Collapsible section of the board. Cards only exist while the section is expanded; a
+    # collapsed section is just the header with its badge, and its timers live only as data
+    # in App.timer_configs.
+    def __init__(self, name, expanded, app_ref, parent=None):
+        super().__init__(parent)
+        self.name = name
+        self.app_ref = app_ref
+        self.setFrameStyle(QFrame.Shape.NoFrame)
+
+        section_layout = QVBoxLayout(self)
+        section_layout.setContentsMargins(0, 0, 0, 0)
+        section_layout.setSpacing(0)
+
+        header = QWidget(self)
+        header.setStyleSheet(GROUP_HEADER_STYLE)
+        header_layout = QHBoxLayout(header)
+        header_layout.setContentsMargins(0, 0, 0, 0)
+        header_layout.setSpacing(0)
+        self.toggle_button = QToolButton(header)
+        self.toggle_button.setToolButtonStyle(Qt.ToolButtonStyle.ToolButtonTextBesideIcon)
+        self.toggle_button.setCheckable(True)
+        self.toggle_button.setText(name)
+        self.toggle_button.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
+        self.badge_label = QLabel(header)
+        header_layout.addWidget(self.toggle_button)
+        header_layout.addWidget(self.badge_label)
+        header.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        header.customContextMenuRequested.connect(self._show_header_menu)
+        section_layout.addWidget(header)
+
+        self.body = QWidget(self)
+        self.body_layout = QVBoxLayout(self.body)
+        self.body_layout.setContentsMargins(0, 0, 0, 0)
+        self.body_layout.setAlignment(Qt.AlignmentFlag.AlignTop)
+        section_layout.addWidget(self.body)
+
+        self._set_expanded_state(expanded)
+        self.toggle_button.toggled.connect(self._on_toggled)
+
+    def is_expanded(self):
+        return self.toggle_button.isChecked()
+
+    def set_summary(self, summary):
+        self.badge_label.setText(badge_text(summary))
+        self.badge_label.setToolTip(badge_tooltip(summary))
+
+    def _set_expanded_state(self, expanded):
+        self.toggle_button.setChecked(expanded)
+        self.toggle_button.setArrowType(Qt.ArrowType.DownArrow if expanded else Qt.ArrowType.RightArrow)
+        self.body.setVisible(expanded)
+
+    def _on_toggled(self, expanded):
+        self._set_expanded_state(expanded)
+        if hasattr(self.app_ref, 'set_group_expanded'):
+            self.app_ref.set_group_expanded(self.name, expanded)
+
+    def _show_header_menu(self, position):
+        menu = QMenu(self)
+        add_action = menu.addAction("Add Timer Here")
+        rename_action = menu.addAction("Rename Group...")
+        delete_action = menu.addAction("Remove Group")
+        chosen = menu.exec(self.sender().mapToGlobal(position))
+        if chosen == add_action:
+            self.app_ref.add_new_timer_action(group=self.name)
+        elif chosen == rename_action:
+            self.app_ref.rename_group(self.name)
+        elif chosen == delete_action:
+            self.app_ref.remove_group(self.name)
@@ -1,444 +1,93 @@
 import sys
 from PySide6.QtWidgets import (
-    QWidget, QLabel, QVBoxLayout, QHBoxLayout, QPushButton, QFrame,
-    QApplication, QDialog, QLineEdit, QTextEdit, QColorDialog, QMessageBox,
-    QSizePolicy, QDateEdit, QDateTimeEdit, QDialogButtonBox, QSpinBox, QCheckBox,
-    QMenu, QToolTip, QFormLayout, QToolBar # Added QToolBar
-)
-from PySide6.QtCore import Qt, QTimer, QDateTime, QDate, QEvent, QMimeData
-from PySide6.QtGui import (
-    QPalette, QColor, QMouseEvent, QFont, QAction, QCursor, QEnterEvent, 
-    QDrag, QPixmap, QTextCharFormat, QTextDocument # Added QTextCharFormat, QTextDocument
+    QWidget, QLabel, QVBoxLayout, QFrame, QApplication, QDialog, QMessageBox, QSizePolicy, QMenu, QToolTip
 )
+from PySide6.QtCore import Qt, QTimer, QEvent, QMimeData
+from PySide6.QtGui import QMouseEvent, QFont, QAction, QCursor, QEnterEvent, QDrag, QPixmap, QPainter
 
 from datetime import datetime, timedelta
+from functools import lru_cache
+
+from ..core.metrics import metrics
+from ..core.countdown import ENDED, format_countdown
+from ..core.clock import SYSTEM_CLOCK
 
 # Default colors to be used if not specified in config
 DEFAULT_TITLE_BG_COLOR = "#696969"  # DimGray
 DEFAULT_TIME_BG_COLOR = "#D3D3D3"   # LightGray
 DEFAULT_TIME_TEXT_COLOR = "#000000" # Black for time text
 DEFAULT_TIME_FONT_SIZE = 48 # Default font size for the time/days display
-
-class TimerSettingsDialog(QDialog):
-    def __init__(self, parent_card, current_config):
-        super().__init__(parent_card.app_ref) # Parent to the main app window for modality
-        self.parent_card = parent_card
-        self.current_config = current_config.copy() # Work on a copy
-        self.app_ref = parent_card.app_ref # Store a reference to the main app
-
-        self.setWindowTitle(f"Settings: {self.current_config.get('title', 'Timer')}")
-        self.setFixedWidth(210)
-
-        main_layout = QVBoxLayout()
-
-        form_layout = QFormLayout()
-        form_layout.setLabelAlignment(Qt.AlignmentFlag.AlignRight)
-
-        self.title_entry = QLineEdit(self.current_config.get("title", ""))
-        form_layout.addRow(QLabel("Title:"), self.title_entry)
-
-        self.date_edit = QDateEdit()
-        self.date_edit.setDisplayFormat("yy-MM-dd")
-        self.date_edit.setCalendarPopup(True)
-        current_end_datetime_str = self.current_config.get("end_date")
-        if current_end_datetime_str:
-            try:
-                dt_obj = datetime.strptime(current_end_datetime_str, "%Y-%m-%d %H:%M:%S")
-                self.date_edit.setDate(QDate(dt_obj.year, dt_obj.month, dt_obj.day))
-            except ValueError:
-                self.date_edit.setDate(QDate.currentDate().addDays(1))
-        else:
-            self.date_edit.setDate(QDate.currentDate().addDays(1))
-        form_layout.addRow(QLabel("Date:"), self.date_edit)
-        
-        self.time_font_size_spinbox = QSpinBox()
-        self.time_font_size_spinbox.setMinimum(8)
-        self.time_font_size_spinbox.setMaximum(100)
-        self.time_font_size_spinbox.setValue(self.current_config.get("font_size_time", DEFAULT_TIME_FONT_SIZE))
-        form_layout.addRow(QLabel("Size:"), self.time_font_size_spinbox)
-
-        main_layout.addLayout(form_layout)
-
-        self.set_default_font_size_checkbox = QCheckBox("Default Font Size")
-        main_layout.addWidget(self.set_default_font_size_checkbox)
-
-        # Main Window Transparency Controls
-        self.main_window_transparent_checkbox = QCheckBox("Transparent Main Window")
-        initial_transparent_bg = self.app_ref.global_settings.get("main_window_transparent_background", False)
-        self.main_window_transparent_checkbox.setChecked(initial_transparent_bg)
-        main_layout.addWidget(self.main_window_transparent_checkbox)
-
-        opacity_layout = QHBoxLayout()
-        opacity_layout.addWidget(QLabel("Opacity Level (if transparent):"))
-        self.main_window_opacity_spinbox = QSpinBox()
-        self.main_window_opacity_spinbox.setMinimum(0) # 0% opacity
-        self.main_window_opacity_spinbox.setMaximum(100) # 100% opacity
-        self.main_window_opacity_spinbox.setSuffix("%")
-        initial_opacity_percent = int(self.app_ref.global_settings.get("main_window_opacity_level", 1.0) * 100)
-        self.main_window_opacity_spinbox.setValue(initial_opacity_percent)
-        self.main_window_opacity_spinbox.setEnabled(initial_transparent_bg) # Enable only if transparency is on
-        opacity_layout.addWidget(self.main_window_opacity_spinbox)
-        main_layout.addLayout(opacity_layout)
-
-        self.main_window_transparent_checkbox.toggled.connect(self.main_window_opacity_spinbox.setEnabled)
-
-        self.remember_window_pos_checkbox = QCheckBox("Remember window position on exit")
-        initial_remember_pos = False
-        if hasattr(self.app_ref, 'global_settings') and \
-           isinstance(self.app_ref.global_settings, dict):
-            initial_remember_pos = self.app_ref.global_settings.get("remember_window_position", False)
-        self.remember_window_pos_checkbox.setChecked(initial_remember_pos)
-        main_layout.addWidget(self.remember_window_pos_checkbox)
-        
-        main_layout.addSpacing(10)
-
-        # Rich Text Comment Editor
-        main_layout.addWidget(QLabel("Comment:"))
-
-        self.comment_toolbar = QToolBar(self)
-        self.action_bold = QAction("B", self)
-        self.action_bold.setToolTip("Bold")
-        self.action_bold.setCheckable(True)
-        bold_font = QFont("Arial")
-        bold_font.setWeight(QFont.Weight.Bold)
-        self.action_bold.setFont(bold_font)
-        
-        self.action_italic = QAction("I", self)
-        self.action_italic.setToolTip("Italic")
-        self.action_italic.setCheckable(True)
-        italic_font = QFont("Arial")
-        italic_font.setItalic(True)
-        self.action_italic.setFont(italic_font)
-
-        self.action_underline = QAction("U", self)
-        self.action_underline.setToolTip("Underline")
-        self.action_underline.setCheckable(True)
-        underline_font = QFont("Arial")
-        underline_font.setUnderline(True)
-        self.action_underline.setFont(underline_font)
-
-        self.comment_toolbar.addAction(self.action_bold)
-        self.comment_toolbar.addAction(self.action_italic)
-        self.comment_toolbar.addAction(self.action_underline)
-        main_layout.addWidget(self.comment_toolbar)
-
-        comment_value = self.current_config.get("comment", "")
-        # print(f"DEBUG Dialog Init: Comment is '{comment_value}' (repr: {repr(comment_value)})") # Debug print removed
-        self.comment_textbox = QTextEdit()  # Create empty
-        # self.comment_textbox.setAcceptRichText(False) # Removed, default is True (rich text)
-        self.comment_textbox.setHtml(comment_value)  # Set the HTML content
-        self.comment_textbox.setMinimumHeight(80) # Increased minimum height for rich text editor
-        self.comment_textbox.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding) # Allow expanding
-        main_layout.addWidget(self.comment_textbox)
-
-        # Connect toolbar actions
-        self.action_bold.triggered.connect(self._toggle_bold)
-        self.action_italic.triggered.connect(self._toggle_italic)
-        self.action_underline.triggered.connect(self._toggle_underline)
-
-        # Update toolbar button states based on cursor position/selection format
-        self.comment_textbox.currentCharFormatChanged.connect(self._update_format_actions_state)
-        self.comment_textbox.cursorPositionChanged.connect(self._update_format_actions_state)
-
-        main_layout.addSpacing(10)
-
-        # Title Region Color
-        self.title_color_button = QPushButton("Title Background")
-        main_layout.addWidget(self.title_color_button)
-        self.title_color_button.clicked.connect(self._choose_title_region_color)
-        
-        self._temp_selected_title_color = self.current_config.get("bg_color_title", DEFAULT_TITLE_BG_COLOR)
-            
-        self.title_color_preview = QLabel("Preview")
-        self.title_color_preview.setAutoFillBackground(True)
-        self.title_color_preview.setFixedHeight(20)
-        main_layout.addWidget(self.title_color_preview)
-        
-        self.set_default_title_color_checkbox = QCheckBox("Default Title Background")
-        main_layout.addWidget(self.set_default_title_color_checkbox)
-
-        main_layout.addSpacing(10)
-
-        # Time Region Background Color
-        self.time_bg_color_button = QPushButton("Time Background") # Renamed for clarity
-        main_layout.addWidget(self.time_bg_color_button)
-        self.time_bg_color_button.clicked.connect(self._choose_time_bg_color) # Renamed method
-
-        self._temp_selected_time_bg_color = self.current_config.get("bg_color_time", DEFAULT_TIME_BG_COLOR) # Renamed variable
-            
-        self.time_bg_color_preview = QLabel("Preview") # Renamed for clarity
-        self.time_bg_color_preview.setAutoFillBackground(True)
-        self.time_bg_color_preview.setFixedHeight(20)
-        main_layout.addWidget(self.time_bg_color_preview)
-
-        self.set_default_time_bg_color_checkbox = QCheckBox("Default Time Background") # Renamed for clarity
-        main_layout.addWidget(self.set_default_time_bg_color_checkbox)
-
-        main_layout.addSpacing(10) # Space after time background color section
-
-        # Time Region Text Color
-        self.time_text_color_button = QPushButton("Time Text Color")
-        main_layout.addWidget(self.time_text_color_button)
-        self.time_text_color_button.clicked.connect(self._choose_time_text_color)
-
-        self._temp_selected_time_text_color = self.current_config.get("text_color_time", DEFAULT_TIME_TEXT_COLOR)
-            
-        self.time_text_color_preview = QLabel("Preview")
-        self.time_text_color_preview.setAutoFillBackground(True) # Will show text on this bg
-        self.time_text_color_preview.setFixedHeight(20)
-        main_layout.addWidget(self.time_text_color_preview)
-
-        self.set_default_time_text_color_checkbox = QCheckBox("Default Time Text Color")
-        main_layout.addWidget(self.set_default_time_text_color_checkbox)
-        
-        self._update_color_previews()
-
-        main_layout.addSpacing(10)
-        main_layout.addStretch(1)
-
-        # --- Action Buttons ---
-        self.button_box = QDialogButtonBox(QDialogButtonBox.StandardButton.Save | QDialogButtonBox.StandardButton.Cancel | QDialogButtonBox.StandardButton.Reset)
-        delete_button = self.button_box.addButton("Delete", QDialogButtonBox.ButtonRole.DestructiveRole)
-
-        self.button_box.accepted.connect(self.accept)
-        self.button_box.rejected.connect(self.reject)
-        self.button_box.button(QDialogButtonBox.StandardButton.Reset).clicked.connect(self._reset_settings)
-        if delete_button:
-            delete_button.clicked.connect(self._delete_timer_from_dialog_button)
-
-        main_layout.addWidget(self.button_box)
-        self.setLayout(main_layout)
-
-    def _update_color_previews(self):
-        # Update title color preview
-        if self._temp_selected_title_color:
-            palette = self.title_color_preview.palette()
-            palette.setColor(QPalette.ColorRole.Window, QColor(self._temp_selected_title_color))
-            self.title_color_preview.setPalette(palette)
-        else:
-            self.title_color_preview.setPalette(QApplication.style().standardPalette())
-
-        # Update time background color preview
-        if self._temp_selected_time_bg_color: # Renamed variable
-            palette = self.time_bg_color_preview.palette() # Renamed preview widget
-            palette.setColor(QPalette.ColorRole.Window, QColor(self._temp_selected_time_bg_color)) # Renamed variable
-            self.time_bg_color_preview.setPalette(palette) # Renamed preview widget
-        else:
-            self.time_bg_color_preview.setPalette(QApplication.style().standardPalette()) # Renamed preview widget
-
-        # Update time text color preview
-        if self._temp_selected_time_text_color:
-            palette = self.time_text_color_preview.palette()
-            # Set background to something contrasting to see the text color
-            # For simplicity, let's use the time background color, or white if not set
-            bg_for_text_preview = QColor(self._temp_selected_time_bg_color if self._temp_selected_time_bg_color else "#FFFFFF")
-            palette.setColor(QPalette.ColorRole.Window, bg_for_text_preview)
-            palette.setColor(QPalette.ColorRole.WindowText, QColor(self._temp_selected_time_text_color))
-            self.time_text_color_preview.setPalette(palette)
-            self.time_text_color_preview.setText("Text") # Show sample text
-        else:
-            self.time_text_color_preview.setPalette(QApplication.style().standardPalette())
-            self.time_text_color_preview.setText("Preview")
-
-    def _toggle_bold(self, checked):
-        fmt = QTextCharFormat()
-        fmt.setFontWeight(QFont.Weight.Bold if checked else QFont.Weight.Normal)
-        self.comment_textbox.mergeCurrentCharFormat(fmt)
-
-    def _toggle_italic(self, checked):
-        fmt = QTextCharFormat()
-        fmt.setFontItalic(checked)
-        self.comment_textbox.mergeCurrentCharFormat(fmt)
-
-    def _toggle_underline(self, checked):
-        fmt = QTextCharFormat()
-        fmt.setFontUnderline(checked)
-        self.comment_textbox.mergeCurrentCharFormat(fmt)
-
-    def _update_format_actions_state(self):
-        fmt = self.comment_textbox.currentCharFormat()
-        self.action_bold.setChecked(fmt.fontWeight() == QFont.Weight.Bold)
-        self.action_italic.setChecked(fmt.fontItalic())
-        self.action_underline.setChecked(fmt.fontUnderline())
-
-    def _choose_title_region_color(self):
-        initial_color = QColor(self._temp_selected_title_color) if self._temp_selected_title_color else Qt.GlobalColor.white
-        color = QColorDialog.getColor(initial_color, self, "Choose title region background color")
-        if color.isValid():
-            self._temp_selected_title_color = color.name()
-            self._update_color_previews()
-
-    def _choose_time_bg_color(self): # Renamed method
-        initial_color = QColor(self._temp_selected_time_bg_color) if self._temp_selected_time_bg_color else Qt.GlobalColor.white # Renamed variable
-        color = QColorDialog.getColor(initial_color, self, "Choose time region background color")
-        if color.isValid():
-            self._temp_selected_time_bg_color = color.name() # Renamed variable
-            self._update_color_previews()
-
-    def _choose_time_text_color(self): # New method
-        initial_color = QColor(self._temp_selected_time_text_color) if self._temp_selected_time_text_color else Qt.GlobalColor.black
-        color = QColorDialog.getColor(initial_color, self, "Choose time text color")
-        if color.isValid():
-            self._temp_selected_time_text_color = color.name()
-            self._update_color_previews()
-
-    def accept(self):
-        # Update the timer card's local config
-        self.current_config["title"] = self.title_entry.text()
-        
-        qdate_val = self.date_edit.date()
-        dt_obj = datetime(qdate_val.year(), qdate_val.month(), qdate_val.day(), 0, 0, 0)
-        self.current_config["end_date"] = dt_obj.strftime("%Y-%m-%d %H:%M:%S")
-
-        self.current_config["font_size_time"] = self.time_font_size_spinbox.value()
-        # self.current_config["comment"] = self.comment_textbox.toPlainText() # Old plain text
-        self.current_config["comment"] = self.comment_textbox.toHtml() # Use toHtml() for rich text
-        
-        self.current_config["bg_color_title"] = self._temp_selected_title_color
-        self.current_config["bg_color_time"] = self._temp_selected_time_bg_color # Renamed variable
-        self.current_config["text_color_time"] = self._temp_selected_time_text_color # New
-
-        if self.set_default_font_size_checkbox.isChecked():
-            if hasattr(self.app_ref, 'update_global_default_time_font_size'):
-                self.app_ref.update_global_default_time_font_size(self.time_font_size_spinbox.value())
-        
-        if self.set_default_title_color_checkbox.isChecked():
-            if hasattr(self.app_ref, 'update_global_default_title_color'):
-                self.app_ref.update_global_default_title_color(self._temp_selected_title_color)
-
-        if self.set_default_time_bg_color_checkbox.isChecked(): # Renamed checkbox
-            if hasattr(self.app_ref, 'update_global_default_time_color'): # Existing method in main_app for time BG
-                self.app_ref.update_global_default_time_color(self._temp_selected_time_bg_color) # Renamed variable
-
-        if self.set_default_time_text_color_checkbox.isChecked(): # New checkbox
-            if hasattr(self.app_ref, 'update_global_default_time_text_color'): # New method needed in main_app
-                self.app_ref.update_global_default_time_text_color(self._temp_selected_time_text_color)
-
-        # Update main window transparency settings
-        if hasattr(self.app_ref, 'update_global_main_window_transparency'):
-            self.app_ref.update_global_main_window_transparency(self.main_window_transparent_checkbox.isChecked())
-        
-        if hasattr(self.app_ref, 'update_global_main_window_opacity'):
-            opacity_percent = self.main_window_opacity_spinbox.value()
-            self.app_ref.update_global_main_window_opacity(opacity_percent / 100.0)
-
-        if hasattr(self.app_ref, 'update_remember_window_position'):
-            self.app_ref.update_remember_window_position(self.remember_window_pos_checkbox.isChecked())
-
-        super().accept()
-
-    def _reset_settings(self):
-        self.title_entry.setText(self.parent_card.config.get("title", ""))
-        original_end_date_str = self.parent_card.config.get("end_date")
-        if original_end_date_str:
-            try:
-                dt_obj = datetime.strptime(original_end_date_str, "%Y-%m-%d %H:%M:%S")
-                self.date_edit.setDate(QDate(dt_obj.year, dt_obj.month, dt_obj.day))
-            except ValueError:
-                self.date_edit.setDate(QDate.currentDate().addDays(1))
-        else:
-            self.date_edit.setDate(QDate.currentDate().addDays(1))
-        # self.comment_textbox.setText(self.parent_card.config.get("comment", "")) # Old plain text
-        self.comment_textbox.setHtml(self.parent_card.config.get("comment", "")) # Use setHtml for rich text
-        
-        self._temp_selected_title_color = self.parent_card.config.get("bg_color_title", DEFAULT_TITLE_BG_COLOR)
-        self._temp_selected_time_bg_color = self.parent_card.config.get("bg_color_time", DEFAULT_TIME_BG_COLOR) # Renamed
-        self._temp_selected_time_text_color = self.parent_card.config.get("text_color_time", DEFAULT_TIME_TEXT_COLOR) # New
-        self.time_font_size_spinbox.setValue(self.parent_card.config.get("font_size_time", DEFAULT_TIME_FONT_SIZE))
-            
-        self._update_color_previews()
-        
-        initial_remember_pos = False
-        if hasattr(self.parent_card.app_ref, 'global_settings') and \
-           isinstance(self.parent_card.app_ref.global_settings, dict):
-            initial_remember_pos = self.parent_card.app_ref.global_settings.get("remember_window_position", False)
-        self.remember_window_pos_checkbox.setChecked(initial_remember_pos)
-
-        # Reset main window transparency controls
-        initial_transparent_bg = self.app_ref.global_settings.get("main_window_transparent_background", False)
-        self.main_window_transparent_checkbox.setChecked(initial_transparent_bg)
-        initial_opacity_percent = int(self.app_ref.global_settings.get("main_window_opacity_level", 1.0) * 100)
-        self.main_window_opacity_spinbox.setValue(initial_opacity_percent)
-        self.main_window_opacity_spinbox.setEnabled(initial_transparent_bg)
-
-    def _delete_timer_from_dialog_button(self):
-        # This method is called specifically by the "Delete Timer" button in the QDialogButtonBox
-        # It reuses the _delete_timer logic which shows a confirmation.
-        # If confirmed, _delete_timer calls self.done(QDialog.DialogCode.Accepted + 1)
-        self._delete_timer()
-
-    def _handle_button_click(self, button):
-        # This method might still be useful if you have other custom roles,
-        # but for the specific "Delete Timer" button, direct connection is clearer.
-        if self.button_box.buttonRole(button) == QDialogButtonBox.ButtonRole.DestructiveRole:
-            # This will now call _delete_timer_from_dialog_button if the DestructiveRole button is clicked
-            # and not directly connected. However, direct connection is preferred.
-            pass # Or call self._delete_timer() if not directly connected
-
-    def _delete_timer(self):
-        reply = QMessageBox.question(self, "Delete Timer",
-                                     f"Are you sure you want to delete '{self.current_config.get('title', 'this timer')}'?",
-                                     QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
-                                     QMessageBox.StandardButton.No)
-        if reply == QMessageBox.StandardButton.Yes:
-            self.parent_card.app_ref.delete_timer_config_and_card(self.parent_card.card_id)
-            self.done(QDialog.DialogCode.Accepted + 1) # Custom code to indicate deletion
-
-    def get_updated_config(self):
-        qdate = self.date_edit.date()
-        year = qdate.year()
-        month = qdate.month()
-        day = qdate.day()
-        end_date_str = datetime(year, month, day, 0, 0, 0).strftime("%Y-%m-%d %H:%M:%S")
-        
-        # comment_from_textbox = self.comment_textbox.toPlainText() # Old plain text
-        comment_from_textbox = self.comment_textbox.toHtml() # Use toHtml() for rich text
-        # print(f"DEBUG Dialog Save (get_updated_config): Comment from textbox is '{comment_from_textbox}' (repr: {repr(comment_from_textbox)})") # Debug print removed
-        
-        # Normalize the doubled newlines from toPlainText(). # Removed this logic as it's for plain text
-        # normalized_comment = comment_from_textbox.replace('\\n\\n', '\\n')
-        # print(f"DEBUG Dialog Save (get_updated_config): Normalized comment is '{normalized_comment}' (repr: {repr(normalized_comment)})") # Debug print removed
-
-        return {
-            "title": self.title_entry.text(),
-            "end_date": end_date_str,
-            "comment": comment_from_textbox, # Use HTML comment directly
-            "bg_color_title": self._temp_selected_title_color,
-            "bg_color_time": self._temp_selected_time_bg_color, # Renamed
-            "text_color_time": self._temp_selected_time_text_color, # New
-            "font_size_time": self.time_font_size_spinbox.value(),
-            "set_default_font_size": self.set_default_font_size_checkbox.isChecked(),
-            "set_default_title_color": self.set_default_title_color_checkbox.isChecked(),
-            "set_default_time_color": self.set_default_time_bg_color_checkbox.isChecked(), # Renamed
-            "set_default_time_text_color": self.set_default_time_text_color_checkbox.isChecked() # New
-        }
+TITLE_FONT_POINT_SIZE = 11
+TITLE_TEXT_COLOR = "#FFFFFF" # Title text is always white
+CARD_BORDER_RADIUS = "10px"
+
+# Fonts and style sheets are shared between cards so that a large board does not hold
+# one copy per card. QFont is implicitly shared, so handing out the same instance is cheap.
+# Each region is a single styled QLabel (QLabel is a QFrame), so the style sheets below
+# carry the padding that used to come from a wrapping frame and layout.
+_shared_fonts = {}
+
+def _shared_title_font(base_font):
+    key = ("title", base_font.family())
+    font = _shared_fonts.get(key)
+    if font is None:
+        font = QFont(base_font)
+        font.setPointSize(TITLE_FONT_POINT_SIZE)
+        font.setBold(False)
+        _shared_fonts[key] = font
+    return font
+
+def _shared_time_font(base_font, point_size):
+    key = ("time", base_font.family(), point_size)
+    font = _shared_fonts.get(key)
+    if font is None:
+        font = QFont(base_font)
+        font.setPointSize(point_size)
+        font.setWeight(QFont.Weight.Light) # Set to a lighter font weight
+        _shared_fonts[key] = font
+    return font
+
+@lru_cache(maxsize=256)
+def _title_region_style(bg_color_hex):
+    return f"""
+            QLabel {{
+                background-color: {bg_color_hex};
+                color: {TITLE_TEXT_COLOR};
+                padding: 2px 5px;
+                border-top-left-radius: {CARD_BORDER_RADIUS};
+                border-top-right-radius: {CARD_BORDER_RADIUS};
+                border-bottom-left-radius: 0px;
+                border-bottom-right-radius: 0px;
+            }}
+        """
+
+@lru_cache(maxsize=256)
+def _time_region_style(bg_color_hex, text_color_hex):
+    return f"""
+            QLabel {{
+                background-color: {bg_color_hex};
+                color: {text_color_hex}; /* Use configured time text color */
+                padding: 2px 5px;
+                border-top-left-radius: 0px;
+                border-top-right-radius: 0px;
+                border-bottom-left-radius: {CARD_BORDER_RADIUS};
+                border-bottom-right-radius: {CARD_BORDER_RADIUS};
+            }}
+        """
 
 class TimerCard(QFrame): # Changed from ctk.CTkFrame
     def __init__(self, master_layout, title, end_date, card_id, app_ref, config=None):
-        super().__init__(app_ref) 
+        # Born on the widget that will hold it, so joining the board does not reparent it
+        super().__init__(master_layout.parentWidget() if master_layout is not None else app_ref)
         
         self.app_ref = app_ref 
         self.card_id = card_id
-        self.config = config.copy() if config else {} 
+        # Share the record held in App.timer_configs instead of copying it; defaults are
+        # applied on read so nothing card-specific leaks back into the saved config.
+        self.config = config if config is not None else {}
         self.is_left_mouse_button_down = False
-        self.hover_timer = QTimer(self) # For tooltip delay
-        self.hover_timer.setSingleShot(True)
-        self.hover_timer.setInterval(750) # 750ms delay, you can adjust this
-        self.hover_timer.timeout.connect(self._show_comment_tooltip)
-        
-        if "comment" not in self.config: self.config["comment"] = ""
-        if self.config.get("bg_color_title") is None:
-            self.config["bg_color_title"] = DEFAULT_TITLE_BG_COLOR
-        if self.config.get("bg_color_time") is None:
-            self.config["bg_color_time"] = DEFAULT_TIME_BG_COLOR
-        if self.config.get("text_color_time") is None: # New default for time text color
-            self.config["text_color_time"] = DEFAULT_TIME_TEXT_COLOR
-        if self.config.get("font_size_time") is None:
-            self.config["font_size_time"] = DEFAULT_TIME_FONT_SIZE
-        if self.config.get("sort_order") is None:
-            self.config["sort_order"] = 0 
-        if self.config.get("remember_window_position") is None:
-            self.config["remember_window_position"] = False # Default to not remembering window position
+        self.hover_timer = None # For tooltip delay, created on first hover
+        self.drag_pixmap = None # (look, pixmap) of the last drag, reused while the card looks the same
         
         self.title_str = title 
         self.end_date_str = end_date 
@@ -455,111 +104,115 @@ class TimerCard(QFrame): # Changed from ctk.CTkFrame
         card_layout.setSpacing(0) 
 
         # --- Title Region ---
-        self.title_region_frame = QFrame()
-        self.title_region_frame.setAutoFillBackground(False) 
-        self.title_region_frame.setMaximumHeight(35)
-        title_region_layout = QVBoxLayout(self.title_region_frame)
-        title_region_layout.setContentsMargins(5,2,5,2)
-
         self.title_label = QLabel(self.title_str)
-        font_title = self.title_label.font()
-        font_title.setPointSize(11)
-        font_title.setBold(False) 
-        self.title_label.setFont(font_title)
+        self.title_label.setMaximumHeight(35)
+        self.title_label.setFont(_shared_title_font(self.title_label.font()))
         self.title_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        title_region_layout.addWidget(self.title_label)
-        card_layout.addWidget(self.title_region_frame)
+        card_layout.addWidget(self.title_label)
 
         # --- Time Region ---
-        self.time_region_frame = QFrame()
-        self.time_region_frame.setAutoFillBackground(False) 
-        time_region_layout = QVBoxLayout(self.time_region_frame)
-        time_region_layout.setContentsMargins(5,2,5,2)
-
         self.time_label = QLabel("")
         self._apply_time_label_font()
         self.time_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        time_region_layout.addWidget(self.time_label)
-        card_layout.addWidget(self.time_region_frame)
+        card_layout.addWidget(self.time_label)
         
         self.end_datetime = datetime.strptime(self.end_date_str, "%Y-%m-%d %H:%M:%S")
 
         self.apply_region_colors()
 
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.update_timer_display)
-        self.timer.start(1000)
-        self.update_timer_display()
+        # With the app's render cache the labels only hold the text; the card paints itself
+        # from a cached image of how they would look (see card_render_cache.py)
+        self.render_cache = getattr(self.app_ref, 'card_render_cache', None)
+        if self.render_cache is not None:
+            self.title_label.hide()
+            self.time_label.hide()
+
+        # Countdown values are pushed in by the app's CountdownBoard on each tick. A card that
+        # is not hosted by a board (e.g. the demo below) computes its own value once.
+        if not hasattr(self.app_ref, 'countdown_board'):
+            self.update_timer_display()
         
         self.settings_dialog = None
-        # self.hover_timer = None # Initialized in __init__ now
 
     def _apply_time_label_font(self):
-        font_time = self.time_label.font()
-        font_time.setPointSize(self.config.get("font_size_time", DEFAULT_TIME_FONT_SIZE))
-        # font_time.setBold(True) # Remove or comment out for a non-bold font
-        font_time.setWeight(QFont.Weight.Light) # Set to a lighter font weight
-        self.time_label.setFont(font_time)
+        font_size = self.config.get("font_size_time") or DEFAULT_TIME_FONT_SIZE
+        self.time_label.setFont(_shared_time_font(self.time_label.font(), font_size))
 
     def apply_region_colors(self):
-        # Fetch colors from config (guaranteed to have defaults by __init__)
-        title_bg_color_hex = self.config["bg_color_title"]
-        time_bg_color_hex = self.config["bg_color_time"]
-        time_text_color_hex = self.config["text_color_time"]
-        
-        title_text_color = "#FFFFFF" # Ensure title text is white
-
-        border_radius = "10px"
-
-        self.title_region_frame.setStyleSheet(f"""
-            QFrame {{
-                background-color: {title_bg_color_hex};
-                /* color property removed from here */
-                border-top-left-radius: {border_radius};
-                border-top-right-radius: {border_radius};
-                border-bottom-left-radius: 0px;
-                border-bottom-right-radius: 0px;
-            }}
-        """)
-        # Explicitly set title label color to white and background to transparent
-        self.title_label.setStyleSheet(f"color: {title_text_color}; background-color: transparent;")
-
-        self.time_region_frame.setStyleSheet(f"""
-            QFrame {{
-                background-color: {time_bg_color_hex};
-                color: {time_text_color_hex}; /* Use configured time text color */
-                border-top-left-radius: 0px;
-                border-top-right-radius: 0px;
-                border-bottom-left-radius: {border_radius};
-                border-bottom-right-radius: {border_radius};
-            }}
-        """)
+        # Fetch colors from config, falling back to the defaults for missing or empty values
+        title_bg_color_hex = self.config.get("bg_color_title") or DEFAULT_TITLE_BG_COLOR
+        time_bg_color_hex = self.config.get("bg_color_time") or DEFAULT_TIME_BG_COLOR
+        time_text_color_hex = self.config.get("text_color_time") or DEFAULT_TIME_TEXT_COLOR
+
+        # Re-setting an unchanged style sheet still re-polishes the label, so skip those
+        title_style = _title_region_style(title_bg_color_hex)
+        if self.title_label.styleSheet() != title_style:
+            self.title_label.setStyleSheet(title_style)
+        time_style = _time_region_style(time_bg_color_hex, time_text_color_hex)
+        if self.time_label.styleSheet() != time_style:
+            self.time_label.setStyleSheet(time_style)
+
+    def refresh_from_config(self):
+        # Re-reads the shared record after the app changed it (e.g. through the control API)
+        self.end_date_str = self.config["end_date"]
+        self.end_datetime = datetime.fromisoformat(self.end_date_str) # Canonical after normalization
+        if self.title_str != self.config["title"]:
+            self.title_str = self.config["title"]
+            self.title_label.setText(self.title_str)
+        self._apply_time_label_font()
+        self.apply_region_colors()
+        if self.render_cache is not None:
+            self.update()
+
+    def render_key(self):
+        # Everything that decides how the card looks, for the render cache
+        return (self.config.get("bg_color_title") or DEFAULT_TITLE_BG_COLOR,
+                self.config.get("bg_color_time") or DEFAULT_TIME_BG_COLOR,
+                self.config.get("text_color_time") or DEFAULT_TIME_TEXT_COLOR,
+                self.config.get("font_size_time") or DEFAULT_TIME_FONT_SIZE,
+                self.title_label.text(), self.time_label.text(), self.devicePixelRatioF())
+
+    def paintEvent(self, event):
+        if self.render_cache is None:
+            super().paintEvent(event)
+            return
+        painter = QPainter(self)
+        painter.drawPixmap(0, 0, self.render_cache.pixmap(self))
+        painter.end()
 
     def update_timer_display(self):
         # self.end_datetime is already midnight of the target day due to how it's saved
         target_date = self.end_datetime.date()
-        today_date = datetime.now().date()
+        today_date = getattr(self.app_ref, 'clock', SYSTEM_CLOCK).today()
 
+        # Display the number of full days remaining until the target date
+        # If target_date is today, days_remaining will be 0.
         days_remaining = (target_date - today_date).days
+        self.set_countdown_value(ENDED if days_remaining < 0 else days_remaining)
 
-        if days_remaining < 0:
-            self.time_label.setText("Ended") 
-            if self.timer.isActive(): # Check if timer is active before trying to stop
-                self.timer.stop() # Stop the timer if the event has passed
-        else:
-            # Display the number of full days remaining until the target date
-            # If target_date is today, days_remaining will be 0.
-            self.time_label.setText(f"{days_remaining}") # Old display was: f"{days_remaining} day{'s' if days_remaining != 1 else ''}"
-
+    def set_countdown_value(self, value):
+        new_text = format_countdown(value)
+        # Only touch the label when the value actually changes; setText triggers a relayout/repaint
+        if self.time_label.text() != new_text:
+            self.time_label.setText(new_text)
+            metrics.incr("tick.label_updates")
+            if self.render_cache is not None:
+                self.update() # The hidden label does not repaint the card
 
     def enterEvent(self, event: QEnterEvent): # Override enterEvent
         if not self.is_left_mouse_button_down:
             comment_html = self.config.get("comment", "")
             if comment_html:
-                # Check if the comment (when stripped of HTML) has actual content
-                temp_doc = QTextDocument()
-                temp_doc.setHtml(comment_html)
-                if temp_doc.toPlainText().strip():
+                # Check if the comment (when stripped of HTML) has actual content; the answer
+                # is cached per comment, so only the first hover parses it. The preparation
+                # is timed once, in _show_comment_tooltip
+                from ..ui.comment_preview import comment_has_text # Only needed on hover
+                if comment_has_text(comment_html):
+                    if self.hover_timer is None:
+                        self.hover_timer = QTimer(self)
+                        self.hover_timer.setSingleShot(True)
+                        self.hover_timer.setInterval(750) # 750ms delay, you can adjust this
+                        self.hover_timer.timeout.connect(self._show_comment_tooltip)
                     self.hover_timer.start()
         super().enterEvent(event)
 
@@ -570,13 +223,16 @@ class TimerCard(QFrame): # Changed from ctk.CTkFrame
         super().leaveEvent(event)
 
     def _show_comment_tooltip(self):
-        comment_html = self.config.get("comment", "").strip()
+        comment_html = self.config.get("comment", "")
         if comment_html:
+            from ..ui.comment_preview import comment_has_text, comment_tooltip_html
             # Further check to ensure the HTML isn't just empty paragraphs or similar
-            temp_doc = QTextDocument()
-            temp_doc.setHtml(comment_html)
-            if temp_doc.toPlainText().strip(): # Only show if there's actual text content
-                QToolTip.showText(QCursor.pos(), comment_html, self) # rect and msecDisplayTime removed
+            with metrics.timed("tooltip.prepare_ms"):
+                has_content = comment_has_text(comment_html)
+                if has_content: # Images are shown as thumbnails from the app's asset store
+                    tooltip_html = comment_tooltip_html(comment_html, getattr(self.app_ref, 'asset_store', None))
+            if has_content: # Only show if there's actual text content
+                QToolTip.showText(QCursor.pos(), tooltip_html, self) # rect and msecDisplayTime removed
             else:
                 QToolTip.hideText() # Ensure it's hidden if comment is effectively empty
         else:
@@ -619,15 +275,24 @@ class TimerCard(QFrame): # Changed from ctk.CTkFrame
         mime_data.setText(self.card_id)
         drag.setMimeData(mime_data)
 
-        pixmap = QPixmap(self.size())
-        self.render(pixmap)
-        drag.setPixmap(pixmap)
+        drag.setPixmap(self._drag_pixmap())
         drag.setHotSpot(event.pos())
 
         drag.exec(Qt.DropAction.MoveAction)
         # Note: is_left_mouse_button_down will be reset in mouseReleaseEvent
         event.accept()
 
+    def _drag_pixmap(self):
+        if self.render_cache is not None:
+            return self.render_cache.pixmap(self)
+        look = (self.title_label.text(), self.time_label.text(), self.title_label.styleSheet(),
+                self.time_label.styleSheet(), self.time_label.font().pointSize(), self.size().toTuple())
+        if self.drag_pixmap is None or self.drag_pixmap[0] != look:
+            pixmap = QPixmap(self.size())
+            self.render(pixmap)
+            self.drag_pixmap = (look, pixmap)
+        return self.drag_pixmap[1]
+
     def mouseReleaseEvent(self, event: QMouseEvent): # Add this method
         if event.button() == Qt.MouseButton.LeftButton:
             self.is_left_mouse_button_down = False
@@ -660,41 +325,37 @@ class TimerCard(QFrame): # Changed from ctk.CTkFrame
             # No need to self.deleteLater() here as the main app handles card removal from layout.
 
     def _open_settings_dialog(self):
-        if self.settings_dialog is not None and self.settings_dialog.isVisible():
-            self.settings_dialog.raise_()
-            self.settings_dialog.activateWindow()
+        # The app keeps one shared, pre-warmed dialog; fall back to a private one without it
+        if hasattr(self.app_ref, 'get_timer_settings_dialog'):
+            dialog = self.app_ref.get_timer_settings_dialog()
+        else:
+            from ..ui.timer_settings_dialog import TimerSettingsDialog # Only loaded once a card is edited
+            dialog = TimerSettingsDialog(self.app_ref)
+        if dialog.isVisible():
+            dialog.raise_()
+            dialog.activateWindow()
             return
 
-        self.settings_dialog = TimerSettingsDialog(self, self.config)
+        self.settings_dialog = dialog
+        with metrics.timed("dialog.open_ms"):
+            self.settings_dialog.bind(self)
+            self.settings_dialog.show() # exec() below re-uses the already shown dialog
         result = self.settings_dialog.exec() # exec() is blocking
 
         if result == QDialog.DialogCode.Accepted:
             updated_config_from_dialog = self.settings_dialog.get_updated_config()
-            
-            # Update internal state and UI
-            self.config.update(updated_config_from_dialog) # Update the card's own config
-            self.title_str = self.config["title"]
-            self.end_date_str = self.config["end_date"]
-            
-            try:
-                # Ensure self.end_datetime is correctly set to midnight of the new date
-                new_date_obj = datetime.strptime(self.end_date_str, "%Y-%m-%d %H:%M:%S").date()
-                self.end_datetime = datetime.combine(new_date_obj, datetime.min.time())
-            except ValueError:
-                QMessageBox.warning(self.app_ref, "Date Error", "Invalid date format after edit. Reverting.")
-                # Potentially revert self.config changes related to date or handle error more gracefully
 
-            self.title_label.setText(self.title_str)
-            self._apply_time_label_font() # Re-apply font in case it changed
-            self.apply_region_colors() 
-            self.update_timer_display() 
-            
-            # Restart timer if it's not active and the end date is in the future
-            if self.end_datetime > datetime.now() and not self.timer.isActive():
-                self.timer.start(1000)
-
-            # Persist the updated configuration for this specific card
-            self.app_ref.update_timer_config(self.card_id, self.config)
+            # A card on the board shares its record with the app, whose timer store applies
+            # (and records for undo) the edit and then refreshes this card; a standalone card
+            # updates its own copy
+            if getattr(self.app_ref, 'timer_configs', {}).get(self.card_id) is self.config:
+                self.app_ref.update_timer_config(self.card_id, updated_config_from_dialog)
+            else:
+                self.config.update(updated_config_from_dialog)
+                self.app_ref.update_timer_config(self.card_id, self.config)
+                self.refresh_from_config()
+                if not hasattr(self.app_ref, 'countdown_board'):
+                    self.update_timer_display()
 
             # Handle "Set as Default" options from the dialog's returned config
             # These were already handled by the dialog's accept() method by calling app_ref directly.
@@ -707,7 +368,8 @@ class TimerCard(QFrame): # Changed from ctk.CTkFrame
             # The main app will then refresh the cards.
             pass
             
-        self.settings_dialog = None # Allow dialog to be garbage collected
+        dialog.unbind()
+        self.settings_dialog = None
 
 
     # delete_timer method is now effectively handled within TimerSettingsDialog
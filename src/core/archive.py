@@ -0,0 +1,102 @@
+import json
+import os
+from datetime import date
+
+from .countdown import end_date_ordinal
+from .recurrence import parse_rule
+
+# Ended timers are moved out of the main config into an append-only JSON Lines file, one
+# {"id", "archived_on", "config"} record per line. Archiving only appends, so it never reads
+# the archive; the file is parsed only when the archive view is opened, and rewritten only by
+# restore and purge. Lines that cannot be parsed are kept as they are through a rewrite.
+DEFAULT_ARCHIVE_GRACE_DAYS = 7
+RESTORED_ON_KEY = "restored_on" # Set on restored configs so they get a fresh grace period
+
+
+def select_expired(timer_configs, today_ordinal, grace_days):
+    # Ids of one-shot timers that ended more than grace_days ago; recurring timers never end
+    if grace_days is None or grace_days < 0:
+        return []
+    expired = []
+    for card_id, config in timer_configs.items():
+        if parse_rule(config.get("recurrence")) is not None:
+            continue
+        try:
+            last_active = end_date_ordinal(config["end_date"])
+        except (KeyError, TypeError, ValueError):
+            continue
+        restored_on = config.get(RESTORED_ON_KEY)
+        if restored_on:
+            try:
+                last_active = max(last_active, date.fromisoformat(restored_on).toordinal())
+            except ValueError:
+                pass
+        if today_ordinal - last_active > grace_days:
+            expired.append(card_id)
+    return expired
+
+
+class ArchiveEntry:
+    def __init__(self, card_id, archived_on, config):
+        self.card_id = card_id
+        self.archived_on = archived_on # ISO date string
+        self.config = config
+
+
+class ArchiveStore:
+    def __init__(self, path):
+        self.path = path
+        self._entries = None # card_id -> ArchiveEntry, only while the archive view needs it
+        self._unreadable_lines = [] # Raw lines load() could not parse, written back by _rewrite()
+
+    def append(self, configs_by_id, archived_on):
+        if not configs_by_id:
+            return
+        lines = [json.dumps({"id": card_id, "archived_on": archived_on, "config": config})
+                 for card_id, config in configs_by_id.items()]
+        data_dir = os.path.dirname(self.path)
+        if data_dir and not os.path.exists(data_dir):
+            os.makedirs(data_dir)
+        with open(self.path, 'a') as f:
+            f.write("\n".join(lines) + "\n")
+        if self._entries is not None:
+            for card_id, config in configs_by_id.items():
+                self._entries[card_id] = ArchiveEntry(card_id, archived_on, config)
+
+    def load(self):
+        if self._entries is None:
+            entries = {}
+            self._unreadable_lines = []
+            if os.path.exists(self.path):
+                with open(self.path, 'r') as f:
+                    for line_number, line in enumerate(f, 1):
+                        if not line.strip():
+                            continue
+                        try:
+                            record = json.loads(line)
+                            entries[record["id"]] = ArchiveEntry(record["id"], record.get("archived_on"), record["config"])
+                        except (ValueError, KeyError, TypeError) as e:
+                            print(f"Skipping unreadable archive line {line_number} in {self.path}: {e}")
+                            self._unreadable_lines.append(line.rstrip("\n") + "\n")
+            self._entries = entries
+        return self._entries
+
+    def unload(self):
+        self._entries = None
+        self._unreadable_lines = []
+
+    def take(self, card_ids):
+        # Removes entries and returns {card_id: config}; used by both restore and purge
+        entries = self.load()
+        taken = {card_id: entries.pop(card_id).config for card_id in card_ids if card_id in entries}
+        if taken:
+            self._rewrite()
+        return taken
+
+    def _rewrite(self):
+        temp_path = self.path + ".tmp"
+        with open(temp_path, 'w') as f:
+            f.writelines(self._unreadable_lines)
+            for entry in self._entries.values():
+                f.write(json.dumps({"id": entry.card_id, "archived_on": entry.archived_on, "config": entry.config}) + "\n")
+        os.replace(temp_path, self.path)
@@ -0,0 +1,111 @@
+import base64
+import binascii
+import hashlib
+import os
+import re
+
+# Content-addressed store for images pasted into rich-text comments. The comment editor saves
+# with QTextEdit.toHtml(), which keeps a pasted image inline as a base64 data: URI, so a single
+# screenshot can add megabytes to every save of the config. externalize() writes each such image
+# to the store once, named by the hash of its bytes, and points the <img> at "assets/<name>",
+# a path relative to the data directory; the same image pasted twice is stored once.
+# Images are not deleted when a comment stops using them (undo, snapshots and the archive may
+# still refer to them); sweep() removes the ones nothing refers to any more.
+ASSET_DIR_NAME = "assets" # Kept next to CONFIG_FILE
+THUMBNAIL_DIR_NAME = "thumbs" # Inside the asset directory; see ui/comment_preview.py
+NAME_HASH_CHARS = 32
+_EXTENSIONS = {"png": "png", "jpeg": "jpg", "jpg": "jpg", "gif": "gif", "bmp": "bmp", "webp": "webp", "svg+xml": "svg"}
+_DATA_URI_RE = re.compile(r'(\bsrc\s*=\s*)(["\'])data:image/([\w.+-]+);base64,([^"\']*)\2', re.IGNORECASE)
+_ASSET_REF_RE = re.compile(r'(\bsrc\s*=\s*)(["\'])' + ASSET_DIR_NAME + r'/([0-9a-f]+\.[a-z]+)\2')
+_ASSET_NAME_RE = re.compile(r'[0-9a-f]+\.[a-z]+')
+# Any mention of a stored asset, also inside JSON-escaped text such as snapshot files
+_ANY_ASSET_REF_RE = re.compile(ASSET_DIR_NAME + r'/([0-9a-f]+\.[a-z]+)')
+
+
+def asset_references(html):
+    # Names of the stored assets an HTML comment refers to, in document order
+    return [match.group(3) for match in _ASSET_REF_RE.finditer(html)]
+
+
+def mentioned_assets(text):
+    # Names of stored assets mentioned anywhere in text; errs on the side of keeping files
+    return set(_ANY_ASSET_REF_RE.findall(text))
+
+
+def replace_asset_references(html, replacement):
+    # Rewrites the src of every asset <img> to replacement(name); None keeps the reference
+    def replace(match):
+        src = replacement(match.group(3))
+        if src is None:
+            return match.group(0)
+        return f'{match.group(1)}{match.group(2)}{src}{match.group(2)}'
+    return _ASSET_REF_RE.sub(replace, html)
+
+
+class AssetStore:
+    def __init__(self, directory):
+        self.directory = directory
+
+    def path(self, name):
+        return os.path.join(self.directory, name)
+
+    def put(self, data, extension):
+        name = f"{hashlib.sha256(data).hexdigest()[:NAME_HASH_CHARS]}.{extension}"
+        path = self.path(name)
+        if not os.path.exists(path): # Same bytes, same name: nothing to write
+            os.makedirs(self.directory, exist_ok=True)
+            temp_path = path + ".tmp"
+            with open(temp_path, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, path)
+        return name
+
+    def externalize(self, html):
+        # html with its data: URI images moved into the store. Images that cannot be decoded or
+        # written stay inline, so nothing the user pasted is lost
+        if ";base64," not in html:
+            return html
+
+        def store(match):
+            extension = _EXTENSIONS.get(match.group(3).lower())
+            if extension is None:
+                return match.group(0)
+            try:
+                data = base64.b64decode(match.group(4))
+            except (binascii.Error, ValueError):
+                return match.group(0)
+            if not data:
+                return match.group(0)
+            try:
+                name = self.put(data, extension)
+            except OSError as e:
+                print(f"Error storing comment image in {self.directory}: {e}")
+                return match.group(0)
+            return f'{match.group(1)}{match.group(2)}{ASSET_DIR_NAME}/{name}{match.group(2)}'
+        return _DATA_URI_RE.sub(store, html)
+
+    def sweep(self, referenced):
+        # Deletes stored images whose names are not in referenced, with their thumbnails;
+        # returns the names removed
+        if not os.path.isdir(self.directory):
+            return []
+        removed = []
+        for name in sorted(os.listdir(self.directory)):
+            if name in referenced or not _ASSET_NAME_RE.fullmatch(name) or not os.path.isfile(self.path(name)):
+                continue
+            try:
+                os.remove(self.path(name))
+            except OSError as e:
+                print(f"Error removing unused asset {name}: {e}")
+                continue
+            removed.append(name)
+        thumbnail_dir = os.path.join(self.directory, THUMBNAIL_DIR_NAME)
+        if removed and os.path.isdir(thumbnail_dir):
+            stems = {os.path.splitext(name)[0] for name in removed}
+            for thumbnail in os.listdir(thumbnail_dir):
+                if thumbnail.rsplit("-", 1)[0] in stems:
+                    try:
+                        os.remove(os.path.join(thumbnail_dir, thumbnail))
+                    except OSError as e:
+                        print(f"Error removing thumbnail {thumbnail}: {e}")
+        return removed
@@ -0,0 +1,97 @@
+import json
+import os
+from array import array
+from bisect import bisect_left
+from datetime import date
+
+_numpy = None # The numpy module once loaded, False if it is not installed
+
+COUNT_MODE_CALENDAR = "calendar"
+COUNT_MODE_BUSINESS = "business"
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal() # NumPy datetime64[D] counts days from here
+
+
+def load_numpy():
+    # NumPy is optional (counts fall back to closed-form arithmetic) and takes longer to import
+    # than the rest of the app together, so it is only imported once a board needs it.
+    # Returns the module, or None when it is not installed.
+    global _numpy
+    if _numpy is None:
+        try:
+            import numpy
+            _numpy = numpy
+        except ImportError:
+            _numpy = False
+    return _numpy or None
+
+
+def _weekdays_before(ordinal):
+    # Number of Monday-Friday days in [ordinal 1, ordinal); ordinal 1 (0001-01-01) is a Monday
+    days = ordinal - 1
+    return days // 7 * 5 + min(days % 7, 5)
+
+
+class HolidayCalendar:
+    # Mon-Fri working week minus a sorted set of holiday ordinals. Holidays on weekends are
+    # dropped up front since they never change a count.
+    def __init__(self, holiday_ordinals=()):
+        weekday_holidays = sorted({o for o in holiday_ordinals if (o - 1) % 7 < 5})
+        self.holidays = array('q', weekday_holidays)
+        self._numpy_calendar = None
+
+    def __len__(self):
+        return len(self.holidays)
+
+    def count(self, start_ordinal, end_ordinal):
+        # Working days in [start, end), like numpy.busday_count
+        if end_ordinal <= start_ordinal:
+            return 0
+        weekdays = _weekdays_before(end_ordinal) - _weekdays_before(start_ordinal)
+        holidays = bisect_left(self.holidays, end_ordinal) - bisect_left(self.holidays, start_ordinal)
+        return weekdays - holidays
+
+    def count_many(self, start_ordinal, end_ordinals):
+        # Vectorized count for an int64 NumPy array of end ordinals (all expected >= start)
+        np = load_numpy()
+        if self._numpy_calendar is None:
+            holidays = (np.frombuffer(self.holidays, dtype=np.int64) - _EPOCH_ORDINAL).astype('datetime64[D]')
+            self._numpy_calendar = np.busdaycalendar(weekmask="1111100", holidays=holidays)
+        start = np.datetime64(start_ordinal - _EPOCH_ORDINAL, 'D')
+        ends = (end_ordinals - _EPOCH_ORDINAL).astype('datetime64[D]')
+        return np.busday_count(start, ends, busdaycal=self._numpy_calendar)
+
+
+def parse_holiday_file(path):
+    # Accepts either a JSON list of ISO dates or {"holidays": [...]}
+    with open(path, 'r') as f:
+        data = json.load(f)
+    entries = data.get("holidays", []) if isinstance(data, dict) else data
+    ordinals = []
+    for entry in entries:
+        try:
+            ordinals.append(date.fromisoformat(str(entry)[:10]).toordinal())
+        except ValueError:
+            print(f"Ignoring invalid holiday date in {path}: {entry!r}")
+    return ordinals
+
+
+_calendar_cache = {}
+
+
+def load_holiday_calendar(path):
+    # Parsed calendars are cached per path and only re-read when the file's mtime changes
+    try:
+        mtime = os.path.getmtime(path)
+    except OSError:
+        mtime = None
+    cached = _calendar_cache.get(path)
+    if cached is not None and cached[0] == mtime:
+        return cached[1]
+    calendar = HolidayCalendar()
+    if mtime is not None:
+        try:
+            calendar = HolidayCalendar(parse_holiday_file(path))
+        except (OSError, ValueError) as e:
+            print(f"Error loading holidays from {path}: {e}")
+    _calendar_cache[path] = (mtime, calendar)
+    return calendar
@@ -0,0 +1,55 @@
+from datetime import datetime, timedelta
+
+# The app reads the current time only through a clock object (App.clock). SystemClock is the
+# real one; SimulatedClock only moves when told to, so countdowns, expiry reminders and the
+# midnight rollover can be replayed over days or years without waiting for them.
+
+
+class SystemClock:
+    def now(self):
+        return datetime.now()
+
+    def today(self):
+        return datetime.now().date()
+
+    def subscribe(self, callback):
+        pass # The real clock is never moved on request; the app's timers follow it
+
+
+class SimulatedClock:
+    def __init__(self, start=None):
+        self._now = start if start is not None else datetime.now().replace(microsecond=0)
+        self._listeners = []
+
+    def now(self):
+        return self._now
+
+    def today(self):
+        return self._now.date()
+
+    def subscribe(self, callback):
+        # callback() runs after every move, so the app can catch up as if time had passed
+        self._listeners.append(callback)
+
+    def set(self, moment):
+        self._now = moment
+        for callback in self._listeners:
+            callback()
+
+    def advance(self, delta=None, **kwargs):
+        # advance(timedelta(...)) or advance(days=..., hours=..., seconds=...)
+        self.set(self._now + (delta if delta is not None else timedelta(**kwargs)))
+
+    def replay(self, until, step, on_tick=None):
+        # Moves the clock to until in steps of step, calling on_tick() after each one (on top
+        # of the listeners); returns the number of steps taken
+        steps = 0
+        while self._now < until:
+            self.set(min(self._now + step, until))
+            steps += 1
+            if on_tick is not None:
+                on_tick()
+        return steps
+
+
+SYSTEM_CLOCK = SystemClock()
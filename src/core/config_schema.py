@@ -0,0 +1,209 @@
+import copy
+import math
+from datetime import datetime
+
+from .business_days import COUNT_MODE_BUSINESS
+from .expiry_scheduler import DEFAULT_REMINDER_LEAD_DAYS
+from .snapshots import DEFAULT_KEEP_CHAINS
+from .recurrence import parse_rule
+
+# Version history of the saved document ({"schema_version", "global_settings", "timers"}):
+#   1 - unversioned files; new timers stored their text colour as "time_text_color" while cards
+#       and the settings dialog used "text_color_time", and the dialog's "set default" flags
+#       leaked into timer records
+#   2 - one key per field, every timer record complete and normalized
+SCHEMA_VERSION = 2
+SCHEMA_VERSION_KEY = "schema_version"
+# Timer records that cannot be used (no readable end date) are moved here, unchanged, instead of
+# being dropped, so a save never loses them; fix one by hand and move it back into "timers"
+QUARANTINE_KEY = "quarantined_timers"
+
+# Keys that never belong in a timer record (dialog flags and a global setting that leaked in)
+STALE_TIMER_KEYS = (
+    "time_text_color",
+    "remember_window_position",
+    "set_default_font_size",
+    "set_default_title_color",
+    "set_default_time_color",
+    "set_default_time_text_color",
+)
+
+
+def _migrate_v1(timers):
+    for config in timers.values():
+        if isinstance(config, dict) and "time_text_color" in config:
+            legacy_color = config.pop("time_text_color")
+            if not config.get("text_color_time"):
+                config["text_color_time"] = legacy_color
+
+
+MIGRATIONS = {1: _migrate_v1} # from_version -> function(timers) upgrading in place to from_version + 1
+
+
+def normalize_end_date(value):
+    # Returns the canonical "YYYY-MM-DD HH:MM:SS", or None if unreadable. The time of day is
+    # kept (expiry notifications fire at it); a date alone means midnight, and fractions of a
+    # second and UTC offsets are dropped
+    if not isinstance(value, str):
+        return None
+    if len(value) == 19 and value[10] == " ": # Already canonical; only check it parses
+        try:
+            datetime.fromisoformat(value)
+            return value
+        except ValueError:
+            return None
+    try:
+        return datetime.fromisoformat(value.strip()).strftime("%Y-%m-%d %H:%M:%S")
+    except ValueError:
+        return None
+
+
+def _valid_lead_days(value):
+    # reminder_lead_days must be a list of whole days ahead (0 is the expiry itself)
+    return isinstance(value, list) and all(
+        isinstance(days, int) and not isinstance(days, bool) and days >= 0 for days in value)
+
+
+def _positive_int(value):
+    return isinstance(value, int) and not isinstance(value, bool) and value >= 1
+
+
+def _positive_number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool) and math.isfinite(value) and value > 0
+
+
+# Settings used as numbers or lists without further checks: (key, check, what is expected, fallback
+# when the defaults passed to normalize_document do not name the key; None drops it)
+SETTING_CHECKS = (
+    ("reminder_lead_days", _valid_lead_days, "a list of whole days", list(DEFAULT_REMINDER_LEAD_DAYS)),
+    ("snapshot_keep_chains", _positive_int, "a whole number of at least 1", DEFAULT_KEEP_CHAINS),
+    ("card_render_cache_mb", _positive_number, "a positive number of megabytes", None),
+)
+
+
+def document_version(data):
+    return _as_int(data.get(SCHEMA_VERSION_KEY), 1) if isinstance(data, dict) else 1
+
+
+def _as_int(value, fallback):
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return fallback
+
+
+def normalize_timer_config(config, defaults):
+    # Fixes one timer record in place; defaults holds the global default colours and font size.
+    # Returns None if the record cannot be used (no readable end date), otherwise whether
+    # anything had to be changed.
+    end_date = normalize_end_date(config.get("end_date"))
+    if end_date is None:
+        return None
+    changed = end_date != config["end_date"]
+    config["end_date"] = end_date
+    for key in STALE_TIMER_KEYS:
+        if key in config:
+            del config[key]
+            changed = True
+    title = config.get("title")
+    if not isinstance(title, str):
+        config["title"] = "" if title is None else str(title)
+        changed = True
+    if not isinstance(config.get("comment"), str):
+        config["comment"] = ""
+        changed = True
+    for key, default_key in (("bg_color_title", "default_bg_color_title"),
+                             ("bg_color_time", "default_bg_color_time"),
+                             ("text_color_time", "default_time_text_color")):
+        if not config.get(key):
+            config[key] = defaults[default_key]
+            changed = True
+    font_size = config.get("font_size_time")
+    if not isinstance(font_size, int) or isinstance(font_size, bool) or font_size <= 0:
+        config["font_size_time"] = _as_int(font_size, 0) or defaults["default_time_font_size"]
+        changed = True
+    if "recurrence" in config:
+        rule = parse_rule(config["recurrence"])
+        if rule is None:
+            del config["recurrence"]
+            changed = True
+        elif rule != config["recurrence"]:
+            config["recurrence"] = rule
+            changed = True
+    if "count_mode" in config and config["count_mode"] != COUNT_MODE_BUSINESS:
+        del config["count_mode"]
+        changed = True
+    if "group" in config:
+        group = (config["group"] or "").strip() if isinstance(config["group"], str) else ""
+        if not group: # Blank means ungrouped, which is stored as no key at all
+            del config["group"]
+            changed = True
+        elif group != config["group"]:
+            config["group"] = group
+            changed = True
+    return changed
+
+
+def normalize_document(data, default_global_settings):
+    # One pass over a loaded document: runs migrations, merges global settings over the
+    # defaults and normalizes every timer. Returns (global_settings, timers, changed, quarantined)
+    # where changed says whether the file on disk differs from the normalized result, and
+    # quarantined holds the records that could not be used (see QUARANTINE_KEY), including any
+    # the document already had there.
+    if not isinstance(data, dict):
+        data = {}
+    version = document_version(data)
+    loaded_settings = data.get("global_settings")
+    global_settings = copy.deepcopy(default_global_settings) # Defaults hold lists; keep them unshared
+    if isinstance(loaded_settings, dict):
+        global_settings.update(loaded_settings)
+    timers = data.get("timers")
+    if not isinstance(timers, dict):
+        timers = {}
+    changed = version < SCHEMA_VERSION
+    for key, is_valid, expected, fallback in SETTING_CHECKS:
+        if key in global_settings and not is_valid(global_settings[key]):
+            print(f"Ignoring {key} {global_settings[key]!r}: expected {expected}")
+            fallback = default_global_settings.get(key, fallback)
+            if fallback is None:
+                del global_settings[key]
+            else:
+                global_settings[key] = copy.deepcopy(fallback)
+            changed = True
+    if version > SCHEMA_VERSION:
+        # Read, but never written back by this build (see App.newer_file_version)
+        print(f"Config schema version {version} is newer than this build supports ({SCHEMA_VERSION}); loading it read-only.")
+
+    while version < SCHEMA_VERSION:
+        MIGRATIONS[version](timers)
+        version += 1
+
+    quarantined = data.get(QUARANTINE_KEY)
+    quarantined = dict(quarantined) if isinstance(quarantined, dict) else {}
+    normalized = {}
+    missing_sort_order = []
+    max_sort_order = -1
+    for card_id, config in timers.items():
+        if not isinstance(config, dict):
+            print(f"Setting aside timer {card_id}: not a timer record")
+            quarantined[card_id] = config
+            changed = True
+            continue
+        record_changed = normalize_timer_config(config, global_settings)
+        if record_changed is None: # Rejected before anything in it was changed
+            print(f"Setting aside timer {card_id}: unreadable end date {config.get('end_date')!r}")
+            quarantined[card_id] = config
+            changed = True
+            continue
+        sort_order = config.get("sort_order")
+        if isinstance(sort_order, int) and not isinstance(sort_order, bool):
+            max_sort_order = max(max_sort_order, sort_order)
+        else:
+            missing_sort_order.append(config)
+        changed = changed or record_changed
+        normalized[card_id] = config
+    for config in missing_sort_order: # Keep them after the ordered ones, in file order
+        max_sort_order += 1
+        config["sort_order"] = max_sort_order
+        changed = True
+    return global_settings, normalized, changed, quarantined
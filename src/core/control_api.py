@@ -0,0 +1,160 @@
+import json
+
+from .config_schema import normalize_timer_config
+
+# Commands accepted by the local control endpoint, one JSON object per line. Every command
+# may carry a "ref", which is echoed in its reply so clients can match replies to requests.
+#   {"op": "list"}                                  -> {"ok": true, "timers": {id: record}}
+#   {"op": "upsert", "id": "timer_x", "timer": {}}  -> {"ok": true, "id": ...}; id optional when creating
+#   {"op": "delete", "id": "timer_x"}               -> {"ok": true, "id": ...}
+#   {"op": "reorder", "ids": [...]}                 -> {"ok": true}; listed timers first, the rest keep their order
+# Failed commands reply {"ok": false, "error": "..."} and leave the other commands of the batch applied.
+OP_LIST = "list"
+OP_UPSERT = "upsert"
+OP_DELETE = "delete"
+OP_REORDER = "reorder"
+TIMER_ID_PREFIX = "timer_" # Card drags are recognised by this prefix
+TIMER_FIELDS = (
+    "title", "end_date", "comment", "bg_color_title", "bg_color_time", "text_color_time",
+    "font_size_time", "recurrence", "count_mode", "group", "sort_order",
+)
+_MISSING = object()
+
+
+def parse_command(line):
+    # One line of input -> command dict; unreadable lines become commands that fail on apply
+    try:
+        command = json.loads(line)
+    except ValueError as e:
+        return {"error": f"invalid JSON: {e}"}
+    if not isinstance(command, dict):
+        return {"error": "command must be a JSON object"}
+    return command
+
+
+def prepare_commands(commands, records, new_id):
+    # Assigns ids to creating upserts and returns the ids the batch may touch, so the caller
+    # can take an undo snapshot before anything changes
+    card_ids = set()
+    for command in commands:
+        op = command.get("op")
+        if op == OP_UPSERT:
+            if command.get("id") is None:
+                command["id"] = new_id()
+            card_ids.add(command["id"])
+        elif op == OP_DELETE:
+            card_ids.add(command.get("id"))
+        elif op == OP_REORDER:
+            card_ids.update(records) # Reordering renumbers every timer
+    card_ids.discard(None)
+    return [card_id for card_id in card_ids if isinstance(card_id, str)]
+
+
+class BatchResult:
+    def __init__(self):
+        self.replies = []
+        self.created = []
+        self.updated = {} # card_id -> names of fields edited in place
+        self.deleted = set()
+
+    def changed_ids(self):
+        return set(self.created) | self.updated.keys() | self.deleted
+
+
+def _reply(command, ok=True, **fields):
+    reply = {"ok": ok}
+    if "ref" in command:
+        reply["ref"] = command["ref"]
+    reply.update(fields)
+    return reply
+
+
+def apply_commands(commands, records, defaults):
+    # Applies a batch to the timer records in place. Existing records keep their identity
+    # (cards share them) and are edited in place, so BatchResult.updated lists those edits;
+    # new ones are normalized like loaded ones. Returns a BatchResult.
+    result = BatchResult()
+    next_sort_order = max((config.get("sort_order", -1) for config in records.values()), default=-1) + 1
+    for command in commands:
+        op = command.get("op")
+        if "error" in command:
+            result.replies.append(_reply(command, False, error=command["error"]))
+        elif op == OP_LIST:
+            result.replies.append(_reply(command, timers={card_id: dict(config) for card_id, config in records.items()}))
+        elif op == OP_UPSERT:
+            error = _upsert(command, records, defaults, next_sort_order, result)
+            if error:
+                result.replies.append(_reply(command, False, error=error))
+            else:
+                next_sort_order = max(next_sort_order, records[command["id"]]["sort_order"] + 1)
+                result.replies.append(_reply(command, id=command["id"]))
+        elif op == OP_DELETE:
+            card_id = command.get("id")
+            if card_id not in records:
+                result.replies.append(_reply(command, False, error=f"unknown timer {card_id!r}"))
+                continue
+            del records[card_id]
+            if card_id in result.created:
+                result.created.remove(card_id)
+            else:
+                result.deleted.add(card_id)
+            result.updated.pop(card_id, None)
+            result.replies.append(_reply(command, id=card_id))
+        elif op == OP_REORDER:
+            ids = command.get("ids")
+            if not isinstance(ids, list):
+                result.replies.append(_reply(command, False, error="reorder needs a list of ids"))
+                continue
+            _reorder(ids, records, result)
+            next_sort_order = len(records)
+            result.replies.append(_reply(command))
+        else:
+            result.replies.append(_reply(command, False, error=f"unknown op {op!r}"))
+    return result
+
+
+def _upsert(command, records, defaults, next_sort_order, result):
+    # Returns an error message, or None once the record is stored
+    card_id = command["id"]
+    fields = command.get("timer")
+    if not isinstance(card_id, str) or not card_id.startswith(TIMER_ID_PREFIX):
+        return f"timer ids must start with {TIMER_ID_PREFIX!r}"
+    if not isinstance(fields, dict):
+        return "upsert needs a \"timer\" object"
+    unknown = sorted(set(fields) - set(TIMER_FIELDS))
+    if unknown:
+        return f"unknown fields: {', '.join(unknown)}"
+    sort_order = fields.get("sort_order")
+    if "sort_order" in fields and (not isinstance(sort_order, int) or isinstance(sort_order, bool)):
+        return "sort_order must be an integer"
+    existing = records.get(card_id)
+    if existing is None:
+        merged = {"title": "New Timer", "comment": "", "sort_order": next_sort_order}
+    else:
+        merged = dict(existing)
+    merged.update(fields) # A null recurrence, count_mode or group clears it during normalization
+    if normalize_timer_config(merged, defaults) is None:
+        return f"unreadable end_date {merged.get('end_date')!r}"
+    if existing is None:
+        records[card_id] = merged
+        result.created.append(card_id)
+    elif merged != existing:
+        changed = {key for key in merged.keys() | existing.keys() if merged.get(key, _MISSING) != existing.get(key, _MISSING)}
+        existing.clear()
+        existing.update(merged)
+        if card_id not in result.created:
+            result.updated.setdefault(card_id, set()).update(changed)
+    return None
+
+
+def _reorder(ids, records, result):
+    listed = [card_id for card_id in dict.fromkeys(ids) if card_id in records]
+    listed_set = set(listed)
+    rest = sorted((card_id for card_id in records if card_id not in listed_set),
+                  key=lambda card_id: (records[card_id]["sort_order"], records[card_id]["end_date"]))
+    for position, card_id in enumerate(listed + rest):
+        config = records[card_id]
+        if config["sort_order"] != position:
+            config["sort_order"] = position
+            if card_id not in result.created:
+                result.updated.setdefault(card_id, set()).add("sort_order")
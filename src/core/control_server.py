@@ -0,0 +1,113 @@
+import asyncio
+import os
+import socket
+import threading
+
+from .control_api import parse_command
+from .endpoints import parse_address
+
+# Local control endpoint speaking newline-delimited JSON (see control_api for the commands).
+# The asyncio loop runs on its own thread so reading and parsing never block the UI; each read
+# becomes one batch that is handed to submit_batch(commands), which must return a
+# concurrent.futures.Future resolving to one serialized reply per command. A client that
+# writes many lines at once therefore gets them applied together, and waits for the replies
+# before the next batch is read.
+# The address is a Unix socket path, or "tcp:[host:]port" for a loopback TCP port (the only
+# choice on Windows); see endpoints.parse_address.
+READ_CHUNK_BYTES = 256 * 1024
+MAX_LINE_BYTES = 4 * 1024 * 1024
+START_TIMEOUT_S = 5.0
+
+
+class ControlServer:
+    def __init__(self, address, submit_batch, sock=None):
+        self.address = parse_address(address)
+        self.submit_batch = submit_batch
+        self.sock = sock # Already listening on address (see single_instance.claim); bound here when None
+        self.error = None # Why the server failed to start, if it did
+        self._loop = None
+        self._stopping = None
+        self._thread = None
+        self._ready = threading.Event()
+
+    def start(self):
+        # Starts listening on a daemon thread; returns False (with self.error set) on failure
+        if self.address[0] == "unix" and not hasattr(socket, "AF_UNIX"):
+            self.error = "Unix sockets are not available here; use a tcp: address"
+            return False
+        self._thread = threading.Thread(target=self._run, name="control-server", daemon=True)
+        self._thread.start()
+        if not self._ready.wait(START_TIMEOUT_S):
+            self.error = "timed out starting the control server"
+        return self.error is None
+
+    def stop(self):
+        if self._loop is not None and self._stopping is not None:
+            self._loop.call_soon_threadsafe(self._stopping.set)
+        if self._thread is not None:
+            self._thread.join(START_TIMEOUT_S)
+            self._thread = None
+
+    def _run(self):
+        try:
+            asyncio.run(self._serve())
+        except Exception as e:
+            self.error = self.error or str(e)
+        finally:
+            self._ready.set()
+
+    async def _serve(self):
+        self._loop = asyncio.get_running_loop()
+        self._stopping = asyncio.Event()
+        try:
+            if self.sock is not None:
+                if self.address[0] == "unix":
+                    server = await asyncio.start_unix_server(self._serve_client, sock=self.sock, limit=MAX_LINE_BYTES)
+                else:
+                    server = await asyncio.start_server(self._serve_client, sock=self.sock, limit=MAX_LINE_BYTES)
+            elif self.address[0] == "unix":
+                path = self.address[1]
+                directory = os.path.dirname(path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                server = await asyncio.start_unix_server(self._serve_client, path, limit=MAX_LINE_BYTES)
+                os.chmod(path, 0o600) # Only the owning user may drive the app
+            else:
+                server = await asyncio.start_server(self._serve_client, self.address[1], self.address[2],
+                                                    limit=MAX_LINE_BYTES)
+        except OSError as e:
+            self.error = f"cannot listen on {self.address[1:]}: {e}"
+            return
+        self._ready.set()
+        async with server:
+            await self._stopping.wait()
+        if self.address[0] == "unix":
+            try:
+                os.remove(self.address[1])
+            except OSError:
+                pass
+
+    async def _serve_client(self, reader, writer):
+        pending = b""
+        try:
+            while not self._stopping.is_set():
+                chunk = await reader.read(READ_CHUNK_BYTES)
+                if not chunk and not pending:
+                    break
+                lines = (pending + chunk).split(b"\n")
+                pending = lines.pop() if chunk else b"" # At end of input the last line needs no newline
+                if len(pending) > MAX_LINE_BYTES:
+                    writer.write(b'{"ok": false, "error": "line too long"}\n')
+                    break
+                commands = [parse_command(line) for line in lines if line.strip()]
+                if not commands:
+                    continue
+                replies = await asyncio.wrap_future(self.submit_batch(commands))
+                writer.write(("\n".join(replies) + "\n").encode())
+                await writer.drain()
+        except ConnectionError:
+            pass
+        except Exception as e:
+            print(f"Control connection closed after an error: {e}")
+        finally:
+            writer.close()
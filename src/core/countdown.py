@@ -0,0 +1,213 @@
+from array import array
+from datetime import date
+
+from .business_days import HolidayCalendar, load_numpy
+
+ENDED = -1 # Value reported for timers whose end date has passed
+_UNSET = -2 # Value of a row that has never been computed, so its first refresh always reports it
+NUMPY_MIN_ROWS = 2000 # Below this a full pass in pure Python costs about a millisecond, less than importing NumPy
+
+
+def end_date_ordinal(end_date_str):
+    # Config dates are stored as "YYYY-MM-DD HH:MM:SS"; only the day matters for the countdown
+    return date.fromisoformat(end_date_str[:10]).toordinal()
+
+
+def format_countdown(value):
+    return "Ended" if value == ENDED else f"{value}"
+
+
+class CountdownDiff:
+    def __init__(self, changed=None, ended=None):
+        self.changed = changed if changed is not None else [] # (card_id, value) for every row whose value changed
+        self.ended = ended if ended is not None else [] # card ids that ran out during this pass (not on first sight)
+
+    def __bool__(self):
+        return bool(self.changed)
+
+
+class CountdownBoard:
+    # Days remaining for every timer, held in contiguous arrays of end-day ordinals and last
+    # computed values. A refresh is one batched pass over the arrays (vectorized with NumPy on
+    # large boards when it is installed) and only reports the rows whose value changed. Between day rollovers a
+    # refresh only looks at rows that were added or edited since the previous pass.
+    # Recurring rows cache their next occurrence as the end ordinal; only when that occurrence
+    # has passed is the row's rollover function asked for the next one. Rows in business mode
+    # count working days against the board's holiday calendar instead of calendar days.
+    def __init__(self, use_numpy=None):
+        # use_numpy: None vectorizes boards of NUMPY_MIN_ROWS rows or more, True any board and
+        # False none; either way only if NumPy is installed
+        self.use_numpy = use_numpy
+        self.calendar = HolidayCalendar()
+        self._ids = []
+        self._rows = {}
+        self._end_ordinals = array('q')
+        self._values = array('q')
+        self._business = array('b') # 1 for rows counting working days
+        self._business_ids = set()
+        self._dirty_rows = set()
+        self._rollovers = {}
+        self._today = None
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __contains__(self, card_id):
+        return card_id in self._rows
+
+    def set(self, card_id, end_ordinal, next_occurrence=None, business_days=False):
+        # next_occurrence(today_ordinal) -> ordinal of the first occurrence on or after today,
+        # for recurring timers; None for one-shot timers
+        if next_occurrence is None:
+            self._rollovers.pop(card_id, None)
+        else:
+            self._rollovers[card_id] = next_occurrence
+        if business_days:
+            self._business_ids.add(card_id)
+        else:
+            self._business_ids.discard(card_id)
+        row = self._rows.get(card_id)
+        if row is None:
+            row = len(self._ids)
+            self._rows[card_id] = row
+            self._ids.append(card_id)
+            self._end_ordinals.append(end_ordinal)
+            self._values.append(_UNSET)
+            self._business.append(1 if business_days else 0)
+        else:
+            self._end_ordinals[row] = end_ordinal
+            self._business[row] = 1 if business_days else 0
+            if next_occurrence is not None and self._values[row] == ENDED:
+                # An ended row that now recurs would recompute to ENDED again, an unchanged
+                # value that is never rolled; report it afresh so the refresh rolls it
+                self._values[row] = _UNSET
+        self._dirty_rows.add(row)
+
+    def set_calendar(self, calendar):
+        if calendar is not self.calendar:
+            self.calendar = calendar
+            if self._business_ids:
+                self.invalidate()
+
+    def remove(self, card_id):
+        self._rollovers.pop(card_id, None)
+        self._business_ids.discard(card_id)
+        row = self._rows.pop(card_id, None)
+        if row is None:
+            return
+        # Swap the last row into the freed slot so removal stays O(1)
+        last = len(self._ids) - 1
+        if row != last:
+            moved_id = self._ids[last]
+            self._ids[row] = moved_id
+            self._end_ordinals[row] = self._end_ordinals[last]
+            self._values[row] = self._values[last]
+            self._business[row] = self._business[last]
+            self._rows[moved_id] = row
+            if last in self._dirty_rows:
+                self._dirty_rows.add(row)
+        self._ids.pop()
+        self._end_ordinals.pop()
+        self._values.pop()
+        self._business.pop()
+        self._dirty_rows.discard(last)
+
+    def clear(self):
+        self._ids.clear()
+        self._rows.clear()
+        self._end_ordinals = array('q')
+        self._values = array('q')
+        self._business = array('b')
+        self._business_ids.clear()
+        self._dirty_rows.clear()
+        self._rollovers.clear()
+
+    def value(self, card_id):
+        row = self._rows.get(card_id)
+        if row is None or self._values[row] == _UNSET:
+            return None
+        return self._values[row]
+
+    def invalidate(self):
+        # Forces the next refresh to recompute every row (e.g. after a catch-up or clock change)
+        self._today = None
+
+    def refresh(self, today_ordinal):
+        if today_ordinal != self._today:
+            self._today = today_ordinal
+            self._dirty_rows.clear()
+            if self._ids and self._vectorize():
+                diff = self._refresh_all_numpy(today_ordinal)
+            else:
+                diff = self._refresh_rows(range(len(self._ids)), today_ordinal)
+        elif self._dirty_rows:
+            rows = sorted(self._dirty_rows)
+            self._dirty_rows.clear()
+            diff = self._refresh_rows(rows, today_ordinal)
+        else:
+            return CountdownDiff()
+        if self._rollovers and diff.changed:
+            self._roll_recurring(diff, today_ordinal)
+        return diff
+
+    def _vectorize(self):
+        if self.use_numpy is False or (self.use_numpy is None and len(self._ids) < NUMPY_MIN_ROWS):
+            return False
+        return load_numpy() is not None
+
+    def _roll_recurring(self, diff, today_ordinal):
+        # Recurring rows that just ran out move on to their next occurrence instead of ending
+        rollovers = self._rollovers
+        for index, (card_id, value) in enumerate(diff.changed):
+            if value != ENDED or card_id not in rollovers:
+                continue
+            row = self._rows[card_id]
+            next_ordinal = rollovers[card_id](today_ordinal)
+            value = next_ordinal - today_ordinal
+            if self._business[row]:
+                value = self.calendar.count(today_ordinal, next_ordinal)
+            self._end_ordinals[row] = next_ordinal
+            self._values[row] = value
+            diff.changed[index] = (card_id, value)
+        diff.ended = [card_id for card_id in diff.ended if card_id not in rollovers]
+
+    def _refresh_all_numpy(self, today_ordinal):
+        np = load_numpy()
+        end_ordinals = np.frombuffer(self._end_ordinals, dtype=np.int64)
+        values = end_ordinals - today_ordinal
+        if self._business_ids:
+            business_rows = np.flatnonzero((np.frombuffer(self._business, dtype=np.int8) == 1) & (values >= 0))
+            if business_rows.size:
+                values[business_rows] = self.calendar.count_many(today_ordinal, end_ordinals[business_rows])
+        values[values < 0] = ENDED
+        previous = np.frombuffer(self._values, dtype=np.int64)
+        changed_rows = np.flatnonzero(values != previous)
+        ended_rows = changed_rows[(values[changed_rows] == ENDED) & (previous[changed_rows] != _UNSET)]
+        np.copyto(previous, values)
+        id_at = self._ids.__getitem__
+        return CountdownDiff(
+            changed=list(zip(map(id_at, changed_rows.tolist()), values[changed_rows].tolist())),
+            ended=list(map(id_at, ended_rows.tolist())),
+        )
+
+    def _refresh_rows(self, rows, today_ordinal):
+        ids = self._ids
+        end_ordinals = self._end_ordinals
+        values = self._values
+        business = self._business
+        count_business_days = self.calendar.count
+        changed = []
+        ended = []
+        for row in rows:
+            value = end_ordinals[row] - today_ordinal
+            if value < 0:
+                value = ENDED
+            elif business[row]:
+                value = count_business_days(today_ordinal, end_ordinals[row])
+            previous = values[row]
+            if value != previous:
+                values[row] = value
+                changed.append((ids[row], value))
+                if value == ENDED and previous != _UNSET:
+                    ended.append(ids[row])
+        return CountdownDiff(changed, ended)
@@ -0,0 +1,64 @@
+import os
+import socket
+
+# Local endpoint addresses shared by the control server and the single-instance launcher: a
+# Unix socket path, or "tcp:[host:]port" for a loopback TCP port (the only choice on Windows).
+# Kept free of asyncio and Qt so a second launch can reach the running app cheaply.
+LOOPBACK_HOSTS = ("127.0.0.1", "localhost", "::1")
+TCP_PREFIX = "tcp:"
+LISTEN_BACKLOG = 16
+
+
+def parse_address(address):
+    # -> ("unix", path) or ("tcp", host, port); raises ValueError for anything else
+    if not isinstance(address, str) or not address:
+        raise ValueError(f"invalid control address {address!r}")
+    if not address.startswith(TCP_PREFIX):
+        return ("unix", address)
+    host, _, port = address[len(TCP_PREFIX):].rpartition(":")
+    host = host.strip("[]") or "127.0.0.1"
+    if host not in LOOPBACK_HOSTS:
+        raise ValueError(f"control endpoint must listen on loopback, not {host!r}")
+    try:
+        return ("tcp", host, int(port))
+    except ValueError:
+        raise ValueError(f"invalid control port in {address!r}") from None
+
+
+def _socket_for(parsed):
+    if parsed[0] == "unix":
+        if not hasattr(socket, "AF_UNIX"):
+            raise OSError("Unix sockets are not available here; use a tcp: address")
+        return socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    family = socket.AF_INET6 if ":" in parsed[1] else socket.AF_INET
+    return socket.socket(family, socket.SOCK_STREAM)
+
+
+def listen(parsed):
+    # A listening socket bound to a parsed address; raises OSError when it is taken
+    sock = _socket_for(parsed)
+    try:
+        if parsed[0] == "unix":
+            directory = os.path.dirname(parsed[1])
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            sock.bind(parsed[1])
+            os.chmod(parsed[1], 0o600) # Only the owning user may drive the app
+        else:
+            sock.bind(parsed[1:])
+        sock.listen(LISTEN_BACKLOG)
+    except OSError:
+        sock.close()
+        raise
+    return sock
+
+
+def connect(parsed, timeout):
+    sock = _socket_for(parsed)
+    sock.settimeout(timeout)
+    try:
+        sock.connect(parsed[1] if parsed[0] == "unix" else parsed[1:])
+    except OSError:
+        sock.close()
+        raise
+    return sock
@@ -0,0 +1,84 @@
+import heapq
+import itertools
+from datetime import timedelta
+
+DEFAULT_REMINDER_LEAD_DAYS = (7, 1)
+
+
+class ExpiryScheduler:
+    # Min-heap of upcoming expiries and lead-time reminders across all timers, keyed by the
+    # moment they are due. Each heap entry is (fire_at, generation, card_id, lead_days), where
+    # lead_days == 0 is the expiry itself. Rescheduling or removing a timer bumps or drops its
+    # generation instead of searching the heap; stale entries are skipped when they reach the
+    # top, so adds, edits and deletes all stay O(log n).
+    def __init__(self, lead_days=DEFAULT_REMINDER_LEAD_DAYS):
+        self.lead_days = self._normalize_lead_days(lead_days)
+        self._heap = []
+        self._generations = {}
+        self._end_times = {}
+        self._counter = itertools.count()
+
+    @staticmethod
+    def _normalize_lead_days(lead_days):
+        return tuple(sorted({int(days) for days in lead_days if int(days) > 0}, reverse=True))
+
+    def __len__(self):
+        return len(self._generations)
+
+    def __contains__(self, card_id):
+        return card_id in self._generations
+
+    def schedule(self, card_id, end_time, now):
+        generation = next(self._counter)
+        self._generations[card_id] = generation
+        self._end_times[card_id] = end_time
+        for lead in self.lead_days + (0,):
+            fire_at = end_time - timedelta(days=lead)
+            if fire_at > now:
+                heapq.heappush(self._heap, (fire_at, generation, card_id, lead))
+        self._compact_if_needed()
+
+    def unschedule(self, card_id):
+        self._generations.pop(card_id, None)
+        self._end_times.pop(card_id, None)
+
+    def clear(self):
+        self._heap.clear()
+        self._generations.clear()
+        self._end_times.clear()
+
+    def set_lead_days(self, lead_days, now):
+        self.lead_days = self._normalize_lead_days(lead_days)
+        end_times = dict(self._end_times)
+        self.clear()
+        for card_id, end_time in end_times.items():
+            self.schedule(card_id, end_time, now)
+
+    def next_fire_time(self):
+        self._drop_stale_top()
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now):
+        # Returns (card_id, lead_days) for every live entry due at or before `now`, earliest first
+        due = []
+        while True:
+            self._drop_stale_top()
+            if not self._heap or self._heap[0][0] > now:
+                return due
+            _, _, card_id, lead = heapq.heappop(self._heap)
+            due.append((card_id, lead))
+
+    def _is_live(self, entry):
+        return self._generations.get(entry[2]) == entry[1]
+
+    def _drop_stale_top(self):
+        heap = self._heap
+        while heap and not self._is_live(heap[0]):
+            heapq.heappop(heap)
+
+    def _compact_if_needed(self):
+        # Lazy deletion lets stale entries pile up under heavy editing; rebuild once they dominate
+        live_bound = len(self._generations) * (len(self.lead_days) + 1)
+        if len(self._heap) > 2 * live_bound + 64:
+            self._heap = [entry for entry in self._heap if self._is_live(entry)]
+            heapq.heapify(self._heap)
@@ -0,0 +1,81 @@
+import heapq
+from datetime import date
+
+from .countdown import ENDED, end_date_ordinal
+from .recurrence import parse_rule, next_occurrence
+
+# Timers name their group in config["group"]; a missing or blank name means the timer sits
+# directly on the board, outside any section. Group order and collapsed state are kept in
+# global settings so that empty groups survive a restart.
+UNGROUPED = ""
+
+
+def group_of(config):
+    return (config.get("group") or UNGROUPED).strip()
+
+
+def ordered_groups(configured_order, timer_configs):
+    # Configured order first, then any group only known from a timer config, by name
+    groups = [name for name in dict.fromkeys(configured_order or ()) if name]
+    known = set(groups)
+    extra = sorted({group_of(c) for c in timer_configs.values()} - known - {UNGROUPED}, key=str.casefold)
+    return groups + extra
+
+
+def split_by_group(sorted_items):
+    # (card_id, config) pairs in display order -> {group: [pairs]} keeping that order
+    grouped = {}
+    for card_id, config in sorted_items:
+        grouped.setdefault(group_of(config), []).append((card_id, config))
+    return grouped
+
+
+def days_remaining(config, today_ordinal, calendar=None, business_days=False):
+    # Same value a CountdownBoard row would show, computed for a single config without one
+    try:
+        end_ordinal = end_date_ordinal(config["end_date"])
+    except (KeyError, TypeError, ValueError):
+        return None
+    rule = parse_rule(config.get("recurrence"))
+    if rule is not None and end_ordinal < today_ordinal:
+        end_ordinal = next_occurrence(rule, date.fromordinal(end_ordinal), date.fromordinal(today_ordinal)).toordinal()
+    if end_ordinal < today_ordinal:
+        return ENDED
+    if business_days and calendar is not None:
+        return calendar.count(today_ordinal, end_ordinal)
+    return end_ordinal - today_ordinal
+
+
+class GroupSummary:
+    # Aggregate shown on a collapsed group's badge
+    def __init__(self, count=0, nearest=None):
+        self.count = count
+        self.nearest = nearest # Days to the soonest running timer, ENDED if all ended, None if empty
+
+
+def summarize_group(configs, today_ordinal, calendar=None, business_mode=None):
+    nearest = None
+    any_ended = False
+    for config in configs:
+        business_days = business_mode is not None and config.get("count_mode") == business_mode
+        value = days_remaining(config, today_ordinal, calendar, business_days)
+        if value is None:
+            continue
+        if value == ENDED:
+            any_ended = True
+        elif nearest is None or value < nearest:
+            nearest = value
+    if nearest is None and any_ended:
+        nearest = ENDED
+    return GroupSummary(len(configs), nearest)
+
+
+def nearest_timers(timer_configs, today_ordinal, count, calendar=None, business_mode=None):
+    # The `count` running timers that end soonest, as (days, card_id) pairs, soonest first
+    def running():
+        for card_id, config in timer_configs.items():
+            business_days = business_mode is not None and config.get("count_mode") == business_mode
+            value = days_remaining(config, today_ordinal, calendar, business_days)
+            if value is not None and value != ENDED:
+                yield value, card_id
+    return heapq.nsmallest(count, running())
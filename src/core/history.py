@@ -0,0 +1,136 @@
+from collections import deque
+
+# Undo history stores per-operation deltas instead of copies of the whole timer store: a step
+# holds the records it added or removed and, for edited records, only the fields that changed.
+# Untouched records are never copied, so a long history on a large board costs memory in
+# proportion to what the operations changed.
+DEFAULT_HISTORY_LIMIT = 200
+_MISSING = object() # Marks a field (or setting) that did not exist on one side of a change
+
+
+def field_delta(before, after):
+    delta = {}
+    for key in before.keys() | after.keys():
+        old = before.get(key, _MISSING)
+        new = after.get(key, _MISSING)
+        if old != new:
+            delta[key] = (old, new)
+    return delta
+
+
+def _apply_fields(target, delta, use_old):
+    for key, (old, new) in delta.items():
+        value = old if use_old else new
+        if value is _MISSING:
+            target.pop(key, None)
+        else:
+            target[key] = value
+
+
+class HistorySnapshot:
+    # State of the records (and settings) an operation is about to touch; shallow copies are
+    # enough since edits replace field values rather than mutating them
+    def __init__(self, records, card_ids, settings, settings_keys):
+        self.records = {card_id: dict(records[card_id]) if card_id in records else None for card_id in card_ids}
+        self.settings = {key: settings.get(key, _MISSING) for key in settings_keys}
+
+
+class HistoryStep:
+    def __init__(self, label):
+        self.label = label
+        self.added = {} # card_id -> record
+        self.removed = {} # card_id -> record
+        self.changed = {} # card_id -> {field: (old, new)}
+        self.settings = {} # setting key -> (old, new)
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.changed or self.settings)
+
+    def card_ids(self):
+        return self.added.keys() | self.removed.keys() | self.changed.keys()
+
+    def apply(self, records, settings, undo):
+        # Re-inserted records are copied so later in-place edits cannot alter the history
+        for card_id, record in (self.added if undo else self.removed).items():
+            records.pop(card_id, None)
+        for card_id, record in (self.removed if undo else self.added).items():
+            records[card_id] = dict(record)
+        for card_id, delta in self.changed.items():
+            if card_id in records: # The record may have been archived since
+                _apply_fields(records[card_id], delta, undo)
+        _apply_fields(settings, self.settings, undo)
+
+
+class UndoHistory:
+    def __init__(self, limit=DEFAULT_HISTORY_LIMIT):
+        self.undo_stack = deque(maxlen=limit) # Oldest steps fall off the far end
+        self.redo_stack = []
+
+    def snapshot(self, records, card_ids, settings=None, settings_keys=()):
+        return HistorySnapshot(records, card_ids, settings or {}, settings_keys)
+
+    def record(self, label, snapshot, records, settings=None):
+        # Compares the snapshot with the current state and pushes the delta, if any
+        step = HistoryStep(label)
+        for card_id, before in snapshot.records.items():
+            after = records.get(card_id)
+            if before is None and after is not None:
+                step.added[card_id] = dict(after)
+            elif before is not None and after is None:
+                step.removed[card_id] = before
+            elif before is not None:
+                delta = field_delta(before, after)
+                if delta:
+                    step.changed[card_id] = delta
+        settings = settings or {}
+        for key, old in snapshot.settings.items():
+            new = settings.get(key, _MISSING)
+            if old != new:
+                step.settings[key] = (old, new)
+        if not step:
+            return None
+        self.undo_stack.append(step)
+        self.redo_stack.clear()
+        return step
+
+    def undo(self, records, settings):
+        if not self.undo_stack:
+            return None
+        step = self.undo_stack.pop()
+        step.apply(records, settings, undo=True)
+        self.redo_stack.append(step)
+        return step
+
+    def redo(self, records, settings):
+        if not self.redo_stack:
+            return None
+        step = self.redo_stack.pop()
+        step.apply(records, settings, undo=False)
+        self.undo_stack.append(step)
+        return step
+
+    def undo_label(self):
+        return self.undo_stack[-1].label if self.undo_stack else None
+
+    def redo_label(self):
+        return self.redo_stack[-1].label if self.redo_stack else None
+
+    def forget(self, card_ids):
+        # Drops these records from every step; for records that left the store outside the
+        # history (archived), whose steps would otherwise re-insert or edit them. Steps left
+        # with nothing to do are dropped.
+        card_ids = set(card_ids)
+        for stack in (self.undo_stack, self.redo_stack):
+            kept = []
+            for step in stack:
+                for part in (step.added, step.removed, step.changed):
+                    for card_id in card_ids & part.keys():
+                        del part[card_id]
+                if step:
+                    kept.append(step)
+            stack.clear()
+            stack.extend(kept)
+
+    def clear(self):
+        self.undo_stack.clear()
+        self.redo_stack.clear()
@@ -0,0 +1,68 @@
+import argparse
+import json
+import os
+
+from .control_api import OP_UPSERT, TIMER_FIELDS
+
+# What run.py is asked to do, as launch commands. A launch applies its own once the window
+# exists; a later launch forwards them to the running app instead (see single_instance.py).
+#   {"op": "show"}                                   bring up the window, rebuilding it in tray mode
+#   {"op": "tray"}                                   close the window to the tray
+#   {"op": "add", "title": ..., "end_date": ...}     add a timer; end_date is optional
+#   {"op": "import", "path": ...}                    add every timer in a JSON file
+# Adds and imports become control API upserts, so they are checked and normalized the same way.
+LAUNCH_SHOW = "show"
+LAUNCH_TRAY = "tray"
+LAUNCH_ADD = "add"
+LAUNCH_IMPORT = "import"
+IMPORT_FIELDS = tuple(field for field in TIMER_FIELDS if field != "sort_order") # Imported timers go last
+
+
+def parse_launch_args(argv):
+    # -> (launch commands, the arguments left for Qt such as -platform or -style)
+    parser = argparse.ArgumentParser(prog="run.py", description="Countdown timer. While it is running, "
+                                     "launching it again hands these requests to the running app.")
+    parser.add_argument("--tray", action="store_true", help="go to the tray instead of showing the window")
+    parser.add_argument("--add", metavar="TITLE", action="append", default=[], help="add a timer (repeatable)")
+    parser.add_argument("--end", metavar="DATE", help="end date for --add, YYYY-MM-DD[ HH:MM:SS]; default tomorrow")
+    parser.add_argument("--import", dest="import_files", metavar="FILE", action="append", default=[],
+                        help="add the timers in a JSON file (repeatable)")
+    args, qt_args = parser.parse_known_args(argv)
+    commands = [{"op": LAUNCH_TRAY if args.tray else LAUNCH_SHOW}]
+    for title in args.add:
+        command = {"op": LAUNCH_ADD, "title": title}
+        if args.end:
+            command["end_date"] = args.end
+        commands.append(command)
+    for path in args.import_files:
+        # The running app may have another working directory
+        commands.append({"op": LAUNCH_IMPORT, "path": os.path.abspath(path)})
+    return commands, qt_args
+
+
+def imported_timers(document):
+    # Timer fields from an import file: a list of timers, an {id: timer} map, a saved config
+    # document or a single timer. Ids and sort orders are not kept
+    if isinstance(document, dict) and isinstance(document.get("timers"), dict):
+        document = document["timers"]
+    if isinstance(document, dict):
+        document = [document] if "end_date" in document else list(document.values())
+    if not isinstance(document, list):
+        raise ValueError("expected a list of timers, an {id: timer} map or a config document")
+    return [{key: value for key, value in timer.items() if key in IMPORT_FIELDS}
+            for timer in document if isinstance(timer, dict)]
+
+
+def timer_commands(command, default_end_date):
+    # Control API upserts for an add or import launch command; raises ValueError when an
+    # import file cannot be read
+    if command.get("op") == LAUNCH_ADD:
+        fields = {"title": str(command.get("title") or "New Timer"), "end_date": command.get("end_date") or default_end_date}
+        return [{"op": OP_UPSERT, "timer": fields}]
+    path = command.get("path")
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            timers = imported_timers(json.load(f))
+    except (OSError, TypeError, ValueError) as e:
+        raise ValueError(f"cannot import {path}: {e}") from None
+    return [{"op": OP_UPSERT, "timer": fields} for fields in timers]
@@ -0,0 +1,85 @@
+import ctypes
+import gc
+import sys
+import tracemalloc
+
+from PySide6.QtCore import QObject, QCoreApplication, QEvent
+
+
+def qobject_count(obj):
+    # The object itself plus every QObject parented (directly or indirectly) under it
+    return 1 + len(obj.findChildren(QObject))
+
+
+def deep_sizeof(value):
+    # Approximate Python heap size of a config record (dicts, lists and scalars only)
+    size = sys.getsizeof(value)
+    if isinstance(value, dict):
+        size += sum(deep_sizeof(k) + deep_sizeof(v) for k, v in value.items())
+    elif isinstance(value, (list, tuple)):
+        size += sum(deep_sizeof(v) for v in value)
+    return size
+
+
+def flush_deferred_deletes():
+    # Cards are removed with deleteLater(); make sure they are really gone before measuring
+    QCoreApplication.sendPostedEvents(None, QEvent.Type.DeferredDelete)
+    gc.collect()
+
+
+def release_free_memory():
+    # Hands heap pages freed by a large teardown back to the OS. glibc keeps them for reuse, so
+    # the process would otherwise stay at its peak size; a no-op on other C libraries
+    if not sys.platform.startswith("linux"):
+        return False
+    try:
+        return bool(ctypes.CDLL("libc.so.6").malloc_trim(0))
+    except (OSError, AttributeError):
+        return False
+
+
+def measure_bytes_per_timer(app):
+    # Tears the board down, rebuilds it under tracemalloc and attributes the growth to the cards
+    was_tracing = tracemalloc.is_tracing()
+    if not was_tracing:
+        tracemalloc.start()
+    try:
+        app.clear_timer_cards()
+        flush_deferred_deletes()
+        before = tracemalloc.get_traced_memory()[0]
+        app.create_timer_cards()
+        gc.collect()
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        if not was_tracing:
+            tracemalloc.stop()
+    card_count = len(app.timers)
+    return {
+        "cards": card_count,
+        "python_heap_bytes": after - before,
+        "bytes_per_timer": (after - before) / card_count if card_count else 0.0,
+    }
+
+
+def memory_report(app, measure_rebuild=False):
+    per_timer = {}
+    for card_id, card in app.timers.items():
+        per_timer[card_id] = {
+            "qobjects": qobject_count(card),
+            "config_bytes": deep_sizeof(app.timer_configs.get(card_id, {})),
+        }
+    total_qobjects = sum(entry["qobjects"] for entry in per_timer.values())
+    report = {
+        "timers": len(per_timer),
+        "qobjects_total": total_qobjects,
+        "qobjects_per_timer": total_qobjects / len(per_timer) if per_timer else 0.0,
+        "config_bytes_total": deep_sizeof(app.timer_store.records),
+        "per_timer": per_timer,
+    }
+    if tracemalloc.is_tracing():
+        current, peak = tracemalloc.get_traced_memory()
+        report["traced_current_bytes"] = current
+        report["traced_peak_bytes"] = peak
+    if measure_rebuild:
+        report["rebuild"] = measure_bytes_per_timer(app)
+    return report
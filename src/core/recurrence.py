@@ -0,0 +1,81 @@
+import calendar
+from datetime import date, timedelta
+
+# Recurrence rules are stored on a timer config as {"freq": <one of FREQUENCIES>, "interval": N}.
+# The config's end_date is the anchor, i.e. the first occurrence. For "last_weekday" the
+# weekday is taken from the anchor (an anchor on a Friday repeats on the last Friday).
+FREQ_DAILY = "daily" # Every N days
+FREQ_WEEKLY = "weekly"
+FREQ_MONTHLY = "monthly"
+FREQ_YEARLY = "yearly"
+FREQ_LAST_WEEKDAY = "last_weekday" # Last <anchor weekday> of every N months
+FREQUENCIES = (FREQ_YEARLY, FREQ_MONTHLY, FREQ_WEEKLY, FREQ_DAILY, FREQ_LAST_WEEKDAY)
+
+
+def parse_rule(raw_rule):
+    # Returns a normalized rule dict, or None for "does not repeat" and anything malformed
+    if not isinstance(raw_rule, dict) or raw_rule.get("freq") not in FREQUENCIES:
+        return None
+    try:
+        interval = max(1, int(raw_rule.get("interval", 1)))
+    except (TypeError, ValueError):
+        interval = 1
+    return {"freq": raw_rule["freq"], "interval": interval}
+
+
+def _ceil_div(numerator, denominator):
+    return -(-numerator // denominator)
+
+
+def _add_months(anchor, months):
+    # Same day of month as the anchor, clamped to the length of the target month
+    month_index = anchor.month - 1 + months
+    year = anchor.year + month_index // 12
+    month = month_index % 12 + 1
+    return date(year, month, min(anchor.day, calendar.monthrange(year, month)[1]))
+
+
+def _last_weekday_after_months(anchor, months):
+    month_index = anchor.month - 1 + months
+    year = anchor.year + month_index // 12
+    month = month_index % 12 + 1
+    last_day = date(year, month, calendar.monthrange(year, month)[1])
+    return last_day - timedelta(days=(last_day.weekday() - anchor.weekday()) % 7)
+
+
+def next_occurrence(rule, anchor, today):
+    # First occurrence on or after `today`, computed directly from the rule (no iteration)
+    if today <= anchor:
+        if rule["freq"] == FREQ_LAST_WEEKDAY:
+            return _last_weekday_after_months(anchor, 0)
+        return anchor
+    interval = rule["interval"]
+    freq = rule["freq"]
+    if freq in (FREQ_DAILY, FREQ_WEEKLY):
+        step = interval * (7 if freq == FREQ_WEEKLY else 1)
+        return anchor + timedelta(days=_ceil_div((today - anchor).days, step) * step)
+    if freq == FREQ_YEARLY:
+        interval *= 12
+        occurrence_at = _add_months
+    elif freq == FREQ_MONTHLY:
+        occurrence_at = _add_months
+    else:
+        occurrence_at = _last_weekday_after_months
+    months_elapsed = (today.year - anchor.year) * 12 + today.month - anchor.month
+    months = max(0, _ceil_div(months_elapsed, interval) * interval)
+    candidate = occurrence_at(anchor, months)
+    if candidate < today:
+        candidate = occurrence_at(anchor, months + interval)
+    return candidate
+
+
+
+def rollover_for(raw_rule, anchor):
+    # Adapter for CountdownBoard: maps today's ordinal to the next occurrence's ordinal
+    rule = parse_rule(raw_rule)
+    if rule is None:
+        return None
+
+    def next_ordinal(today_ordinal):
+        return next_occurrence(rule, anchor, date.fromordinal(today_ordinal)).toordinal()
+    return next_ordinal
@@ -0,0 +1,107 @@
+import html
+import re
+
+# Comments are stored as QTextEdit HTML; only the visible text is indexed. Base64 images sit
+# inside <img src=...> so they disappear with the tags.
+_INVISIBLE_BLOCK_RE = re.compile(r'<(head|style|script)\b.*?</\1\s*>', re.IGNORECASE | re.DOTALL)
+_TAG_RE = re.compile(r'<[^>]*>')
+_WHITESPACE_RE = re.compile(r'\s+')
+MIN_TRIGRAM_QUERY = 3 # Shorter terms are answered by a substring scan over the stored texts
+
+
+def html_to_text(markup):
+    if not markup:
+        return ""
+    if '<' not in markup:
+        return markup
+    text = _TAG_RE.sub(' ', _INVISIBLE_BLOCK_RE.sub(' ', markup))
+    return html.unescape(text)
+
+
+def normalize(text):
+    return _WHITESPACE_RE.sub(' ', text.casefold()).strip()
+
+
+def _trigrams(text):
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class TimerSearchIndex:
+    # Trigram index over each timer's title and plain-text comment. Entries are updated one
+    # timer at a time, so adding, editing or deleting a timer never rescans the others.
+    def __init__(self):
+        self._texts = {} # card_id -> normalized searchable text
+        self._postings = {} # trigram -> set of card_ids
+
+    def __len__(self):
+        return len(self._texts)
+
+    def __contains__(self, card_id):
+        return card_id in self._texts
+
+    def update(self, card_id, title, comment_html):
+        text = normalize(f"{title or ''}\n{html_to_text(comment_html)}")
+        old_text = self._texts.get(card_id)
+        if old_text == text:
+            return
+        old_grams = _trigrams(old_text) if old_text is not None else set()
+        new_grams = _trigrams(text)
+        for gram in old_grams - new_grams:
+            ids = self._postings[gram]
+            ids.discard(card_id)
+            if not ids:
+                del self._postings[gram]
+        for gram in new_grams - old_grams:
+            self._postings.setdefault(gram, set()).add(card_id)
+        self._texts[card_id] = text
+
+    def update_from_config(self, card_id, config):
+        self.update(card_id, config.get("title"), config.get("comment"))
+
+    def remove(self, card_id):
+        text = self._texts.pop(card_id, None)
+        if text is None:
+            return
+        for gram in _trigrams(text):
+            ids = self._postings.get(gram)
+            if ids is not None:
+                ids.discard(card_id)
+                if not ids:
+                    del self._postings[gram]
+
+    def clear(self):
+        self._texts.clear()
+        self._postings.clear()
+
+    def rebuild(self, timer_configs):
+        self.clear()
+        for card_id, config in timer_configs.items():
+            self.update_from_config(card_id, config)
+
+    def search(self, query):
+        # Returns the set of card_ids containing every whitespace-separated term, or None
+        # when the query is empty (i.e. everything matches)
+        terms = normalize(query).split()
+        if not terms:
+            return None
+        terms.sort(key=len, reverse=True) # Longest term first gives the smallest candidate set
+        candidates = None
+        for term in terms:
+            if len(term) >= MIN_TRIGRAM_QUERY:
+                postings = [self._postings.get(gram) for gram in _trigrams(term)]
+                if not all(postings):
+                    return set()
+                postings.sort(key=len)
+                matched = set(postings[0]) if candidates is None else candidates & postings[0]
+                for ids in postings[1:]:
+                    if not matched:
+                        break
+                    matched &= ids
+                # Trigrams can match out of order, so confirm the term really occurs
+                candidates = {card_id for card_id in matched if term in self._texts[card_id]}
+            else:
+                pool = self._texts if candidates is None else candidates
+                candidates = {card_id for card_id in pool if term in self._texts[card_id]}
+            if not candidates:
+                break
+        return candidates
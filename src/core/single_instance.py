@@ -0,0 +1,58 @@
+import json
+import os
+import socket
+import sys
+
+from .endpoints import connect, listen, parse_address
+
+# One running app per data directory. The first launch binds the instance endpoint before it
+# loads anything and holds it until it quits (App.serve_launch_requests answers on it); a later
+# launch finds it taken, sends its launch commands there (see launch.py) and exits without
+# starting Qt or reading the config, so the two never race on saves.
+INSTANCE_SOCKET_PATH = os.path.join("data", "instance.sock") # Next to main_app.CONFIG_FILE
+DEFAULT_INSTANCE_TCP_ADDRESS = "tcp:127.0.0.1:47614" # Used instead on Windows
+FORWARD_TIMEOUT_S = 10.0 # The running app may still be starting up
+READ_CHUNK_BYTES = 64 * 1024
+
+
+def instance_address():
+    if sys.platform == "win32":
+        return DEFAULT_INSTANCE_TCP_ADDRESS
+    return INSTANCE_SOCKET_PATH
+
+
+def claim(address):
+    # A listening socket when no other instance runs, or None when one answers at address.
+    # A socket file left by an instance that did not shut down cleanly is replaced. Raises
+    # OSError when the address cannot be bound and nothing answers there either
+    parsed = parse_address(address)
+    try:
+        return listen(parsed)
+    except OSError as bind_error:
+        try:
+            connect(parsed, FORWARD_TIMEOUT_S).close()
+            return None
+        except OSError:
+            pass
+        if parsed[0] != "unix" or not os.path.exists(parsed[1]):
+            raise bind_error
+    os.remove(parsed[1]) # Nothing answers on this socket file: its instance is gone
+    return listen(parsed)
+
+
+def forward(address, commands, timeout=FORWARD_TIMEOUT_S):
+    # Sends launch commands to the running instance and returns its replies, one dict per
+    # command. Raises OSError or ValueError when it cannot be reached or does not answer
+    with connect(parse_address(address), timeout) as sock:
+        sock.sendall("".join(json.dumps(command) + "\n" for command in commands).encode())
+        sock.shutdown(socket.SHUT_WR) # Done sending; the instance replies and closes
+        data = b""
+        while True:
+            chunk = sock.recv(READ_CHUNK_BYTES)
+            if not chunk:
+                break
+            data += chunk
+    replies = [json.loads(line) for line in data.splitlines() if line.strip()]
+    if len(replies) != len(commands):
+        raise ValueError(f"expected {len(commands)} replies, got {len(replies)}")
+    return replies
@@ -0,0 +1,166 @@
+import json
+import os
+import re
+import threading
+from datetime import datetime
+
+# Rotating snapshots of the config document. A chain starts with a full "base" snapshot and
+# continues with "delta" snapshots that only hold the settings and timer records that changed
+# since the previous snapshot (other top-level keys, such as the quarantined timers, are
+# stored whole when they change), so disk use grows with the amount edited rather than the board
+# size. Retention drops whole chains, oldest first.
+# Files are named <seq>-<kind>-<taken at>.json so the picker can list them without reading them.
+DEFAULT_DELTAS_PER_BASE = 20
+DEFAULT_KEEP_CHAINS = 5
+KIND_BASE = "base"
+KIND_DELTA = "delta"
+_FILE_RE = re.compile(r'^(\d{6})-(base|delta)-(\d{8}T\d{6})\.json$')
+_STAMP_FORMAT = "%Y%m%dT%H%M%S"
+_ABSENT = object()
+_DIFFED_KEYS = ("global_settings", "timers")
+
+
+def document_delta(previous, current):
+    # Differences between two {"global_settings", "timers", ...} documents; None when identical
+    prev_settings = previous.get("global_settings", {})
+    settings = current.get("global_settings", {})
+    prev_timers = previous.get("timers", {})
+    timers = current.get("timers", {})
+    delta = {
+        "settings_set": {k: v for k, v in settings.items() if prev_settings.get(k, _ABSENT) != v},
+        "settings_unset": [k for k in prev_settings if k not in settings],
+        "timers_set": {k: v for k, v in timers.items() if prev_timers.get(k) != v},
+        "timers_removed": [k for k in prev_timers if k not in timers],
+    }
+    document_set = {k: v for k, v in current.items() if k not in _DIFFED_KEYS and previous.get(k, _ABSENT) != v}
+    document_unset = [k for k in previous if k not in _DIFFED_KEYS and k not in current]
+    if document_set: # Only present when needed, so ordinary deltas keep their shape
+        delta["document_set"] = document_set
+    if document_unset:
+        delta["document_unset"] = document_unset
+    if not any(delta.values()):
+        return None
+    return delta
+
+
+def apply_delta(document, delta):
+    settings = document.setdefault("global_settings", {})
+    timers = document.setdefault("timers", {})
+    settings.update(delta.get("settings_set", {}))
+    for key in delta.get("settings_unset", []):
+        settings.pop(key, None)
+    timers.update(delta.get("timers_set", {}))
+    for card_id in delta.get("timers_removed", []):
+        timers.pop(card_id, None)
+    document.update(delta.get("document_set", {}))
+    for key in delta.get("document_unset", []):
+        document.pop(key, None)
+    return document
+
+
+class SnapshotInfo:
+    def __init__(self, seq, kind, taken_at, path):
+        self.seq = seq
+        self.kind = kind
+        self.taken_at = taken_at # datetime
+        self.path = path
+
+
+class SnapshotStore:
+    # take() is meant to run on a background worker; a lock keeps it apart from list/restore
+    # calls made by the UI thread
+    def __init__(self, directory, deltas_per_base=DEFAULT_DELTAS_PER_BASE, keep_chains=DEFAULT_KEEP_CHAINS):
+        self.directory = directory
+        self.deltas_per_base = deltas_per_base
+        self.keep_chains = keep_chains
+        self._lock = threading.Lock()
+        self._last_document = None # State of the newest snapshot, restored from disk on first use
+        self._deltas_since_base = 0
+
+    def list(self):
+        with self._lock:
+            return self._list_unlocked()
+
+    def _list_unlocked(self):
+        if not os.path.isdir(self.directory):
+            return []
+        infos = []
+        for name in os.listdir(self.directory):
+            match = _FILE_RE.match(name)
+            if match:
+                infos.append(SnapshotInfo(int(match.group(1)), match.group(2),
+                                          datetime.strptime(match.group(3), _STAMP_FORMAT),
+                                          os.path.join(self.directory, name)))
+        infos.sort(key=lambda info: info.seq)
+        return infos
+
+    def take(self, serialized_document, now=None):
+        # Records the document if it differs from the newest snapshot; returns the new
+        # SnapshotInfo or None when nothing changed
+        document = json.loads(serialized_document)
+        now = now or datetime.now()
+        with self._lock:
+            infos = self._list_unlocked()
+            if self._last_document is None and infos:
+                try:
+                    self._last_document = self._materialize_unlocked(infos, infos[-1].seq)
+                    self._deltas_since_base = sum(1 for info in infos if info.kind == KIND_DELTA
+                                                  and info.seq > self._chain_base(infos, infos[-1].seq).seq)
+                except (OSError, ValueError, KeyError) as e:
+                    print(f"Snapshot chain unreadable, starting a new one: {e}")
+                    self._last_document = None
+            seq = infos[-1].seq + 1 if infos else 1
+            if self._last_document is None or self._deltas_since_base >= self.deltas_per_base:
+                info = self._write(seq, KIND_BASE, now, {"document": document})
+                self._deltas_since_base = 0
+            else:
+                delta = document_delta(self._last_document, document)
+                if delta is None:
+                    return None
+                info = self._write(seq, KIND_DELTA, now, delta)
+                self._deltas_since_base += 1
+            self._last_document = document
+            self._apply_retention(infos + [info])
+            return info
+
+    def materialize(self, seq):
+        with self._lock:
+            return self._materialize_unlocked(self._list_unlocked(), seq)
+
+    def _chain_base(self, infos, seq):
+        bases = [info for info in infos if info.kind == KIND_BASE and info.seq <= seq]
+        if not bases:
+            raise ValueError(f"No base snapshot before #{seq}")
+        return bases[-1]
+
+    def _materialize_unlocked(self, infos, seq):
+        base = self._chain_base(infos, seq)
+        with open(base.path, 'r') as f:
+            document = json.load(f)["document"]
+        for info in infos:
+            if info.kind == KIND_DELTA and base.seq < info.seq <= seq:
+                with open(info.path, 'r') as f:
+                    apply_delta(document, json.load(f))
+        return document
+
+    def _write(self, seq, kind, now, payload):
+        os.makedirs(self.directory, exist_ok=True)
+        name = f"{seq:06d}-{kind}-{now.strftime(_STAMP_FORMAT)}.json"
+        path = os.path.join(self.directory, name)
+        temp_path = path + ".tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(payload, f, separators=(',', ':'))
+        os.replace(temp_path, path)
+        return SnapshotInfo(seq, kind, now.replace(microsecond=0), path)
+
+    def _apply_retention(self, infos):
+        base_seqs = [info.seq for info in infos if info.kind == KIND_BASE]
+        if len(base_seqs) <= self.keep_chains:
+            return
+        oldest_kept = base_seqs[-self.keep_chains]
+        for info in infos:
+            if info.seq < oldest_kept:
+                try:
+                    os.remove(info.path)
+                except OSError as e:
+                    print(f"Error removing old snapshot {info.path}: {e}")
@@ -0,0 +1,139 @@
+from collections.abc import MutableMapping
+
+# Timer records keyed by card id, behind a dict-like interface that records what changed.
+# Adding, replacing or removing a record is noticed automatically; fields edited in place are
+# reported with update() or touch(). Changes are coalesced into one ChangeSet and delivered
+# to subscribers when flush() runs, which the app schedules once per event-loop turn, so a
+# burst of edits costs one save and one board update.
+MOVE_FIELDS = frozenset(("sort_order", "group"))
+_MISSING = object()
+
+
+class ChangeSet:
+    def __init__(self):
+        self.reset = False # Every record may have changed (e.g. a snapshot was restored)
+        self.added = set()
+        self.removed = set() # An id in both removed and added was replaced
+        self.updated = {} # card_id -> names of the fields that changed
+        self.settings = set() # Global setting keys that changed
+
+    def __bool__(self):
+        return bool(self.reset or self.added or self.removed or self.updated or self.settings)
+
+    def has_record_changes(self):
+        return bool(self.reset or self.added or self.removed or self.updated)
+
+    def updated_with(self, fields):
+        return {card_id for card_id, changed in self.updated.items() if not changed.isdisjoint(fields)}
+
+    def moved(self):
+        return self.updated_with(MOVE_FIELDS)
+
+
+class TimerStore(MutableMapping):
+    def __init__(self, records=None, schedule_flush=None):
+        # schedule_flush(callback) arranges for callback to run soon (the app posts it to the
+        # Qt event loop); without it, flush() must be called explicitly
+        self.records = dict(records or {})
+        self.schedule_flush = schedule_flush
+        self._changes = ChangeSet()
+        self._flush_scheduled = False
+        self._subscribers = []
+
+    # Read access goes straight to the dict; it is on every hot path
+    def __getitem__(self, card_id):
+        return self.records[card_id]
+
+    def __contains__(self, card_id):
+        return card_id in self.records
+
+    def __iter__(self):
+        return iter(self.records)
+
+    def __len__(self):
+        return len(self.records)
+
+    def get(self, card_id, default=None):
+        return self.records.get(card_id, default)
+
+    def keys(self):
+        return self.records.keys()
+
+    def values(self):
+        return self.records.values()
+
+    def items(self):
+        return self.records.items()
+
+    def __setitem__(self, card_id, config):
+        replaced = card_id in self.records
+        self.records[card_id] = config
+        if not self._changes.reset:
+            if replaced and card_id not in self._changes.added:
+                self._changes.removed.add(card_id)
+            self._changes.added.add(card_id)
+            self._changes.updated.pop(card_id, None)
+        self._changed()
+
+    def __delitem__(self, card_id):
+        del self.records[card_id]
+        if not self._changes.reset:
+            if card_id in self._changes.added:
+                self._changes.added.discard(card_id) # Added and removed within one turn
+            else:
+                self._changes.removed.add(card_id)
+            self._changes.updated.pop(card_id, None)
+        self._changed()
+
+    def update_fields(self, card_id, fields, normalize=None):
+        # Applies fields to a record in place (optionally normalizing it) and reports the
+        # fields whose values actually changed; returns that set
+        config = self.records[card_id]
+        before = dict(config)
+        config.update(fields)
+        if normalize is not None:
+            normalize(config)
+        changed = {key for key in before.keys() | config.keys() if before.get(key, _MISSING) != config.get(key, _MISSING)}
+        self.touch(card_id, changed)
+        return changed
+
+    def touch(self, card_id, fields):
+        # Reports fields of a record that were edited in place
+        if not fields or card_id not in self.records:
+            return
+        if not self._changes.reset and card_id not in self._changes.added:
+            self._changes.updated.setdefault(card_id, set()).update(fields)
+        self._changed()
+
+    def replace_all(self, records):
+        self.records = records
+        self._changes = ChangeSet()
+        self._changes.reset = True
+        self._changed()
+
+    def settings_changed(self, *keys):
+        self._changes.settings.update(keys)
+        self._changed()
+
+    def subscribe(self, callback, fields=None, settings=False):
+        # callback(changes) runs on flush when records were added, removed or reset, when
+        # any of fields changed (any field if fields is None), or, with settings=True, when
+        # a global setting changed
+        self._subscribers.append((callback, None if fields is None else frozenset(fields), settings))
+
+    def _changed(self):
+        if self.schedule_flush is not None and not self._flush_scheduled:
+            self._flush_scheduled = True
+            self.schedule_flush(self.flush)
+
+    def flush(self):
+        self._flush_scheduled = False
+        changes, self._changes = self._changes, ChangeSet()
+        if not changes:
+            return changes
+        structural = changes.reset or changes.added or changes.removed
+        for callback, fields, settings in self._subscribers:
+            if (structural or (settings and changes.settings)
+                    or (changes.updated and (fields is None or changes.updated_with(fields)))):
+                callback(changes)
+        return changes
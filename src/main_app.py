@@ -1,15 +1,38 @@
 import sys
 from PySide6.QtWidgets import (
-    QApplication, QMainWindow, QWidget, QVBoxLayout, QScrollArea, QFrame, QMenu
+    QApplication, QMainWindow, QWidget, QVBoxLayout, QScrollArea, QFrame, QMenu, QLineEdit, QInputDialog, QMessageBox,
+    QSystemTrayIcon
 )
-from PySide6.QtCore import Qt, QByteArray
+from PySide6.QtCore import Qt, QByteArray, QTimer, QEvent, Signal
 from PySide6 import QtGui
-from PySide6.QtGui import QColor, QAction # Add QColor, QAction
+from PySide6.QtGui import QAction, QKeySequence, QShortcut
 from .components.timer_card import TimerCard, DEFAULT_TIME_FONT_SIZE, DEFAULT_TITLE_BG_COLOR, DEFAULT_TIME_BG_COLOR, DEFAULT_TIME_TEXT_COLOR # Corrected and added DEFAULT_TIME_TEXT_COLOR
+from .core.metrics import metrics, DEFAULT_SIZE_BUCKETS
+from .core.countdown import CountdownBoard, end_date_ordinal
+from .core.expiry_scheduler import ExpiryScheduler, DEFAULT_REMINDER_LEAD_DAYS
+from .core.recurrence import parse_rule, next_occurrence, rollover_for
+from .core.business_days import load_holiday_calendar, COUNT_MODE_BUSINESS
+from .core.search_index import TimerSearchIndex
+from .core.config_schema import SCHEMA_VERSION, SCHEMA_VERSION_KEY, QUARANTINE_KEY, document_version, normalize_document, normalize_timer_config
+from .core.history import UndoHistory
+from .core.snapshots import SnapshotStore, DEFAULT_KEEP_CHAINS
+from .core.assets import AssetStore, ASSET_DIR_NAME, mentioned_assets
+from .core.archive import ArchiveStore, DEFAULT_ARCHIVE_GRACE_DAYS, RESTORED_ON_KEY, select_expired
+from .core.control_api import prepare_commands, apply_commands
+from .core.launch import LAUNCH_ADD, LAUNCH_IMPORT, LAUNCH_SHOW, LAUNCH_TRAY, timer_commands
+from .core.timer_store import TimerStore
+from .core.clock import SYSTEM_CLOCK
+from .core.groups import UNGROUPED, group_of, nearest_timers, ordered_groups, split_by_group, summarize_group
+from .components.group_section import GroupSection
+from .components.drag_reorder import DragReorder
+from .components.card_render_cache import CardRenderCache, DEFAULT_RENDER_CACHE_MB
+import copy
 import os
 import json
+import time
 import uuid
-from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor, Future
+from datetime import datetime, timedelta, date
 
 CHROMIUM_CUSTOM_MIME = 'application/x-qt-windows-mime;value="Chromium Web Custom MIME Data Format"'
 TEXT_PLAIN_MIME = 'text/plain'
@@ -18,21 +41,44 @@ TEXT_HTML_MIME = 'text/html'
 DEFAULT_TIME_TEXT_COLOR = "#FFFFFF" # Default color for the countdown time text
 
 CONFIG_FILE = os.path.join("data", "timers_config.json")
+HOLIDAY_FILE = os.path.join("data", "holidays.json") # JSON list of ISO dates (or {"holidays": [...]})
+ARCHIVE_FILE_NAME = "timers_archive.jsonl" # Kept next to CONFIG_FILE
+SNAPSHOT_DIR_NAME = "snapshots" # Also next to CONFIG_FILE
+SNAPSHOT_INTERVAL_MS = 5 * 60 * 1000 # Saved changes are snapshotted at most this often
+SNAPSHOT_STARTUP_DELAY_MS = 10 * 1000
+CONTROL_SOCKET_NAME = "control.sock" # Default control endpoint, next to CONFIG_FILE
+DEFAULT_CONTROL_TCP_ADDRESS = "tcp:127.0.0.1:47613" # Used instead on Windows
 GLOBAL_SETTINGS_KEY = "global_settings"
 TIMERS_KEY = "timers"
 
+TICK_INTERVAL_MS = 1000 # One board-wide tick replaces the per-card 1 s timers
+MAX_EXPIRY_WAIT_MS = 60 * 60 * 1000 # Re-check the expiry heap at least hourly (sleep, clock changes)
+DIALOG_PREWARM_DELAY_MS = 1500 # Build the settings dialog once startup has settled
+INSTANCE_SERVER_DELAY_MS = 250 # Answer other launches once the window has painted
+FILTER_BATCH_THRESHOLD = 32 # Cards flipped per keystroke above which the container is hidden while filtering
+SEARCH_FIELDS = ("title", "comment")
+EXPIRY_FIELDS = ("end_date", "recurrence")
+CARD_FIELDS = ("title", "end_date", "bg_color_title", "bg_color_time", "text_color_time", "font_size_time")
+COUNTDOWN_FIELDS = ("end_date", "recurrence", "count_mode")
+BADGE_FIELDS = COUNTDOWN_FIELDS + ("group",)
+
 # Define a style for opaque backgrounds when the main window is transparent
 OPAQUE_WIDGET_STYLE_FOR_TRANSPARENT_WINDOW = "background-color: palette(window);"
 
 class App(QMainWindow):
-    def __init__(self):
+    control_batch_received = Signal(object, object) # (commands, Future), emitted on the control server thread
+    launch_request_received = Signal(object, object) # (launch commands, Future) forwarded by a later launch
+
+    def __init__(self, clock=None):
         super().__init__()
+        self.clock = clock or SYSTEM_CLOCK # Pass a SimulatedClock to fast-forward the board
 
         self.setWindowTitle("Countdown Timer")
         self.default_width = 220
         self.default_height = 600
 
-        self.global_settings = {
+        # Settings a document does not name fall back to these (see normalize_document)
+        self.default_global_settings = {
             "default_time_font_size": DEFAULT_TIME_FONT_SIZE,
             "default_bg_color_title": DEFAULT_TITLE_BG_COLOR,
             "default_bg_color_time": DEFAULT_TIME_BG_COLOR,
@@ -43,42 +89,64 @@ class App(QMainWindow):
             "window_width": None,
             "window_height": None,
             "main_window_transparent_background": False,
-            "main_window_opacity_level": 1.0
+            "main_window_opacity_level": 1.0,
+            "expiry_notifications_enabled": True,
+            "reminder_lead_days": list(DEFAULT_REMINDER_LEAD_DAYS),
+            "groups": [], # Group display order; timers name their group in config["group"]
+            "collapsed_groups": [],
+            "archive_after_days": DEFAULT_ARCHIVE_GRACE_DAYS, # Days after ending before a timer is archived; null disables
+            "snapshot_keep_chains": DEFAULT_KEEP_CHAINS, # Full snapshots (each with its deltas) kept on disk
+            "control_api_enabled": False, # Local NDJSON endpoint for scripts; see core/control_api.py
+            "control_address": None, # Socket path or "tcp:[host:]port"; null picks the platform default
+            "card_render_cache_enabled": False, # Paint cards from shared cached images; see components/card_render_cache.py
+            "card_render_cache_mb": DEFAULT_RENDER_CACHE_MB,
+            "close_to_tray": False # Closing the window enters tray mode (when a tray exists); see enter_tray_mode
         }
-        self.timer_configs = {}
+        self.global_settings = copy.deepcopy(self.default_global_settings)
+        # Every change to timer records goes through the store; the index, expiry schedule,
+        # board and config file follow it through the subscriptions made at the end of __init__
+        self.timer_store = TimerStore(schedule_flush=lambda flush: QTimer.singleShot(0, flush))
+        self.board_layout_current = False # Set while a drag has already put the cards in place
         self.timers = {}
+        self.group_sections = {}
+        self.diagnostics_dialog = None
+        self.archive_dialog = None
+        self.snapshot_dialog = None
+        self.timer_settings_dialog = None
+        self.countdown_board = CountdownBoard()
+        self.calendar_checked_day = None
+        self.notifier = None
+        self.search_index = TimerSearchIndex()
+        self.filtered_out_ids = set() # Cards currently hidden by the filter box
+        self.history = UndoHistory()
+        self.snapshot_store = SnapshotStore(os.path.join(os.path.dirname(CONFIG_FILE), SNAPSHOT_DIR_NAME))
+        self.snapshot_executor = None # Single background worker, created on first snapshot
+        self.asset_store = AssetStore(os.path.join(os.path.dirname(CONFIG_FILE), ASSET_DIR_NAME)) # Images pasted into comments
+        self.pending_snapshot = None # Last saved document text not yet snapshotted
+        self.recovery_message = None
+        self.quarantined_timers = {} # Unusable records from the file, saved back untouched; see config_schema.QUARANTINE_KEY
+        self.newer_file_version = None # Set when the file comes from a newer build: it is then never overwritten
+        self.control_server = None
+        self.instance_server = None # Answers later launches; see serve_launch_requests
+        self.card_render_cache = None # Set up once settings are loaded, when enabled
+        self.tray_mode = False # Window and cards destroyed, only the tray icon left; see enter_tray_mode
+        self.tray = None # TrayController, made on first entry to tray mode
+        self.shut_down = False
+        self.pending_control_batches = [] # (commands, Future) waiting for the next UI pass
 
         self.load_app_settings_and_timers() # Load settings first
+        self.snapshot_store.keep_chains = max(1, int(self.global_settings.get("snapshot_keep_chains") or DEFAULT_KEEP_CHAINS))
+        self.archive_store = ArchiveStore(os.path.join(os.path.dirname(CONFIG_FILE), ARCHIVE_FILE_NAME))
+        if self.archive_ended_timers():
+            self.save_app_settings_and_timers()
+        self.search_index.rebuild(self.timer_configs)
 
         # Initialize UI components
-        self.central_widget = QWidget()
-        self.setCentralWidget(self.central_widget)
-        self.main_layout = QVBoxLayout(self.central_widget)
-
-        # self.controls_frame = QFrame(self.central_widget) # Removed
-        # controls_layout = QVBoxLayout(self.controls_frame) # Removed
-        # self.add_timer_button = QPushButton("Add New Timer") # Removed
-        # self.add_timer_button.setFixedWidth(120) # Removed
-        # self.add_timer_button.setStyleSheet("""
-        #     QPushButton { background-color: #003366; color: white; padding: 5px; border-radius: 5px; }
-        #     QPushButton:hover { background-color: #004080; }
-        #     QPushButton:pressed { background-color: #002244; }
-        # """) # Removed
-        # self.add_timer_button.clicked.connect(lambda: self.add_new_timer_action()) # Removed
-        # controls_layout.addWidget(self.add_timer_button, alignment=Qt.AlignmentFlag.AlignCenter) # Removed
-        # self.main_layout.addWidget(self.controls_frame) # Removed
-
-        self.scroll_area = QScrollArea()
-        self.scroll_area.setWidgetResizable(True)
-        self.scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff) # Add this line
-        self.scrollable_timers_widget = QWidget()
-        self.timers_layout = QVBoxLayout(self.scrollable_timers_widget)
-        self.timers_layout.setAlignment(Qt.AlignmentFlag.AlignTop)
-        self.scroll_area.setWidget(self.scrollable_timers_widget)
-        self.main_layout.addWidget(self.scroll_area)
-
-        # Apply transparency and other visual settings now that all relevant widgets are created
-        self.apply_main_window_transparency()
+        self.build_board()
+        QShortcut(QKeySequence.StandardKey.Undo, self, self.undo)
+        QShortcut(QKeySequence("Ctrl+Shift+Z"), self, self.redo)
+        if QKeySequence(QKeySequence.StandardKey.Redo) != QKeySequence("Ctrl+Shift+Z"):
+            QShortcut(QKeySequence.StandardKey.Redo, self, self.redo) # Ctrl+Y on Windows
 
         q_app_instance = QApplication.instance()
         if q_app_instance and isinstance(q_app_instance, QApplication):
@@ -108,31 +176,433 @@ class App(QMainWindow):
         else:
             self.resize(self.default_width, self.default_height)
 
+        if self.global_settings.get("card_render_cache_enabled"):
+            cache_mb = self.global_settings.get("card_render_cache_mb") or DEFAULT_RENDER_CACHE_MB
+            self.card_render_cache = CardRenderCache(int(cache_mb * 1024 * 1024))
+        
+        self.create_timer_cards()
+
+        # The board tick only runs while the window is actually on screen; see _update_refresh_state
+        self.tick_timer = QTimer(self)
+        self.tick_timer.timeout.connect(self.refresh_countdowns)
+        self.refresh_active = False
+        self.app_suspended = False
+        self.watched_window_handle = None
+        if q_app_instance and isinstance(q_app_instance, QApplication):
+            q_app_instance.applicationStateChanged.connect(self._on_application_state_changed)
+
+        # A single wakeup for the next expiry or reminder across all timers
+        self.expiry_scheduler = ExpiryScheduler(self.global_settings.get("reminder_lead_days", DEFAULT_REMINDER_LEAD_DAYS))
+        self.expiry_timer = QTimer(self)
+        self.expiry_timer.setSingleShot(True)
+        self.expiry_timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.expiry_timer.timeout.connect(self._on_expiry_timer)
+        self.rebuild_expiry_schedule()
+
+        self.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
+        self.customContextMenuRequested.connect(self.show_main_window_context_menu)
+
+        QTimer.singleShot(DIALOG_PREWARM_DELAY_MS, self.prewarm_settings_dialog)
+
+        self.control_batch_received.connect(self._queue_control_batch, Qt.ConnectionType.QueuedConnection)
+        self.launch_request_received.connect(self._on_launch_request, Qt.ConnectionType.QueuedConnection)
+        if self.global_settings.get("control_api_enabled"):
+            self.start_control_server()
+
+        self.timer_store.flush() # Everything above was built from the loaded records
+        self.timer_store.subscribe(self._reindex_timers, SEARCH_FIELDS)
+        self.timer_store.subscribe(self._reschedule_timers, EXPIRY_FIELDS, settings=True)
+        self.timer_store.subscribe(self._update_board, settings=True)
+        self.timer_store.subscribe(self._save_changes, settings=True)
+        self.clock.subscribe(self.on_clock_moved)
+
+        self.snapshot_timer = QTimer(self)
+        self.snapshot_timer.timeout.connect(self.take_snapshot)
+        self.snapshot_timer.start(SNAPSHOT_INTERVAL_MS)
+        QTimer.singleShot(SNAPSHOT_STARTUP_DELAY_MS, self.take_snapshot)
+        if self.recovery_message:
+            QTimer.singleShot(0, lambda: QMessageBox.warning(self, "Timer File", self.recovery_message))
+
+    def build_board(self):
+        # The window's widgets: filter box, scroll area and the board the cards go on. Tray
+        # mode deletes all of them and show_window builds them again
+        self.central_widget = QWidget()
+        self.setCentralWidget(self.central_widget)
+        self.main_layout = QVBoxLayout(self.central_widget)
+
+        # self.controls_frame = QFrame(self.central_widget) # Removed
+        # controls_layout = QVBoxLayout(self.controls_frame) # Removed
+        # self.add_timer_button = QPushButton("Add New Timer") # Removed
+        # self.add_timer_button.setFixedWidth(120) # Removed
+        # self.add_timer_button.setStyleSheet("""
+        #     QPushButton { background-color: #003366; color: white; padding: 5px; border-radius: 5px; }
+        #     QPushButton:hover { background-color: #004080; }
+        #     QPushButton:pressed { background-color: #002244; }
+        # """) # Removed
+        # self.add_timer_button.clicked.connect(lambda: self.add_new_timer_action()) # Removed
+        # controls_layout.addWidget(self.add_timer_button, alignment=Qt.AlignmentFlag.AlignCenter) # Removed
+        # self.main_layout.addWidget(self.controls_frame) # Removed
+
+        self.filter_entry = QLineEdit()
+        self.filter_entry.setPlaceholderText("Filter timers...")
+        self.filter_entry.setClearButtonEnabled(True)
+        self.filter_entry.textChanged.connect(self.apply_timer_filter)
+        self.main_layout.addWidget(self.filter_entry)
+        QShortcut(QKeySequence.StandardKey.Find, self.central_widget, self.filter_entry.setFocus)
+        QShortcut(QKeySequence(Qt.Key.Key_Escape), self.filter_entry, self.filter_entry.clear,
+                  context=Qt.ShortcutContext.WidgetShortcut)
+
+        self.scroll_area = QScrollArea()
+        self.scroll_area.setWidgetResizable(True)
+        self.scroll_area.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff) # Add this line
+        self.scrollable_timers_widget = QWidget()
+        self.board_layout = QVBoxLayout(self.scrollable_timers_widget)
+        self.board_layout.setContentsMargins(0, 0, 0, 0)
+        self.board_layout.setAlignment(Qt.AlignmentFlag.AlignTop)
+        self.board_page = None # Holds the cards and sections; each rebuild replaces it, see create_timer_cards
+        self.timers_layout = None # The page's layout
+        self.scroll_area.setWidget(self.scrollable_timers_widget)
+        self.main_layout.addWidget(self.scroll_area)
+
+        # Apply transparency and other visual settings now that all relevant widgets are created
+        self.apply_main_window_transparency()
+
         # Drag and drop setup for the timer cards container
-        # (self.scrollable_timers_widget was initialized in the first UI block)
         self.scrollable_timers_widget.setAcceptDrops(True)
         self.scrollable_timers_widget.dragEnterEvent = self.dragEnterEvent # type: ignore
         self.scrollable_timers_widget.dragMoveEvent = self.dragMoveEvent # type: ignore
         self.scrollable_timers_widget.dropEvent = self.dropEvent # type: ignore
-        
-        self.create_timer_cards()
+        self.scrollable_timers_widget.dragLeaveEvent = self.dragLeaveEvent # type: ignore
+        self.drag_reorder = DragReorder(self) # Placeholder, autoscroll and drop slot for card drags
 
-        self.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
-        self.customContextMenuRequested.connect(self.show_main_window_context_menu)
+    @property
+    def timer_configs(self):
+        return self.timer_store
+
+    @timer_configs.setter
+    def timer_configs(self, records):
+        self.timer_store.replace_all(records)
 
     def show_main_window_context_menu(self, position):
         menu = QMenu(self)
         add_timer_action = QAction("Add New Timer", self)
         add_timer_action.triggered.connect(lambda: self.add_new_timer_action())
         menu.addAction(add_timer_action)
+        undo_label = self.history.undo_label()
+        undo_action = QAction(f"Undo {undo_label}" if undo_label else "Undo", self)
+        undo_action.setEnabled(undo_label is not None)
+        undo_action.triggered.connect(self.undo)
+        menu.addAction(undo_action)
+        redo_label = self.history.redo_label()
+        redo_action = QAction(f"Redo {redo_label}" if redo_label else "Redo", self)
+        redo_action.setEnabled(redo_label is not None)
+        redo_action.triggered.connect(self.redo)
+        menu.addAction(redo_action)
+        menu.addSeparator()
+        new_group_action = QAction("New Group...", self)
+        new_group_action.triggered.connect(self.add_new_group)
+        menu.addAction(new_group_action)
+        archive_action = QAction("Archive...", self)
+        archive_action.triggered.connect(self.show_archive)
+        menu.addAction(archive_action)
+        snapshots_action = QAction("Snapshots...", self)
+        snapshots_action.triggered.connect(self.show_snapshots)
+        menu.addAction(snapshots_action)
+        if QSystemTrayIcon.isSystemTrayAvailable():
+            tray_action = QAction("Close to Tray", self)
+            tray_action.triggered.connect(self.enter_tray_mode)
+            menu.addAction(tray_action)
+        # Diagnostics are hidden unless Shift is held while opening the menu
+        if QApplication.keyboardModifiers() & Qt.KeyboardModifier.ShiftModifier:
+            menu.addSeparator()
+            diagnostics_action = QAction("Diagnostics...", self)
+            diagnostics_action.triggered.connect(self.show_diagnostics_panel)
+            menu.addAction(diagnostics_action)
         menu.exec(self.mapToGlobal(position))
 
-    def add_new_timer_action(self, title="New Timer", end_date_str=None, comment=""):
+    def show_diagnostics_panel(self):
+        from .ui.diagnostics_dialog import DiagnosticsDialog # Only needed on demand
+        if self.diagnostics_dialog is None:
+            self.diagnostics_dialog = DiagnosticsDialog(self)
+        self.diagnostics_dialog.refresh()
+        self.diagnostics_dialog.show()
+        self.diagnostics_dialog.raise_()
+        self.diagnostics_dialog.activateWindow()
+
+    def show_archive(self):
+        from .ui.archive_dialog import ArchiveDialog # Only needed on demand
+        if self.archive_dialog is None:
+            self.archive_dialog = ArchiveDialog(self, self)
+        self.archive_dialog.refresh()
+        self.archive_dialog.show()
+        self.archive_dialog.raise_()
+        self.archive_dialog.activateWindow()
+
+    def show_snapshots(self):
+        from .ui.snapshot_dialog import SnapshotDialog # Only needed on demand
+        self.take_snapshot().result() # List the current state too
+        if self.snapshot_dialog is None:
+            self.snapshot_dialog = SnapshotDialog(self, self)
+        self.snapshot_dialog.refresh()
+        self.snapshot_dialog.show()
+        self.snapshot_dialog.raise_()
+        self.snapshot_dialog.activateWindow()
+
+    def take_snapshot(self):
+        # Hands the last saved document to the background worker, which writes a base or a
+        # delta snapshot. Returns the worker's Future (already done when nothing was pending).
+        self.timer_store.flush() # Save pending edits first
+        if self.snapshot_executor is None:
+            self.snapshot_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="snapshots")
+        serialized, self.pending_snapshot = self.pending_snapshot, None
+        return self.snapshot_executor.submit(self._write_snapshot, serialized, self.clock.now())
+
+    def _write_snapshot(self, serialized, now):
+        # Runs on the snapshot worker thread; must not touch widgets
+        if serialized is None:
+            return None
+        try:
+            with metrics.timed("snapshot.take_ms"):
+                return self.snapshot_store.take(serialized, now)
+        except (OSError, ValueError) as e:
+            print(f"Error writing snapshot to {self.snapshot_store.directory}: {e}")
+            return None
+
+    def restore_snapshot(self, seq):
+        self.take_snapshot().result() # The state being replaced stays restorable
+        try:
+            data = self.snapshot_store.materialize(seq)
+        except (OSError, ValueError, KeyError) as e:
+            QMessageBox.warning(self, "Restore Failed", f"Could not read snapshot #{seq}: {e}")
+            return
+        self.note_document_version(data)
+        self.global_settings, self.timer_configs, _, self.quarantined_timers = normalize_document(data, self.default_global_settings)
+        self.history.clear() # Undo steps refer to the replaced records
+        self.apply_restored_settings()
+
+    def apply_restored_settings(self):
+        # The settings were replaced wholesale: re-apply the ones read once at startup and let
+        # the settings listeners (expiry lead times, board sections, save) catch up on all keys
+        self.snapshot_store.keep_chains = max(1, int(self.global_settings.get("snapshot_keep_chains") or DEFAULT_KEEP_CHAINS))
+        self.apply_main_window_transparency()
+        self.calendar_checked_day = None # The next refresh re-runs archiving with the restored grace period
+        self.timer_store.settings_changed(*self.global_settings)
+
+    def recover_from_snapshot(self):
+        # The config file could not be read: keep it aside and fall back to the newest
+        # readable snapshot instead of letting the next save overwrite it with defaults
+        broken_path = f"{CONFIG_FILE}.corrupt-{self.clock.now():%Y%m%dT%H%M%S}"
+        try:
+            os.replace(CONFIG_FILE, broken_path)
+            print(f"Moved unreadable config to {broken_path}")
+        except OSError as e:
+            print(f"Error moving unreadable config {CONFIG_FILE}: {e}")
+        for info in reversed(self.snapshot_store.list()):
+            try:
+                data = self.snapshot_store.materialize(info.seq)
+            except (OSError, ValueError, KeyError) as e:
+                print(f"Skipping unreadable snapshot #{info.seq}: {e}")
+                continue
+            self.note_document_version(data)
+            self.global_settings, self.timer_configs, _, self.quarantined_timers = normalize_document(data, self.default_global_settings)
+            self.recovery_message = (f"The timer file could not be read and was moved to {broken_path}.\n"
+                                     f"Timers were restored from the snapshot taken {info.taken_at:%Y-%m-%d %H:%M}.")
+            self.save_app_settings_and_timers()
+            return
+        print("No snapshot to restore from. Using defaults.")
+
+    def note_document_version(self, data):
+        version = document_version(data)
+        if version > SCHEMA_VERSION:
+            self.newer_file_version = version
+
+    def archive_ended_timers(self, today_ordinal=None):
+        # Moves timers that ended more than the grace period ago out of timer_configs, so
+        # rebuilds, sorting and saves only deal with active timers
+        if self.newer_file_version is not None:
+            return [] # The config keeps them, so archiving would copy them again on the next start
+        if today_ordinal is None:
+            today_ordinal = self.clock.today().toordinal()
+        expired_ids = select_expired(self.timer_configs, today_ordinal, self.global_settings.get("archive_after_days"))
+        if not expired_ids:
+            return []
+        archived = {card_id: self.timer_configs[card_id] for card_id in expired_ids}
+        try:
+            self.archive_store.append(archived, date.fromordinal(today_ordinal).isoformat())
+        except OSError as e:
+            print(f"Error writing to archive {self.archive_store.path}: {e}")
+            return []
+        for card_id in expired_ids:
+            del self.timer_configs[card_id]
+        self.history.forget(expired_ids) # Undo must not bring back or edit what the archive now holds
+        metrics.incr("archive.archived", len(expired_ids))
+        return expired_ids
+
+    def restore_archived_timers(self, card_ids):
+        restored = self.archive_store.take(card_ids)
+        if not restored:
+            return
+        today = self.clock.today().isoformat()
+        for card_id, config in restored.items():
+            config[RESTORED_ON_KEY] = today # Start a new grace period instead of being archived again
+            config["sort_order"] = self.get_next_sort_order()
+            self.timer_configs[card_id] = config
+
+    def get_timer_settings_dialog(self):
+        # One settings dialog is shared by all cards and rebound on each open
+        if self.timer_settings_dialog is None:
+            from .ui.timer_settings_dialog import TimerSettingsDialog # Kept out of startup; see prewarm_settings_dialog
+            with metrics.timed("dialog.build_ms"):
+                self.timer_settings_dialog = TimerSettingsDialog(self)
+        return self.timer_settings_dialog
+
+    def prewarm_settings_dialog(self):
+        if self.timer_settings_dialog is None and not self.tray_mode:
+            dialog = self.get_timer_settings_dialog()
+            dialog.ensurePolished() # Resolve style sheets and fonts now rather than on first open
+            dialog.adjustSize()
+
+    def rebuild_expiry_schedule(self):
+        self.expiry_scheduler.clear()
+        now = self.clock.now()
+        # A load or restore may bring other lead times; nothing is left to reschedule after clear()
+        self.expiry_scheduler.set_lead_days(self.global_settings.get("reminder_lead_days", DEFAULT_REMINDER_LEAD_DAYS), now)
+        for card_id in self.timer_configs:
+            self._schedule_expiry(card_id, now)
+        self._arm_expiry_timer()
+
+    def _schedule_expiry(self, card_id, now=None):
+        config = self.timer_configs.get(card_id)
+        try:
+            end_time = datetime.fromisoformat(config["end_date"])
+        except (KeyError, TypeError, ValueError):
+            self.expiry_scheduler.unschedule(card_id)
+            return
+        now = now or self.clock.now()
+        rule = parse_rule(config.get("recurrence"))
+        if rule is not None:
+            # Recurring timers are scheduled for their next occurrence that is still ahead
+            occurrence = next_occurrence(rule, end_time.date(), now.date())
+            if datetime.combine(occurrence, end_time.time()) <= now:
+                occurrence = next_occurrence(rule, end_time.date(), now.date() + timedelta(days=1))
+            end_time = datetime.combine(occurrence, end_time.time())
+        self.expiry_scheduler.schedule(card_id, end_time, now)
+
+    def _arm_expiry_timer(self):
+        next_fire = self.expiry_scheduler.next_fire_time()
+        if next_fire is None:
+            self.expiry_timer.stop()
+            return
+        delay_ms = (next_fire - self.clock.now()).total_seconds() * 1000.0
+        self.expiry_timer.start(int(min(max(delay_ms, 0), MAX_EXPIRY_WAIT_MS)))
+
+    def _on_expiry_timer(self):
+        now = self.clock.now()
+        for card_id, lead_days in self.expiry_scheduler.pop_due(now):
+            self._notify_expiry(card_id, lead_days)
+            if lead_days == 0 and parse_rule(self.timer_configs.get(card_id, {}).get("recurrence")):
+                self._schedule_expiry(card_id, now) # Queue the following occurrence
+        self._arm_expiry_timer()
+
+    def on_clock_moved(self):
+        # A simulated clock jumped: fire whatever fell due and catch the board up at once
+        # instead of waiting for the real-time timers
+        self._on_expiry_timer()
+        self.refresh_countdowns()
+        if self.tray_mode:
+            self.tray.update_tooltip()
+
+    def _notify_expiry(self, card_id, lead_days):
+        config = self.timer_configs.get(card_id)
+        if config is None or not self.global_settings.get("expiry_notifications_enabled", True):
+            return
+        title = config.get("title", "Timer")
+        if lead_days == 0:
+            message = f"'{title}' is due today."
+        else:
+            message = f"'{title}' is {lead_days} day{'s' if lead_days != 1 else ''} away."
+        self.get_notifier().notify("Countdown Timer", message)
+        metrics.incr("expiry.notifications")
+
+    def get_notifier(self):
+        if self.notifier is None:
+            from .ui.notifications import Notifier # Only needed once something is due, or for tray mode
+            self.notifier = Notifier(self)
+        return self.notifier
+
+    def nearest_timers(self, count):
+        # (days, card_id) of the running timers that end soonest, from the records alone
+        return nearest_timers(self.timer_configs, self.clock.today().toordinal(), count,
+                              self.countdown_board.calendar, COUNT_MODE_BUSINESS)
+
+    def enter_tray_mode(self):
+        # Closes the window down to a tray icon. Unlike hiding it, this deletes the cards, every
+        # other widget on the board and the native window; the records, search index, expiry
+        # schedule and stores stay, and show_window builds the board again from them. Returns
+        # False when there is no system tray to leave the app in
+        if self.tray_mode:
+            return True
+        tray_icon = self.get_notifier().ensure_tray_icon()
+        if tray_icon is None:
+            return False
+        from .ui.tray import TrayController # Only loaded when the window first goes to the tray
+        from .core.memory import flush_deferred_deletes, release_free_memory
+        if self.tray is None:
+            self.tray = TrayController(self, tray_icon)
+        self.timer_store.flush()
+        self.remember_window_geometry()
+        for name in ("timer_settings_dialog", "diagnostics_dialog", "archive_dialog", "snapshot_dialog"):
+            dialog = getattr(self, name)
+            if dialog is not None:
+                dialog.close()
+                dialog.deleteLater()
+                setattr(self, name, None)
+        self.tray_mode = True
+        # Message boxes shown from the tray must not end the app when they close
+        QApplication.setQuitOnLastWindowClosed(False)
+        self.hide() # Stops the board tick
+        self.clear_timer_cards()
+        self.drag_reorder.deleteLater()
+        self.drag_reorder = None
+        if self.card_render_cache is not None:
+            self.card_render_cache.clear()
+        self.takeCentralWidget().deleteLater()
+        self.central_widget = self.main_layout = self.filter_entry = None
+        self.scroll_area = self.scrollable_timers_widget = self.board_layout = None
+        self.destroy()
+        self.watched_window_handle = None
+        flush_deferred_deletes()
+        release_free_memory()
+        metrics.set_gauge("cards.count", 0)
+        metrics.incr("tray.entries")
+        self.tray.enter()
+        return True
+
+    def show_window(self):
+        # Brings the window up, first rebuilding it when it was closed to the tray
+        if self.tray_mode:
+            self.tray_mode = False
+            self.tray.leave()
+            self.build_board()
+            self.create_timer_cards()
+            QApplication.setQuitOnLastWindowClosed(True)
+        if self.isMinimized():
+            self.showNormal()
+        else:
+            self.show()
+        self.raise_()
+        self.activateWindow()
+
+    def quit_application(self):
+        self.shutdown()
+        QApplication.quit()
+
+    def add_new_timer_action(self, title="New Timer", end_date_str=None, comment="", group=UNGROUPED):
         card_id = f"timer_{uuid.uuid4().hex}"
 
         final_end_date_str = end_date_str
         if final_end_date_str is None:
-            end_date_obj = (datetime.now() + timedelta(days=1)).date()
+            end_date_obj = self.clock.today() + timedelta(days=1)
             end_datetime_midnight = datetime.combine(end_date_obj, datetime.min.time())
             final_end_date_str = end_datetime_midnight.strftime("%Y-%m-%d %H:%M:%S")
 
@@ -142,13 +612,16 @@ class App(QMainWindow):
             "comment": comment,
             "bg_color_title": self.global_settings.get("default_bg_color_title", DEFAULT_TITLE_BG_COLOR),
             "bg_color_time": self.global_settings.get("default_bg_color_time", DEFAULT_TIME_BG_COLOR),
-            "time_text_color": self.global_settings.get("default_time_text_color", DEFAULT_TIME_TEXT_COLOR), # Use global default time text color
+            "text_color_time": self.global_settings.get("default_time_text_color", DEFAULT_TIME_TEXT_COLOR), # Use global default time text color
             "font_size_time": self.global_settings.get("default_time_font_size", DEFAULT_TIME_FONT_SIZE),
             "sort_order": self.get_next_sort_order()
         }
+        snapshot = self.begin_history_step([card_id], ("collapsed_groups",))
+        if group:
+            new_config["group"] = group
+            self.set_group_collapsed_setting(group, False) # Show the new card; undo collapses it again
         self.timer_configs[card_id] = new_config
-        self.save_app_settings_and_timers()
-        self.create_timer_cards()
+        self.record_history_step("Add Timer", snapshot)
 
     def get_next_sort_order(self):
         if not self.timer_configs:
@@ -159,36 +632,525 @@ class App(QMainWindow):
                 max_sort_order = config["sort_order"]
         return max_sort_order + 1
 
-    def create_timer_card(self, card_id, config, parent_layout):
+    def create_timer_card(self, card_id, config, parent_layout, index=None):
         card = TimerCard(master_layout=parent_layout, title=config["title"], 
                          end_date=config["end_date"], card_id=card_id, app_ref=self, config=config)
-        parent_layout.addWidget(card)
+        if index is None:
+            parent_layout.addWidget(card)
+        else:
+            parent_layout.insertWidget(index, card)
         self.timers[card_id] = card
+        self._set_countdown_row(card_id, config)
         return card
 
-    def create_timer_cards(self):
-        while self.timers_layout.count():
-            child = self.timers_layout.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
+    def _set_countdown_row(self, card_id, config):
+        anchor_ordinal = end_date_ordinal(config["end_date"])
+        rollover = rollover_for(config.get("recurrence"), date.fromordinal(anchor_ordinal))
+        business_days = config.get("count_mode") == COUNT_MODE_BUSINESS
+        self.countdown_board.set(card_id, anchor_ordinal, rollover, business_days)
+
+    def clear_timer_cards(self):
+        if self.drag_reorder is not None:
+            self.drag_reorder.end() # Its recorded card positions are about to go stale
+        if self.board_page is not None:
+            # The old cards go with their page, deleted later as a whole. Taking thousands of
+            # cards off the board one by one was quadratic: every reparent walks the window's
+            # focus chain, and every deletion scanned a layout already holding the new cards
+            self.board_layout.removeWidget(self.board_page)
+            self.board_page.hide()
+            self.board_page.deleteLater()
+            self.board_page = None
+            self.timers_layout = None
         self.timers.clear()
+        self.group_sections.clear()
+        self.countdown_board.clear()
+        self.filtered_out_ids.clear()
 
-        try:
-            valid_configs = {k: v for k, v in self.timer_configs.items() if 'end_date' in v and v['end_date'] is not None}
-            sorted_configs = sorted(valid_configs.items(), 
-                                    key=lambda item: (item[1].get('sort_order', float('inf')), 
-                                                      datetime.strptime(item[1]['end_date'], "%Y-%m-%d %H:%M:%S")))
-        except Exception:
-            sorted_configs = sorted(self.timer_configs.items())
-
-        for card_id, config in sorted_configs:
+    def apply_timer_filter(self, query=None):
+        # Hide or show only the cards whose match state changed; nothing is rebuilt
+        if query is None:
+            query = self.filter_entry.text()
+        with metrics.timed("filter.apply_ms"):
+            matches = self.search_index.search(query)
+            hidden = set() if matches is None else self.timers.keys() - matches
+            to_hide = hidden - self.filtered_out_ids
+            to_show = self.filtered_out_ids - hidden
+            if not to_hide and not to_show:
+                return
+            # Flipping children of a visible container relayouts per card, which grows
+            # quadratically; with the container hidden they are shown in a single pass.
+            container = self.scrollable_timers_widget
+            batch = len(to_hide) + len(to_show) > FILTER_BATCH_THRESHOLD and container.isVisible()
+            if batch:
+                scroll_value = self.scroll_area.verticalScrollBar().value()
+                container.hide()
+            for card_id in to_hide:
+                self.timers[card_id].hide()
+            for card_id in to_show:
+                card = self.timers.get(card_id)
+                if card is not None:
+                    card.show()
+            self.filtered_out_ids = hidden
+            if batch:
+                container.show()
+                self.scroll_area.verticalScrollBar().setValue(scroll_value)
+
+    def holiday_file(self):
+        return self.global_settings.get("holiday_file") or HOLIDAY_FILE
+
+    def refresh_countdowns(self):
+        # One batched pass over every timer; only cards whose value changed are touched
+        metrics.incr("tick.callbacks")
+        with metrics.timed("tick.refresh_ms"):
+            today_ordinal = self.clock.today().toordinal()
+            if today_ordinal != self.calendar_checked_day:
+                # Once a day, pick up edits to the holiday file (parsed calendars are cached by mtime)
+                self.calendar_checked_day = today_ordinal
+                self.countdown_board.set_calendar(load_holiday_calendar(self.holiday_file()))
+                self.archive_ended_timers(today_ordinal)
+                self.update_group_badges(today_ordinal)
+            diff = self.countdown_board.refresh(today_ordinal)
+            for card_id, value in diff.changed:
+                card = self.timers.get(card_id)
+                if card is not None:
+                    card.set_countdown_value(value)
+        return diff
+
+    def sorted_timer_items(self):
+        # Records are normalized on load, so sort_order is an int and end_date is canonical
+        # "YYYY-MM-DD HH:MM:SS", which sorts chronologically as a string
+        return sorted(self.timer_configs.items(), key=lambda item: (item[1]['sort_order'], item[1]['end_date']))
+
+    def create_timer_cards(self):
+        start = time.perf_counter()
+        self.clear_timer_cards()
+        # The new page stays hidden while it is filled and is shown once at the end; showing
+        # each card on a visible board would lay the whole board out again per card
+        self.board_page = QWidget(self.scrollable_timers_widget)
+        self.board_page.hide()
+        self.timers_layout = QVBoxLayout(self.board_page)
+        self.timers_layout.setAlignment(Qt.AlignmentFlag.AlignTop)
+
+        # Ungrouped timers sit directly on the board, followed by one section per group.
+        # Collapsed sections get no cards and no board rows, only their badge.
+        grouped = split_by_group(self.sorted_timer_items())
+        for card_id, config in grouped.get(UNGROUPED, ()):
             self.create_timer_card(card_id, config, self.timers_layout)
+        collapsed = set(self.global_settings.get("collapsed_groups") or ())
+        for name in self.group_names():
+            section = GroupSection(name, name not in collapsed, self, self.board_page)
+            self.timers_layout.addWidget(section)
+            self.group_sections[name] = section
+            if section.is_expanded():
+                for card_id, config in grouped.get(name, ()):
+                    self.create_timer_card(card_id, config, section.body_layout)
+        self.refresh_countdowns()
+        self.update_group_badges()
+        if self.filter_entry.text():
+            self.apply_timer_filter()
+        self.board_layout.addWidget(self.board_page)
+        self.board_page.show()
+
+        metrics.observe("cards.create_ms", (time.perf_counter() - start) * 1000.0)
+        metrics.incr("cards.rebuilds")
+        metrics.set_gauge("cards.count", len(self.timers))
+
+    def group_names(self):
+        return ordered_groups(self.global_settings.get("groups"), self.timer_configs)
+
+    def update_group_badges(self, today_ordinal=None):
+        if not self.group_sections:
+            return
+        if today_ordinal is None:
+            today_ordinal = self.clock.today().toordinal()
+        members = {}
+        for config in self.timer_configs.values():
+            members.setdefault(group_of(config), []).append(config)
+        for name, section in self.group_sections.items():
+            section.set_summary(summarize_group(members.get(name, ()), today_ordinal,
+                                                self.countdown_board.calendar, COUNT_MODE_BUSINESS))
+
+    def set_group_collapsed_setting(self, name, collapsed):
+        names = [g for g in (self.global_settings.get("collapsed_groups") or []) if g != name]
+        if collapsed:
+            names.append(name)
+        if names != self.global_settings.get("collapsed_groups"):
+            self.global_settings["collapsed_groups"] = names
+            self.timer_store.settings_changed("collapsed_groups")
+
+    def set_group_expanded(self, name, expanded):
+        # Called by a GroupSection when its header is toggled
+        self.set_group_collapsed_setting(name, not expanded)
+        section = self.group_sections.get(name)
+        if section is not None:
+            if expanded:
+                for card_id, config in self.sorted_timer_items():
+                    if group_of(config) == name and card_id not in self.timers:
+                        self.create_timer_card(card_id, config, section.body_layout)
+                self.refresh_countdowns()
+                if self.filter_entry.text():
+                    self.apply_timer_filter()
+            else:
+                while section.body_layout.count():
+                    child = section.body_layout.takeAt(0)
+                    if isinstance(child.widget(), TimerCard):
+                        self.release_timer_card(child.widget().card_id)
+        metrics.set_gauge("cards.count", len(self.timers))
+
+    def release_timer_card(self, card_id):
+        # Drop a card's widget and board row while keeping its config (and expiry schedule)
+        self.countdown_board.remove(card_id)
+        self.filtered_out_ids.discard(card_id)
+        card_widget = self.timers.pop(card_id, None)
+        if card_widget:
+            card_widget.deleteLater()
+
+    def begin_history_step(self, card_ids, settings_keys=()):
+        # Call before changing timer records; pass the result to record_history_step afterwards
+        return self.history.snapshot(self.timer_configs, card_ids, self.global_settings, settings_keys)
+
+    def record_history_step(self, label, snapshot):
+        self.history.record(label, snapshot, self.timer_configs, self.global_settings)
+
+    def undo(self):
+        self._after_history_step(self.history.undo(self.timer_configs, self.global_settings))
+
+    def redo(self):
+        self._after_history_step(self.history.redo(self.timer_configs, self.global_settings))
+
+    def _after_history_step(self, step):
+        # Re-inserted and removed records were seen by the store; fields restored in place are reported here
+        if step is None:
+            return
+        for card_id, delta in step.changed.items():
+            self.timer_store.touch(card_id, delta.keys())
+        if step.settings:
+            self.timer_store.settings_changed(*step.settings)
+
+    def control_address(self):
+        address = self.global_settings.get("control_address")
+        if address:
+            return address
+        if sys.platform == "win32":
+            return DEFAULT_CONTROL_TCP_ADDRESS
+        return os.path.join(os.path.dirname(CONFIG_FILE), CONTROL_SOCKET_NAME)
+
+    def start_control_server(self):
+        from .core.control_server import ControlServer # Only loaded when the endpoint is enabled
+        try:
+            server = ControlServer(self.control_address(), self.submit_control_batch)
+        except ValueError as e:
+            print(f"Control API not started: {e}")
+            return False
+        if not server.start():
+            print(f"Control API not started: {server.error}")
+            return False
+        self.control_server = server
+        return True
+
+    def submit_control_batch(self, commands):
+        # Called on the control server thread; the batch is applied on the UI thread
+        future = Future()
+        self.control_batch_received.emit(commands, future)
+        return future
+
+    def _queue_control_batch(self, commands, future):
+        # Batches from every connection that arrive before the next UI pass are applied together
+        if not self.pending_control_batches:
+            QTimer.singleShot(0, self.flush_control_batches)
+        self.pending_control_batches.append((commands, future))
+
+    def flush_control_batches(self):
+        batches, self.pending_control_batches = self.pending_control_batches, []
+        batches = [(commands, future) for commands, future in batches if future.set_running_or_notify_cancel()]
+        if not batches:
+            return
+        try:
+            replies = self.apply_control_commands([command for commands, _ in batches for command in commands])
+            serialized = [json.dumps(reply) for reply in replies]
+        except Exception as e:
+            print(f"Error applying control commands: {e}")
+            for _, future in batches:
+                future.set_exception(e)
+            return
+        self.timer_store.flush() # Saved and shown before the replies go out
+        start = 0
+        for commands, future in batches:
+            future.set_result(serialized[start:start + len(commands)])
+            start += len(commands)
+
+    def apply_control_commands(self, commands):
+        # The whole batch becomes one undo step, one save and one board update
+        with metrics.timed("control.batch_ms"):
+            card_ids = prepare_commands(commands, self.timer_configs, lambda: f"timer_{uuid.uuid4().hex}")
+            snapshot = self.begin_history_step(card_ids, ("groups",))
+            result = apply_commands(commands, self.timer_configs, self.global_settings)
+            metrics.incr("control.commands", len(commands))
+            for card_id, fields in result.updated.items():
+                self.timer_store.touch(card_id, fields)
+            self._register_new_groups(result.created + list(result.updated))
+            self.record_history_step("Remote Update", snapshot)
+        return result.replies
+
+    def serve_launch_requests(self, listener, address):
+        # Answers later launches of run.py on the single-instance endpoint it claimed (see
+        # core/single_instance.py). The server, and asyncio with it, starts once the window is
+        # up; a launch arriving before that waits in the listener's backlog
+        QTimer.singleShot(INSTANCE_SERVER_DELAY_MS, lambda: self._start_instance_server(listener, address))
+
+    def _start_instance_server(self, listener, address):
+        from .core.control_server import ControlServer # Kept out of startup; see serve_launch_requests
+        server = ControlServer(address, self.submit_launch_request, sock=listener)
+        if not server.start():
+            print(f"Not answering other launches: {server.error}")
+            return
+        self.instance_server = server
+
+    def submit_launch_request(self, commands):
+        # Called on the instance server thread; the commands are applied on the UI thread
+        future = Future()
+        self.launch_request_received.emit(commands, future)
+        return future
+
+    def _on_launch_request(self, commands, future):
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result([json.dumps(reply) for reply in self.apply_launch_commands(commands)])
+        except Exception as e:
+            print(f"Error applying launch request: {e}")
+            future.set_exception(e)
+
+    def apply_launch_commands(self, commands):
+        # Requests from run.py's command line (see core/launch.py), this launch's own or a later
+        # launch's. Timers added or imported by one launch are applied as one control batch:
+        # one undo step and one save. Returns one reply dict per command
+        replies = []
+        upserts = []
+        spans = {} # Index of an add/import command -> (start, end) of its upserts
+        default_end_date = datetime.combine(self.clock.today() + timedelta(days=1), datetime.min.time()).strftime("%Y-%m-%d %H:%M:%S")
+        for index, command in enumerate(commands):
+            op = command.get("op")
+            if op == LAUNCH_SHOW:
+                self.show_window()
+                replies.append({"ok": True})
+            elif op == LAUNCH_TRAY:
+                if self.enter_tray_mode():
+                    replies.append({"ok": True})
+                else:
+                    self.show_window()
+                    replies.append({"ok": False, "error": "no system tray available"})
+            elif op in (LAUNCH_ADD, LAUNCH_IMPORT):
+                try:
+                    added = timer_commands(command, default_end_date)
+                except ValueError as e:
+                    replies.append({"ok": False, "error": str(e)})
+                    continue
+                spans[index] = (len(upserts), len(upserts) + len(added))
+                upserts.extend(added)
+                replies.append(None) # Filled in once the batch is applied
+            else:
+                replies.append({"ok": False, "error": f"unknown launch op {op!r}"})
+        if upserts:
+            results = self.apply_control_commands(upserts)
+            self.timer_store.flush() # Saved and shown before the launch is answered
+            for index, (start, end) in spans.items():
+                failed = [result["error"] for result in results[start:end] if not result["ok"]]
+                replies[index] = {"ok": not failed, "added": end - start - len(failed)}
+                if failed:
+                    replies[index]["error"] = "; ".join(failed)
+        for index in spans:
+            if replies[index] is None:
+                replies[index] = {"ok": True, "added": 0} # An import file without timers
+        return replies
+
+    def _register_new_groups(self, card_ids):
+        # Groups first named by a timer go to the end of the configured group order
+        configured = list(self.global_settings.get("groups") or [])
+        names = dict.fromkeys(group_of(self.timer_configs[card_id]) for card_id in card_ids if card_id in self.timer_configs)
+        new_names = [name for name in names if name and name not in configured]
+        if new_names:
+            self.global_settings["groups"] = configured + new_names
+            self.timer_store.settings_changed("groups")
+
+    def _reindex_timers(self, changes):
+        if changes.reset:
+            self.search_index.rebuild(self.timer_configs)
+            return
+        for card_id in changes.removed:
+            self.search_index.remove(card_id)
+        for card_id in changes.added | changes.updated_with(SEARCH_FIELDS):
+            self.search_index.update_from_config(card_id, self.timer_configs[card_id])
+
+    def _reschedule_timers(self, changes):
+        if changes.reset:
+            self.rebuild_expiry_schedule()
+            return
+        now = self.clock.now()
+        if "reminder_lead_days" in changes.settings:
+            self.expiry_scheduler.set_lead_days(self.global_settings.get("reminder_lead_days", DEFAULT_REMINDER_LEAD_DAYS), now)
+        for card_id in changes.removed:
+            self.expiry_scheduler.unschedule(card_id)
+        for card_id in changes.added | changes.updated_with(EXPIRY_FIELDS):
+            self._schedule_expiry(card_id, now)
+        self._arm_expiry_timer()
+
+    def _save_changes(self, changes):
+        edited = self.timer_configs.keys() if changes.reset else changes.added | changes.updated_with(("comment",))
+        self.externalize_comment_images(edited)
+        self.save_app_settings_and_timers()
+
+    def externalize_comment_images(self, card_ids):
+        # Moves images pasted into these timers' comments out to the asset store, leaving a path
+        # in the record, so they are not written into the config on every save. The records are
+        # rewritten in place: the comments still show the same thing, so nothing else follows
+        changed = False
+        for card_id in card_ids:
+            config = self.timer_configs.get(card_id)
+            comment = config.get("comment") if config else None
+            if comment:
+                stored = self.asset_store.externalize(comment)
+                if stored != comment:
+                    config["comment"] = stored
+                    changed = True
+        return changed
+
+    def _update_board(self, changes):
+        # Moves, new sections and restores rebuild the board; other changes are patched onto
+        # the cards that are already there
+        if self.tray_mode:
+            self.tray.update_tooltip() # No board; show_window rebuilds it from the records
+            return
+        collapsed = set(self.global_settings.get("collapsed_groups") or ())
+        if (changes.reset or "groups" in changes.settings
+                or (changes.moved() and not self.board_layout_current)
+                or any(section.is_expanded() == (name in collapsed) for name, section in self.group_sections.items())):
+            self.create_timer_cards()
+            return
+        for card_id in changes.removed:
+            self.release_timer_card(card_id)
+        new_cards = self._new_card_positions(changes.added)
+        if new_cards is None:
+            self.create_timer_cards()
+            return
+        container = self.scrollable_timers_widget
+        batch = len(new_cards) + len(changes.removed) > FILTER_BATCH_THRESHOLD and container.isVisible()
+        if batch:
+            scroll_value = self.scroll_area.verticalScrollBar().value()
+            container.hide()
+        for card_id in changes.updated_with(CARD_FIELDS):
+            card = self.timers.get(card_id)
+            if card is not None:
+                card.refresh_from_config()
+        for card_id in changes.updated_with(COUNTDOWN_FIELDS):
+            if card_id in self.countdown_board:
+                self._set_countdown_row(card_id, self.timer_configs[card_id])
+        for layout, index, card_id in new_cards:
+            self.create_timer_card(card_id, self.timer_configs[card_id], layout, index)
+        if batch:
+            container.show()
+            self.scroll_area.verticalScrollBar().setValue(scroll_value)
+        self.refresh_countdowns()
+        if changes.added or changes.removed or changes.updated_with(BADGE_FIELDS):
+            self.update_group_badges()
+        if self.filter_entry.text() and (changes.added or changes.updated_with(SEARCH_FIELDS)):
+            self.apply_timer_filter()
+        metrics.set_gauge("cards.count", len(self.timers))
+
+    def _timer_sort_key(self, card_id):
+        config = self.timer_configs[card_id]
+        return (config["sort_order"], config["end_date"])
+
+    def _new_card_positions(self, card_ids):
+        # (layout, index, card_id) for new timers that sort after every card already shown in
+        # their section, or None when one lands in between (or needs a new section)
+        positions = []
+        next_index = {} # id(layout) -> where the next new card goes
+        for card_id in sorted(card_ids, key=self._timer_sort_key):
+            group = group_of(self.timer_configs[card_id])
+            if group == UNGROUPED:
+                layout = self.timers_layout
+            else:
+                section = self.group_sections.get(group)
+                if section is None:
+                    return None
+                if not section.is_expanded():
+                    continue # Collapsed sections hold no cards
+                layout = section.body_layout
+            if id(layout) not in next_index:
+                end = layout.count()
+                if layout is self.timers_layout: # Ungrouped cards come before the sections
+                    end = next((i for i in range(layout.count()) if isinstance(layout.itemAt(i).widget(), GroupSection)), end)
+                last_key = self._last_card_key(layout, end)
+                if last_key is not None and last_key > self._timer_sort_key(card_id):
+                    return None
+                next_index[id(layout)] = end
+            positions.append((layout, next_index[id(layout)], card_id))
+            next_index[id(layout)] += 1
+        return positions
+
+    def _last_card_key(self, layout, end):
+        # Sort key of the last live card before index end; released cards linger until deleted
+        for i in range(end - 1, -1, -1):
+            widget = layout.itemAt(i).widget()
+            if isinstance(widget, TimerCard) and self.timers.get(widget.card_id) is widget:
+                return self._timer_sort_key(widget.card_id)
+        return None
+
+    def add_new_group(self):
+        name, ok = QInputDialog.getText(self, "New Group", "Group name:")
+        name = name.strip()
+        if not ok or not name or name in self.group_names():
+            return
+        snapshot = self.begin_history_step([], ("groups",))
+        self.global_settings["groups"] = self.group_names() + [name]
+        self.timer_store.settings_changed("groups")
+        self.record_history_step("New Group", snapshot)
+
+    def rename_group(self, old_name):
+        new_name, ok = QInputDialog.getText(self, "Rename Group", "Group name:", text=old_name)
+        new_name = new_name.strip()
+        if not ok or not new_name or new_name == old_name:
+            return
+        member_ids = [card_id for card_id, config in self.timer_configs.items() if group_of(config) == old_name]
+        snapshot = self.begin_history_step(member_ids, ("groups", "collapsed_groups"))
+        for card_id in member_ids:
+            self.timer_store.update_fields(card_id, {"group": new_name})
+        self.global_settings["groups"] = list(dict.fromkeys(new_name if g == old_name else g for g in self.group_names()))
+        collapsed = self.global_settings.get("collapsed_groups") or []
+        self.global_settings["collapsed_groups"] = [new_name if g == old_name else g for g in collapsed]
+        self.timer_store.settings_changed("groups", "collapsed_groups")
+        self.record_history_step("Rename Group", snapshot)
+
+    def remove_group(self, name):
+        # The group's timers are kept and move back onto the board
+        member_ids = [card_id for card_id, config in self.timer_configs.items() if group_of(config) == name]
+        snapshot = self.begin_history_step(member_ids, ("groups", "collapsed_groups"))
+        for card_id in member_ids:
+            self.timer_configs[card_id].pop("group", None)
+            self.timer_store.touch(card_id, ("group",))
+        self.global_settings["groups"] = [g for g in self.group_names() if g != name]
+        self.timer_store.settings_changed("groups")
+        self.set_group_collapsed_setting(name, False)
+        self.record_history_step("Remove Group", snapshot)
+
+    def _drop_target(self, drop_pos):
+        # (layout, group) under a drop position on the board; layout is None for a collapsed
+        # section, where the card just changes group
+        point = self.board_page.mapFrom(self.scrollable_timers_widget, drop_pos.toPoint()) # Sections sit on the page
+        for name, section in self.group_sections.items():
+            if section.geometry().contains(point):
+                if not section.is_expanded():
+                    return None, name
+                return section.body_layout, name
+        return self.timers_layout, UNGROUPED
 
     def dragEnterEvent(self, event: QtGui.QDragEnterEvent):
         mime_data = event.mimeData()
         accepted = False
         if mime_data.hasText() and mime_data.text().startswith("timer_"):
             accepted = True
+            self.drag_reorder.hover(event.position())
         elif mime_data.hasFormat(CHROMIUM_CUSTOM_MIME):
             accepted = True
         elif mime_data.hasFormat(TEXT_HTML_MIME):
@@ -205,6 +1167,7 @@ class App(QMainWindow):
         accepted = False
         if mime_data.hasText() and mime_data.text().startswith("timer_"):
             accepted = True
+            self.drag_reorder.hover(event.position())
         elif mime_data.hasFormat(CHROMIUM_CUSTOM_MIME):
             accepted = True
         elif mime_data.hasFormat(TEXT_HTML_MIME):
@@ -216,34 +1179,58 @@ class App(QMainWindow):
         else:
             event.ignore()
 
+    def dragLeaveEvent(self, event: QtGui.QDragLeaveEvent):
+        self.drag_reorder.end()
+
     def dropEvent(self, event: QtGui.QDropEvent):
         mime_data = event.mimeData()
         if mime_data.hasText() and mime_data.text().startswith("timer_"):
             source_card_id = mime_data.text()
             source_widget = self.timers.get(source_card_id)
             if not source_widget:
+                self.drag_reorder.end()
                 event.ignore()
                 return
-            drop_pos_in_viewport = event.position()
-            drop_pos_y = drop_pos_in_viewport.y()
-            insert_idx = 0
-            for i in range(self.timers_layout.count()):
-                item = self.timers_layout.itemAt(i)
-                if item and item.widget():
-                    widget = item.widget()
-                    if isinstance(widget, TimerCard):
-                        if drop_pos_y < widget.y() + widget.height() / 2:
-                            insert_idx = i
-                            break
-                        insert_idx = i + 1
-            current_idx = self.timers_layout.indexOf(source_widget)
-            self.timers_layout.removeWidget(source_widget)
+            target_layout, target_group = self._drop_target(event.position())
+            if target_layout is not None:
+                insert_idx = self.drag_reorder.insertion_index(target_layout, event.position().y())
+            self.drag_reorder.end()
+            snapshot = self.begin_history_step(list(self.timers)) # Reordering renumbers the open cards
+            if group_of(self.timer_configs.get(source_card_id, {})) != target_group:
+                config = self.timer_configs[source_card_id]
+                if target_group:
+                    config["group"] = target_group
+                else:
+                    config.pop("group", None)
+                self.timer_store.touch(source_card_id, ("group",))
+            if target_layout is None:
+                self.release_timer_card(source_card_id)
+                self.update_sort_order_after_drag()
+                self.record_history_step("Move Timer", snapshot)
+                event.acceptProposedAction()
+                return
+            current_idx = target_layout.indexOf(source_widget)
             if current_idx != -1 and current_idx < insert_idx:
                 insert_idx -= 1
-            self.timers_layout.insertWidget(insert_idx, source_widget)
+            if insert_idx != current_idx: # Dropped back in its own slot: nothing to lay out again
+                source_widget.parentWidget().layout().removeWidget(source_widget)
+                target_layout.insertWidget(insert_idx, source_widget)
             self.update_sort_order_after_drag()
+            self.record_history_step("Move Timer", snapshot)
             event.acceptProposedAction()
             return
+        parse_start = time.perf_counter()
+        parsed = self._parse_external_drop(mime_data)
+        metrics.observe("drop.parse_ms", (time.perf_counter() - parse_start) * 1000.0)
+        if parsed is None:
+            event.ignore()
+            return
+        title, comment = parsed
+        self.add_new_timer_action(title=title, comment=comment)
+        event.acceptProposedAction()
+
+    def _parse_external_drop(self, mime_data):
+        # Returns (title, comment) for a drop from another application, or None
         if mime_data.hasFormat(CHROMIUM_CUSTOM_MIME):
             try:
                 q_byte_array: QByteArray = mime_data.data(CHROMIUM_CUSTOM_MIME)
@@ -254,9 +1241,7 @@ class App(QMainWindow):
                     evt_title = str(json_data.get('summary', json_data.get('title', "Chromium JSON Event")))
                     evt_comment_detail = str(json_data) if len(str(json_data)) < 300 else str(json_data)[:300] + "..."
                     evt_comment = json_data.get('description', evt_comment_detail)
-                    self.add_new_timer_action(title=evt_title, comment=str(evt_comment))
-                    event.acceptProposedAction()
-                    return
+                    return evt_title, str(evt_comment)
                 except json.JSONDecodeError:
                     pass
                 except Exception:
@@ -266,15 +1251,9 @@ class App(QMainWindow):
         if mime_data.hasText():
             text_content = mime_data.text()
             if len(text_content) > 50:
-                title = text_content[:50] + "..."
-                comment = text_content
-            else:
-                title = text_content
-                comment = ""
-            self.add_new_timer_action(title=title, comment=comment)
-            event.acceptProposedAction()
-            return
-        event.ignore()
+                return text_content[:50] + "...", text_content
+            return text_content, ""
+        return None
 
     def update_sort_order_after_drag(self):
         layout_items_ids = []
@@ -284,10 +1263,21 @@ class App(QMainWindow):
                 widget = item.widget()
                 if isinstance(widget, TimerCard) and hasattr(widget, 'card_id'):
                     layout_items_ids.append(widget.card_id)
+                elif isinstance(widget, GroupSection):
+                    for j in range(widget.body_layout.count()):
+                        card = widget.body_layout.itemAt(j).widget()
+                        if isinstance(card, TimerCard):
+                            layout_items_ids.append(card.card_id)
         for i, card_id_in_layout in enumerate(layout_items_ids):
-            if card_id_in_layout in self.timer_configs:
+            if card_id_in_layout in self.timer_configs and self.timer_configs[card_id_in_layout]['sort_order'] != i:
                 self.timer_configs[card_id_in_layout]['sort_order'] = i
-        self.save_app_settings_and_timers()
+                self.timer_store.touch(card_id_in_layout, ("sort_order",))
+        # The dragged widgets already show the new order, so deliver the moves without a rebuild
+        self.board_layout_current = True
+        try:
+            self.timer_store.flush()
+        finally:
+            self.board_layout_current = False
 
     def load_app_settings_and_timers(self):
         data_dir = os.path.dirname(CONFIG_FILE)
@@ -298,17 +1288,39 @@ class App(QMainWindow):
                 print(f"Error creating directory {data_dir}: {e}")
         if os.path.exists(CONFIG_FILE):
             try:
-                with open(CONFIG_FILE, 'r') as f:
-                    data = json.load(f)
-                    loaded_global_settings = data.get(GLOBAL_SETTINGS_KEY, {})
-                    updated_global_settings = self.global_settings.copy()
-                    updated_global_settings.update(loaded_global_settings)
-                    self.global_settings = updated_global_settings
-                    self.timer_configs = data.get(TIMERS_KEY, {})
+                with metrics.timed("load.latency_ms"):
+                    with open(CONFIG_FILE, 'r') as f:
+                        serialized = f.read()
+                    data = json.loads(serialized)
+                    self.note_document_version(data)
+                    # Migrations, validation and default filling happen once here, so cards
+                    # and everything downstream can rely on complete records
+                    self.global_settings, self.timer_configs, changed, self.quarantined_timers = normalize_document(data, self.default_global_settings)
             except Exception as e:
-                print(f"Error loading {CONFIG_FILE}: {e}. Using defaults.")
+                print(f"Error loading {CONFIG_FILE}: {e}.")
+                self.recover_from_snapshot()
+                return
+            self.pending_snapshot = serialized # Snapshot the loaded state once startup settles
+            previously_quarantined = data.get(QUARANTINE_KEY)
+            newly_quarantined = len(self.quarantined_timers) - (len(previously_quarantined) if isinstance(previously_quarantined, dict) else 0)
+            messages = []
+            if self.newer_file_version is not None:
+                messages.append(f"{CONFIG_FILE} was written by a newer version of Countdown Timer (file format {self.newer_file_version}). "
+                                f"It is open read-only: changes made now will not be saved.")
+            if newly_quarantined:
+                messages.append(f"{newly_quarantined} timer{'s' if newly_quarantined != 1 else ''} could not be read "
+                                f"and {'were' if newly_quarantined != 1 else 'was'} set aside under \"{QUARANTINE_KEY}\" in {CONFIG_FILE}.")
+            if messages:
+                self.recovery_message = "\n\n".join(messages)
+            if self.externalize_comment_images(self.timer_configs.keys()):
+                changed = True
+            if changed:
+                self.take_snapshot() # The file as it was before the migration stays restorable
+                self.save_app_settings_and_timers() # Persist the migrated document once
 
     def save_app_settings_and_timers(self):
+        if self.newer_file_version is not None:
+            return # Writing it as SCHEMA_VERSION would drop whatever the newer format added
         data_dir = os.path.dirname(CONFIG_FILE)
         if data_dir and not os.path.exists(data_dir):
             try:
@@ -316,44 +1328,55 @@ class App(QMainWindow):
             except OSError as e:
                 print(f"Error creating dir {data_dir} for save: {e}")
                 return
-        data_to_save = {GLOBAL_SETTINGS_KEY: self.global_settings, TIMERS_KEY: self.timer_configs}
+        start = time.perf_counter()
+        data_to_save = {SCHEMA_VERSION_KEY: SCHEMA_VERSION, GLOBAL_SETTINGS_KEY: self.global_settings, TIMERS_KEY: self.timer_store.records}
+        if self.quarantined_timers:
+            data_to_save[QUARANTINE_KEY] = self.quarantined_timers
         try:
+            serialized = json.dumps(data_to_save, indent=4)
             with open(CONFIG_FILE, 'w') as f:
-                json.dump(data_to_save, f, indent=4)
+                f.write(serialized)
         except IOError as e:
             print(f"Error writing to {CONFIG_FILE}: {e}")
+            metrics.incr("save.errors")
+            return
+        self.pending_snapshot = serialized
+        metrics.incr("save.count")
+        metrics.incr("save.bytes_total", len(serialized))
+        metrics.observe("save.bytes", len(serialized), DEFAULT_SIZE_BUCKETS)
+        metrics.observe("save.latency_ms", (time.perf_counter() - start) * 1000.0)
 
     def update_timer_config(self, card_id, new_config):
         if card_id in self.timer_configs:
-            if 'sort_order' not in new_config and 'sort_order' in self.timer_configs[card_id]:
-                new_config['sort_order'] = self.timer_configs[card_id]['sort_order']
-            self.timer_configs[card_id].update(new_config)
-            self.save_app_settings_and_timers()
+            snapshot = self.begin_history_step([card_id], ("groups",))
+            # Normalizing drops the dialog's set-default flags; only fields that really changed are reported
+            self.timer_store.update_fields(card_id, new_config, lambda config: normalize_timer_config(config, self.global_settings))
+            self._register_new_groups([card_id])
+            self.record_history_step("Edit Timer", snapshot)
 
     def delete_timer_config_and_card(self, card_id):
         if card_id in self.timer_configs:
+            snapshot = self.begin_history_step([card_id])
             del self.timer_configs[card_id]
-        if card_id in self.timers:
-            card_widget = self.timers.pop(card_id)
-            if card_widget:
-                card_widget.deleteLater()
-        self.save_app_settings_and_timers()
+            self.record_history_step("Delete Timer", snapshot)
+        else:
+            self.release_timer_card(card_id)
 
     def update_global_default_time_font_size(self, new_size):
         self.global_settings["default_time_font_size"] = new_size
-        self.save_app_settings_and_timers()
+        self.timer_store.settings_changed("default_time_font_size")
 
     def update_global_default_title_color(self, new_color_hex):
         self.global_settings["default_bg_color_title"] = new_color_hex
-        self.save_app_settings_and_timers()
+        self.timer_store.settings_changed("default_bg_color_title")
 
     def update_global_default_time_color(self, new_color_hex):
         self.global_settings["default_bg_color_time"] = new_color_hex
-        self.save_app_settings_and_timers()
+        self.timer_store.settings_changed("default_bg_color_time")
 
     def update_global_default_time_text_color(self, new_color_hex): # Added this method
         self.global_settings["default_time_text_color"] = new_color_hex
-        self.save_app_settings_and_timers()
+        self.timer_store.settings_changed("default_time_text_color")
 
     def update_remember_window_position(self, state: bool):
         self.global_settings["remember_window_position"] = state
@@ -362,7 +1385,7 @@ class App(QMainWindow):
             self.global_settings["window_y"] = None
             self.global_settings["window_width"] = None
             self.global_settings["window_height"] = None
-        self.save_app_settings_and_timers()
+        self.timer_store.settings_changed("remember_window_position")
 
     def apply_main_window_transparency(self):
         if self.global_settings.get("main_window_transparent_background", False):
@@ -392,16 +1415,67 @@ class App(QMainWindow):
     def update_global_main_window_transparency(self, enabled: bool):
         self.global_settings["main_window_transparent_background"] = enabled
         self.apply_main_window_transparency() # Re-apply settings
-        self.save_app_settings_and_timers()
+        self.timer_store.settings_changed("main_window_transparent_background")
 
     def update_global_main_window_opacity(self, opacity_level: float):
         # Ensure opacity is within valid range [0.0, 1.0]
         level = max(0.0, min(1.0, opacity_level))
         self.global_settings["main_window_opacity_level"] = level
         self.apply_main_window_transparency() # Re-apply settings
-        self.save_app_settings_and_timers()
+        self.timer_store.settings_changed("main_window_opacity_level")
 
-    def closeEvent(self, event: QtGui.QCloseEvent):
+    def is_display_visible(self):
+        if self.app_suspended or not self.isVisible() or self.isMinimized():
+            return False
+        window_handle = self.windowHandle()
+        # Platforms that track occlusion report fully covered windows as not exposed
+        return window_handle is None or window_handle.isExposed()
+
+    def _update_refresh_state(self):
+        visible = self.is_display_visible()
+        if visible == self.refresh_active:
+            return
+        self.refresh_active = visible
+        if visible:
+            # Catch up once (a full pass only if the day rolled over meanwhile), then resume ticking
+            self.scrollable_timers_widget.setUpdatesEnabled(True)
+            self.refresh_countdowns()
+            self.tick_timer.start(TICK_INTERVAL_MS)
+            metrics.incr("refresh.resumes")
+        else:
+            # Expiry notifications run off their own timer and keep firing while paused
+            self.tick_timer.stop()
+            self.scrollable_timers_widget.setUpdatesEnabled(False)
+            metrics.incr("refresh.pauses")
+
+    def _on_application_state_changed(self, state):
+        self.app_suspended = state in (Qt.ApplicationState.ApplicationSuspended, Qt.ApplicationState.ApplicationHidden)
+        self._update_refresh_state()
+
+    def showEvent(self, event: QtGui.QShowEvent):
+        super().showEvent(event)
+        window_handle = self.windowHandle()
+        if window_handle is not None and window_handle is not self.watched_window_handle:
+            window_handle.installEventFilter(self)
+            self.watched_window_handle = window_handle
+        self._update_refresh_state()
+
+    def hideEvent(self, event: QtGui.QHideEvent):
+        super().hideEvent(event)
+        self._update_refresh_state()
+
+    def changeEvent(self, event: QEvent):
+        super().changeEvent(event)
+        if event.type() == QEvent.Type.WindowStateChange:
+            self._update_refresh_state()
+
+    def eventFilter(self, watched, event):
+        if watched is self.watched_window_handle and event.type() == QEvent.Type.Expose:
+            # The exposed state is settled once the window has handled the event
+            QTimer.singleShot(0, self, self._update_refresh_state) # Dropped if the window is deleted first
+        return super().eventFilter(watched, event)
+
+    def remember_window_geometry(self):
         if self.global_settings.get("remember_window_position", False):
             geometry = self.geometry()
             self.global_settings["window_x"] = geometry.x()
@@ -409,8 +1483,62 @@ class App(QMainWindow):
             self.global_settings["window_width"] = geometry.width()
             self.global_settings["window_height"] = geometry.height()
             self.save_app_settings_and_timers()
+
+    def shutdown(self):
+        # Final save, snapshot and stop of the control endpoint; runs once, whether the app ends
+        # by closing the window or from the tray menu
+        if self.shut_down:
+            return
+        self.shut_down = True
+        self.timer_store.flush()
+        if not self.tray_mode:
+            self.remember_window_geometry()
+        if self.control_server is not None:
+            self.control_server.stop()
+            self.control_server = None
+        if self.instance_server is not None:
+            self.instance_server.stop() # Later launches start their own app from here on
+            self.instance_server = None
+        self.take_snapshot()
+        self.snapshot_executor.shutdown(wait=True)
+        self.snapshot_executor = None
+        if self.newer_file_version is None:
+            self.sweep_unused_assets()
+
+    def sweep_unused_assets(self):
+        # Deletes comment images that nothing can bring back: no record, quarantined record,
+        # undo step, archived timer or snapshot mentions them. Runs once, at shutdown, since it
+        # reads the archive and every snapshot
+        referenced = mentioned_assets(json.dumps([self.timer_store.records, self.quarantined_timers], default=str))
+        for step in list(self.history.undo_stack) + self.history.redo_stack:
+            referenced |= mentioned_assets(json.dumps([step.added, step.removed, step.changed], default=str))
+        for path in [self.archive_store.path] + [info.path for info in self.snapshot_store.list()]:
+            try:
+                with open(path, 'r') as f:
+                    referenced |= mentioned_assets(f.read())
+            except FileNotFoundError:
+                continue
+            except (OSError, ValueError) as e:
+                print(f"Not removing unused comment images, {path} could not be read: {e}")
+                return []
+        removed = self.asset_store.sweep(referenced)
+        metrics.incr("assets.removed", len(removed))
+        return removed
+
+    def closeEvent(self, event: QtGui.QCloseEvent):
+        # The close is only turned into tray mode once the tray icon is known to exist
+        if self.global_settings.get("close_to_tray") and not self.shut_down and self.get_notifier().ensure_tray_icon() is not None:
+            event.ignore()
+            QTimer.singleShot(0, self, self._close_to_tray) # Once the window is done with its close event
+            return
+        self.shutdown()
         super().closeEvent(event)
 
+    def _close_to_tray(self):
+        if not self.enter_tray_mode():
+            self.shutdown() # Finish the close the user asked for rather than swallowing it
+            self.close()
+
 if __name__ == '__main__':
     app = QApplication(sys.argv)
     window = App()
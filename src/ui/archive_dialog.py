@@ -0,0 +1,70 @@
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QListWidget, QListWidgetItem, QAbstractItemView, QDialogButtonBox, QMessageBox, QLabel
+)
+from PySide6.QtCore import Qt
+
+
+class ArchiveDialog(QDialog):
+    # Lists archived timers; the archive file is read when the dialog opens and dropped again
+    # when it closes so archived timers cost nothing while the view is not in use
+    def __init__(self, app_ref, parent=None):
+        super().__init__(parent)
+        self.app_ref = app_ref
+        self.setWindowTitle("Archive")
+        self.resize(360, 420)
+
+        layout = QVBoxLayout(self)
+        self.summary_label = QLabel()
+        layout.addWidget(self.summary_label)
+
+        self.entry_list = QListWidget()
+        self.entry_list.setSelectionMode(QAbstractItemView.SelectionMode.ExtendedSelection)
+        layout.addWidget(self.entry_list)
+
+        self.button_box = QDialogButtonBox(QDialogButtonBox.StandardButton.Close)
+        self.restore_button = self.button_box.addButton("Restore", QDialogButtonBox.ButtonRole.ActionRole)
+        self.purge_button = self.button_box.addButton("Purge", QDialogButtonBox.ButtonRole.DestructiveRole)
+        self.restore_button.clicked.connect(self._restore_selected)
+        self.purge_button.clicked.connect(self._purge_selected)
+        self.entry_list.itemSelectionChanged.connect(self._update_buttons)
+        self.button_box.rejected.connect(self.reject)
+        layout.addWidget(self.button_box)
+
+    def refresh(self):
+        entries = self.app_ref.archive_store.load()
+        self.entry_list.clear()
+        for entry in sorted(entries.values(), key=lambda e: (e.archived_on or "", e.config.get("end_date") or ""), reverse=True):
+            title = entry.config.get("title") or "Untitled"
+            end_date = (entry.config.get("end_date") or "")[:10]
+            item = QListWidgetItem(f"{title}  (ended {end_date})")
+            item.setData(Qt.ItemDataRole.UserRole, entry.card_id)
+            item.setToolTip(f"Archived on {entry.archived_on}")
+            self.entry_list.addItem(item)
+        self.summary_label.setText(f"{len(entries)} archived timer" + ("" if len(entries) == 1 else "s"))
+        self._update_buttons()
+
+    def _selected_ids(self):
+        return [item.data(Qt.ItemDataRole.UserRole) for item in self.entry_list.selectedItems()]
+
+    def _update_buttons(self):
+        has_selection = bool(self.entry_list.selectedItems())
+        self.restore_button.setEnabled(has_selection)
+        self.purge_button.setEnabled(has_selection)
+
+    def _restore_selected(self):
+        self.app_ref.restore_archived_timers(self._selected_ids())
+        self.refresh()
+
+    def _purge_selected(self):
+        card_ids = self._selected_ids()
+        reply = QMessageBox.question(self, "Purge Timers",
+                                     f"Permanently delete {len(card_ids)} archived timer(s)?",
+                                     QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+                                     QMessageBox.StandardButton.No)
+        if reply == QMessageBox.StandardButton.Yes:
+            self.app_ref.archive_store.take(card_ids)
+            self.refresh()
+
+    def done(self, result):
+        self.app_ref.archive_store.unload()
+        super().done(result)
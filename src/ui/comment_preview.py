@@ -0,0 +1,99 @@
+import hashlib
+import os
+from collections import OrderedDict
+
+from PySide6.QtCore import Qt, QUrl
+from PySide6.QtGui import QImage, QTextDocument
+
+from ..core.assets import THUMBNAIL_DIR_NAME, replace_asset_references
+
+# Comment tooltips. Images in a comment are shown as downscaled copies, made once and kept in
+# assets/thumbs/, and the prepared tooltip HTML is cached per comment, so hovering a card costs
+# a dictionary lookup rather than a parse of the comment and a decode of full-size images.
+# The caches are keyed by a digest of long comments, so a comment still holding inline base64
+# images is not kept alive by them.
+THUMBNAIL_MAX_PX = 160
+PREPARED_CACHE_SIZE = 256 # Distinct comments kept prepared
+DIGEST_KEY_MIN_CHARS = 1024 # Comments at least this long are keyed by their digest
+
+
+class PreparedCache:
+    # Least-recently-used map from comment key to prepared value
+    def __init__(self, maxsize=PREPARED_CACHE_SIZE):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+
+    def get(self, key, prepare):
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            return self.entries[key]
+        value = prepare()
+        self.entries[key] = value
+        if len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+        return value
+
+    def clear(self):
+        self.entries.clear()
+
+
+_has_text_cache = PreparedCache()
+_tooltip_cache = PreparedCache()
+
+
+def comment_key(html):
+    if len(html) < DIGEST_KEY_MIN_CHARS:
+        return html
+    return hashlib.sha256(html.encode("utf-8", "surrogatepass")).digest()
+
+
+def comment_has_text(html):
+    # Whether the comment shows anything once its markup is stripped (an image counts)
+    return _has_text_cache.get(comment_key(html), lambda: _has_text(html))
+
+
+def _has_text(html):
+    doc = QTextDocument()
+    doc.setHtml(html)
+    return bool(doc.toPlainText().strip())
+
+
+def thumbnail_path(asset_store, name, max_px=THUMBNAIL_MAX_PX):
+    # Path of a copy of asset `name` no larger than max_px on either side, made on first use;
+    # None when the asset is missing or Qt cannot read it
+    stem = os.path.splitext(name)[0]
+    path = os.path.join(asset_store.directory, THUMBNAIL_DIR_NAME, f"{stem}-{max_px}.png")
+    if os.path.exists(path):
+        return path
+    image = QImage(asset_store.path(name))
+    if image.isNull():
+        return None
+    if image.width() > max_px or image.height() > max_px:
+        image = image.scaled(max_px, max_px, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    except OSError as e:
+        print(f"Error creating thumbnail directory for {name}: {e}")
+        return None
+    temp_path = path + ".tmp"
+    if not image.save(temp_path, "PNG"):
+        print(f"Error writing thumbnail {path}")
+        return None
+    os.replace(temp_path, path)
+    return path
+
+
+def comment_tooltip_html(html, asset_store):
+    # The comment as the hover tooltip shows it: its images swapped for thumbnails
+    if asset_store is None:
+        return html
+    return _tooltip_cache.get((asset_store.directory, comment_key(html)), lambda: _tooltip_html(html, asset_store))
+
+
+def _tooltip_html(html, asset_store):
+    html = asset_store.externalize(html) # Pasted images the next save has not moved out yet
+
+    def thumbnail_url(name):
+        path = thumbnail_path(asset_store, name)
+        return QUrl.fromLocalFile(path).toString() if path else None
+    return replace_asset_references(html, thumbnail_url)
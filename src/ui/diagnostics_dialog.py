@@ -0,0 +1,92 @@
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QPlainTextEdit, QDialogButtonBox, QFileDialog, QMessageBox
+)
+from PySide6.QtGui import QFont
+
+from ..core.metrics import metrics
+from ..core.memory import memory_report
+
+
+class DiagnosticsDialog(QDialog):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Diagnostics")
+        self.resize(420, 480)
+
+        layout = QVBoxLayout(self)
+
+        self.metrics_view = QPlainTextEdit()
+        self.metrics_view.setReadOnly(True)
+        mono_font = QFont("Consolas")
+        mono_font.setStyleHint(QFont.StyleHint.Monospace)
+        self.metrics_view.setFont(mono_font)
+        layout.addWidget(self.metrics_view)
+
+        self.button_box = QDialogButtonBox(QDialogButtonBox.StandardButton.Close)
+        refresh_button = self.button_box.addButton("Refresh", QDialogButtonBox.ButtonRole.ActionRole)
+        reset_button = self.button_box.addButton("Reset", QDialogButtonBox.ButtonRole.ResetRole)
+        dump_button = self.button_box.addButton("Dump JSON...", QDialogButtonBox.ButtonRole.ActionRole)
+        memory_button = self.button_box.addButton("Memory", QDialogButtonBox.ButtonRole.ActionRole)
+        memory_button.setToolTip("Rebuild the cards under tracemalloc and report memory per timer")
+        refresh_button.clicked.connect(self.refresh)
+        memory_button.clicked.connect(self.show_memory_report)
+        reset_button.clicked.connect(self._reset_metrics)
+        dump_button.clicked.connect(self._dump_json)
+        self.button_box.rejected.connect(self.reject)
+        layout.addWidget(self.button_box)
+
+        self.refresh()
+
+    def refresh(self):
+        self.metrics_view.setPlainText(self.format_snapshot(metrics.snapshot()))
+
+    @staticmethod
+    def format_snapshot(snapshot):
+        lines = [f"Uptime: {snapshot['uptime_s']:.0f} s", "", "Counters:"]
+        for name, value in snapshot["counters"].items():
+            lines.append(f"  {name:<28} {value}")
+        lines.append("")
+        lines.append("Gauges:")
+        for name, value in snapshot["gauges"].items():
+            lines.append(f"  {name:<28} {value}")
+        lines.append("")
+        lines.append("Histograms:")
+        for name, hist in snapshot["histograms"].items():
+            lines.append(f"  {name}")
+            lines.append(f"    count={hist['count']} mean={hist['mean']:.3f} "
+                         f"min={hist['min']:.3f} max={hist['max']:.3f}")
+            for label, count in hist["buckets"].items():
+                if count:
+                    lines.append(f"    {label:<12} {count}")
+        return "\n".join(lines)
+
+    def show_memory_report(self):
+        app = self.parent()
+        if app is None or not hasattr(app, 'timers'):
+            return
+        report = memory_report(app, measure_rebuild=True)
+        rebuild = report["rebuild"]
+        metrics.set_gauge("memory.bytes_per_timer", round(rebuild["bytes_per_timer"]))
+        metrics.set_gauge("memory.qobjects_per_timer", report["qobjects_per_timer"])
+        self.refresh()
+        lines = ["", "Memory:",
+                 f"  timers                       {report['timers']}",
+                 f"  python heap per timer        {rebuild['bytes_per_timer']:.0f} bytes",
+                 f"  qobjects per timer           {report['qobjects_per_timer']:.1f}",
+                 f"  config records total         {report['config_bytes_total']} bytes"]
+        for card_id, entry in report["per_timer"].items():
+            lines.append(f"  {card_id:<28} qobjects={entry['qobjects']} config={entry['config_bytes']} bytes")
+        self.metrics_view.appendPlainText("\n".join(lines))
+
+    def _reset_metrics(self):
+        metrics.reset()
+        self.refresh()
+
+    def _dump_json(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Dump Metrics", "metrics.json", "JSON Files (*.json)")
+        if not path:
+            return
+        try:
+            metrics.dump(path)
+        except OSError as e:
+            QMessageBox.warning(self, "Dump Failed", f"Could not write {path}: {e}")
@@ -0,0 +1,88 @@
+import os
+
+from PySide6.QtWidgets import QApplication, QLabel, QStyle, QSystemTrayIcon
+from PySide6.QtCore import Qt, QTimer
+from PySide6.QtGui import QIcon
+
+APP_ICON_PATH = os.path.join(os.path.dirname(__file__), '..', '..', 'assets', 'app_icon.ico')
+NOTIFICATION_DISPLAY_MS = 6000
+FLOATING_TOAST_WIDTH = 280
+
+
+def app_icon():
+    if os.path.exists(APP_ICON_PATH):
+        return QIcon(APP_ICON_PATH)
+    return QApplication.style().standardIcon(QStyle.StandardPixmap.SP_MessageBoxInformation)
+
+
+class ToastLabel(QLabel):
+    # Small in-app banner used when the tray cannot show messages. Without a parent it is a
+    # frameless top-level banner in the corner of the screen, for when the window is gone
+    def __init__(self, parent):
+        super().__init__(parent)
+        if parent is None:
+            self.setWindowFlags(Qt.WindowType.ToolTip | Qt.WindowType.FramelessWindowHint | Qt.WindowType.WindowStaysOnTopHint)
+        self.setWordWrap(True)
+        self.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        self.setStyleSheet("""
+            QLabel {
+                background-color: #323232;
+                color: #FFFFFF;
+                border-radius: 6px;
+                padding: 6px;
+            }
+        """)
+        self.hide_timer = QTimer(self)
+        self.hide_timer.setSingleShot(True)
+        self.hide_timer.timeout.connect(self.hide)
+        self.hide()
+
+    def show_message(self, title, message):
+        self.setText(f"<b>{title}</b><br>{message}")
+        parent = self.parentWidget()
+        if parent is None:
+            area = QApplication.primaryScreen().availableGeometry()
+            self.setFixedWidth(FLOATING_TOAST_WIDTH)
+            self.adjustSize()
+            self.move(area.right() - self.width() - 10, area.bottom() - self.height() - 10)
+        else:
+            width = max(parent.width() - 20, 100)
+            self.setFixedWidth(width)
+            self.adjustSize()
+            self.move(10, parent.height() - self.height() - 10)
+        self.raise_()
+        self.show()
+        self.hide_timer.start(NOTIFICATION_DISPLAY_MS)
+
+
+class Notifier:
+    # Delivers notifications as a tray balloon when a system tray exists, else as an in-app toast
+    def __init__(self, window):
+        self.window = window
+        self.tray_icon = None
+        self.toast = None
+        self.floating_toast = None # Shown instead of the toast while the window is closed to the tray
+
+    def ensure_tray_icon(self):
+        if self.tray_icon is None and QSystemTrayIcon.isSystemTrayAvailable():
+            self.tray_icon = QSystemTrayIcon(app_icon(), self.window)
+            self.tray_icon.setToolTip(self.window.windowTitle())
+            self.tray_icon.show()
+        return self.tray_icon
+
+    def notify(self, title, message):
+        tray_icon = self.ensure_tray_icon()
+        if tray_icon is not None and QSystemTrayIcon.supportsMessages():
+            tray_icon.showMessage(title, message, QSystemTrayIcon.MessageIcon.Information, NOTIFICATION_DISPLAY_MS)
+            return
+        if getattr(self.window, "tray_mode", False):
+            # The window and its native handle are destroyed, so the toast on it would never show
+            if self.floating_toast is None:
+                self.floating_toast = ToastLabel(None)
+            self.floating_toast.show_message(title, message)
+            return
+        if self.toast is None:
+            self.toast = ToastLabel(self.window)
+        self.toast.show_message(title, message)
+        if not self.window.isVisible() or self.window.isMinimized():
+            QApplication.alert(self.window) # Flash the taskbar entry so the toast is noticed
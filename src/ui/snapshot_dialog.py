@@ -0,0 +1,50 @@
+from PySide6.QtWidgets import (
+    QDialog, QVBoxLayout, QListWidget, QListWidgetItem, QDialogButtonBox, QMessageBox, QLabel
+)
+from PySide6.QtCore import Qt
+
+from ..core.snapshots import KIND_BASE
+
+
+class SnapshotDialog(QDialog):
+    # Restore picker over the rotating config snapshots, newest first
+    def __init__(self, app_ref, parent=None):
+        super().__init__(parent)
+        self.app_ref = app_ref
+        self.setWindowTitle("Snapshots")
+        self.resize(340, 400)
+
+        layout = QVBoxLayout(self)
+        layout.addWidget(QLabel("Restoring replaces all timers and settings with the chosen snapshot.\n"
+                                "The current state is snapshotted first."))
+        self.snapshot_list = QListWidget()
+        layout.addWidget(self.snapshot_list)
+
+        self.button_box = QDialogButtonBox(QDialogButtonBox.StandardButton.Close)
+        self.restore_button = self.button_box.addButton("Restore", QDialogButtonBox.ButtonRole.ActionRole)
+        self.restore_button.clicked.connect(self._restore_selected)
+        self.snapshot_list.itemSelectionChanged.connect(
+            lambda: self.restore_button.setEnabled(bool(self.snapshot_list.selectedItems())))
+        self.snapshot_list.itemDoubleClicked.connect(lambda item: self._restore_selected())
+        self.button_box.rejected.connect(self.reject)
+        layout.addWidget(self.button_box)
+
+    def refresh(self):
+        self.snapshot_list.clear()
+        for info in reversed(self.app_ref.snapshot_store.list()):
+            kind = "full" if info.kind == KIND_BASE else "changes"
+            item = QListWidgetItem(f"{info.taken_at:%Y-%m-%d %H:%M:%S}  ({kind})")
+            item.setData(Qt.ItemDataRole.UserRole, info.seq)
+            self.snapshot_list.addItem(item)
+        self.restore_button.setEnabled(False)
+
+    def _restore_selected(self):
+        items = self.snapshot_list.selectedItems()
+        if not items:
+            return
+        reply = QMessageBox.question(self, "Restore Snapshot", f"Restore timers from {items[0].text()}?",
+                                     QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+                                     QMessageBox.StandardButton.No)
+        if reply == QMessageBox.StandardButton.Yes:
+            self.app_ref.restore_snapshot(items[0].data(Qt.ItemDataRole.UserRole))
+            self.refresh()
@@ -0,0 +1,481 @@
+import os
+from datetime import datetime, timedelta
+
+from PySide6.QtWidgets import (
+    QApplication, QDialog, QLabel, QVBoxLayout, QHBoxLayout, QPushButton, QLineEdit, QTextEdit,
+    QColorDialog, QMessageBox, QSizePolicy, QDateEdit, QDialogButtonBox, QSpinBox, QCheckBox,
+    QFormLayout, QToolBar, QComboBox
+)
+from PySide6.QtCore import Qt, QDate, QUrl
+from PySide6.QtGui import QPalette, QColor, QFont, QAction, QTextCharFormat
+
+from ..components.timer_card import (
+    DEFAULT_TITLE_BG_COLOR, DEFAULT_TIME_BG_COLOR, DEFAULT_TIME_TEXT_COLOR, DEFAULT_TIME_FONT_SIZE
+)
+from ..core.business_days import COUNT_MODE_BUSINESS, COUNT_MODE_CALENDAR
+from ..core.groups import group_of
+from ..core.clock import SYSTEM_CLOCK
+from ..core.recurrence import parse_rule, FREQ_YEARLY, FREQ_MONTHLY, FREQ_WEEKLY, FREQ_DAILY, FREQ_LAST_WEEKDAY
+
+# The timer editor. Only needed once a card is edited, so the app imports this module on
+# first use (and pre-warms it after startup) instead of loading it before the first paint.
+
+# (label, recurrence freq) shown in the settings dialog; None means the timer ends once
+REPEAT_CHOICES = (
+    ("Never", None),
+    ("Yearly", FREQ_YEARLY),
+    ("Monthly", FREQ_MONTHLY),
+    ("Weekly", FREQ_WEEKLY),
+    ("Every N days", FREQ_DAILY),
+    ("Last weekday of month", FREQ_LAST_WEEKDAY),
+)
+
+
+class TimerSettingsDialog(QDialog):
+    # Built once per app and rebound to a card with bind() on each open, so opening the
+    # editor only costs loading that card's values into the existing widgets.
+    def __init__(self, app_ref):
+        super().__init__(app_ref) # Parent to the main app window for modality
+        self.app_ref = app_ref # Store a reference to the main app
+        self.parent_card = None
+        self.current_config = {}
+
+        self.setWindowTitle("Settings")
+        self.setFixedWidth(210)
+
+        main_layout = QVBoxLayout()
+
+        form_layout = QFormLayout()
+        form_layout.setLabelAlignment(Qt.AlignmentFlag.AlignRight)
+
+        self.title_entry = QLineEdit()
+        form_layout.addRow(QLabel("Title:"), self.title_entry)
+
+        self.date_edit = QDateEdit()
+        self.date_edit.setDisplayFormat("yy-MM-dd")
+        self.date_edit.setCalendarPopup(True)
+        form_layout.addRow(QLabel("Date:"), self.date_edit)
+        
+        self.repeat_combo = QComboBox()
+        for label, freq in REPEAT_CHOICES:
+            self.repeat_combo.addItem(label, freq)
+        form_layout.addRow(QLabel("Repeat:"), self.repeat_combo)
+
+        self.repeat_interval_spinbox = QSpinBox()
+        self.repeat_interval_spinbox.setMinimum(1)
+        self.repeat_interval_spinbox.setMaximum(365)
+        form_layout.addRow(QLabel("Every:"), self.repeat_interval_spinbox)
+        self.repeat_combo.currentIndexChanged.connect(self._update_repeat_controls)
+
+        self.business_days_checkbox = QCheckBox("Working days")
+        self.business_days_checkbox.setToolTip("Count Monday to Friday only, excluding the holidays in data/holidays.json")
+        form_layout.addRow(QLabel("Count:"), self.business_days_checkbox)
+
+        self.group_combo = QComboBox()
+        self.group_combo.setEditable(True) # Typing a new name creates that group
+        self.group_combo.lineEdit().setPlaceholderText("No group")
+        form_layout.addRow(QLabel("Group:"), self.group_combo)
+
+        self.time_font_size_spinbox = QSpinBox()
+        self.time_font_size_spinbox.setMinimum(8)
+        self.time_font_size_spinbox.setMaximum(100)
+        form_layout.addRow(QLabel("Size:"), self.time_font_size_spinbox)
+
+        main_layout.addLayout(form_layout)
+
+        self.set_default_font_size_checkbox = QCheckBox("Default Font Size")
+        main_layout.addWidget(self.set_default_font_size_checkbox)
+
+        # Main Window Transparency Controls
+        self.main_window_transparent_checkbox = QCheckBox("Transparent Main Window")
+        main_layout.addWidget(self.main_window_transparent_checkbox)
+
+        opacity_layout = QHBoxLayout()
+        opacity_layout.addWidget(QLabel("Opacity Level (if transparent):"))
+        self.main_window_opacity_spinbox = QSpinBox()
+        self.main_window_opacity_spinbox.setMinimum(0) # 0% opacity
+        self.main_window_opacity_spinbox.setMaximum(100) # 100% opacity
+        self.main_window_opacity_spinbox.setSuffix("%")
+        opacity_layout.addWidget(self.main_window_opacity_spinbox)
+        main_layout.addLayout(opacity_layout)
+
+        self.main_window_transparent_checkbox.toggled.connect(self.main_window_opacity_spinbox.setEnabled)
+
+        self.remember_window_pos_checkbox = QCheckBox("Remember window position on exit")
+        main_layout.addWidget(self.remember_window_pos_checkbox)
+        
+        main_layout.addSpacing(10)
+
+        # Rich Text Comment Editor
+        main_layout.addWidget(QLabel("Comment:"))
+
+        self.comment_toolbar = QToolBar(self)
+        self.action_bold = QAction("B", self)
+        self.action_bold.setToolTip("Bold")
+        self.action_bold.setCheckable(True)
+        bold_font = QFont("Arial")
+        bold_font.setWeight(QFont.Weight.Bold)
+        self.action_bold.setFont(bold_font)
+        
+        self.action_italic = QAction("I", self)
+        self.action_italic.setToolTip("Italic")
+        self.action_italic.setCheckable(True)
+        italic_font = QFont("Arial")
+        italic_font.setItalic(True)
+        self.action_italic.setFont(italic_font)
+
+        self.action_underline = QAction("U", self)
+        self.action_underline.setToolTip("Underline")
+        self.action_underline.setCheckable(True)
+        underline_font = QFont("Arial")
+        underline_font.setUnderline(True)
+        self.action_underline.setFont(underline_font)
+
+        self.comment_toolbar.addAction(self.action_bold)
+        self.comment_toolbar.addAction(self.action_italic)
+        self.comment_toolbar.addAction(self.action_underline)
+        main_layout.addWidget(self.comment_toolbar)
+
+        self.comment_textbox = QTextEdit()  # Create empty, filled with HTML in bind()
+        # self.comment_textbox.setAcceptRichText(False) # Removed, default is True (rich text)
+        self.comment_textbox.setMinimumHeight(80) # Increased minimum height for rich text editor
+        self.comment_textbox.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Expanding) # Allow expanding
+        if hasattr(self.app_ref, 'asset_store'):
+            # Saved comments refer to their images as "assets/<name>", relative to the data directory
+            data_dir = os.path.dirname(self.app_ref.asset_store.directory)
+            self.comment_textbox.document().setBaseUrl(QUrl.fromLocalFile(os.path.join(data_dir, "")))
+        main_layout.addWidget(self.comment_textbox)
+
+        # Connect toolbar actions
+        self.action_bold.triggered.connect(self._toggle_bold)
+        self.action_italic.triggered.connect(self._toggle_italic)
+        self.action_underline.triggered.connect(self._toggle_underline)
+
+        # Update toolbar button states based on cursor position/selection format
+        self.comment_textbox.currentCharFormatChanged.connect(self._update_format_actions_state)
+        self.comment_textbox.cursorPositionChanged.connect(self._update_format_actions_state)
+
+        main_layout.addSpacing(10)
+
+        # Title Region Color
+        self.title_color_button = QPushButton("Title Background")
+        main_layout.addWidget(self.title_color_button)
+        self.title_color_button.clicked.connect(self._choose_title_region_color)
+        
+        self._temp_selected_title_color = DEFAULT_TITLE_BG_COLOR
+            
+        self.title_color_preview = QLabel("Preview")
+        self.title_color_preview.setAutoFillBackground(True)
+        self.title_color_preview.setFixedHeight(20)
+        main_layout.addWidget(self.title_color_preview)
+        
+        self.set_default_title_color_checkbox = QCheckBox("Default Title Background")
+        main_layout.addWidget(self.set_default_title_color_checkbox)
+
+        main_layout.addSpacing(10)
+
+        # Time Region Background Color
+        self.time_bg_color_button = QPushButton("Time Background") # Renamed for clarity
+        main_layout.addWidget(self.time_bg_color_button)
+        self.time_bg_color_button.clicked.connect(self._choose_time_bg_color) # Renamed method
+
+        self._temp_selected_time_bg_color = DEFAULT_TIME_BG_COLOR # Renamed variable
+            
+        self.time_bg_color_preview = QLabel("Preview") # Renamed for clarity
+        self.time_bg_color_preview.setAutoFillBackground(True)
+        self.time_bg_color_preview.setFixedHeight(20)
+        main_layout.addWidget(self.time_bg_color_preview)
+
+        self.set_default_time_bg_color_checkbox = QCheckBox("Default Time Background") # Renamed for clarity
+        main_layout.addWidget(self.set_default_time_bg_color_checkbox)
+
+        main_layout.addSpacing(10) # Space after time background color section
+
+        # Time Region Text Color
+        self.time_text_color_button = QPushButton("Time Text Color")
+        main_layout.addWidget(self.time_text_color_button)
+        self.time_text_color_button.clicked.connect(self._choose_time_text_color)
+
+        self._temp_selected_time_text_color = DEFAULT_TIME_TEXT_COLOR
+            
+        self.time_text_color_preview = QLabel("Preview")
+        self.time_text_color_preview.setAutoFillBackground(True) # Will show text on this bg
+        self.time_text_color_preview.setFixedHeight(20)
+        main_layout.addWidget(self.time_text_color_preview)
+
+        self.set_default_time_text_color_checkbox = QCheckBox("Default Time Text Color")
+        main_layout.addWidget(self.set_default_time_text_color_checkbox)
+        
+        self._update_color_previews()
+
+        main_layout.addSpacing(10)
+        main_layout.addStretch(1)
+
+        # --- Action Buttons ---
+        self.button_box = QDialogButtonBox(QDialogButtonBox.StandardButton.Save | QDialogButtonBox.StandardButton.Cancel | QDialogButtonBox.StandardButton.Reset)
+        delete_button = self.button_box.addButton("Delete", QDialogButtonBox.ButtonRole.DestructiveRole)
+
+        self.button_box.accepted.connect(self.accept)
+        self.button_box.rejected.connect(self.reject)
+        self.button_box.button(QDialogButtonBox.StandardButton.Reset).clicked.connect(self._reset_settings)
+        if delete_button:
+            delete_button.clicked.connect(self._delete_timer_from_dialog_button)
+
+        main_layout.addWidget(self.button_box)
+        self.setLayout(main_layout)
+
+    def bind(self, parent_card):
+        # Point the dialog at another card and load its values into the existing widgets
+        self.parent_card = parent_card
+        self.current_config = parent_card.config.copy() # Work on a copy
+        self.setWindowTitle(f"Settings: {self.current_config.get('title', 'Timer')}")
+        self._load_settings(parent_card.config)
+        self.set_default_font_size_checkbox.setChecked(False)
+        self.set_default_title_color_checkbox.setChecked(False)
+        self.set_default_time_bg_color_checkbox.setChecked(False)
+        self.set_default_time_text_color_checkbox.setChecked(False)
+        self.title_entry.setFocus()
+
+    def unbind(self):
+        # Drop the card reference so a card deleted later is not kept alive by the dialog
+        self.parent_card = None
+        self.current_config = {}
+
+    def _update_color_previews(self):
+        # Update title color preview
+        if self._temp_selected_title_color:
+            palette = self.title_color_preview.palette()
+            palette.setColor(QPalette.ColorRole.Window, QColor(self._temp_selected_title_color))
+            self.title_color_preview.setPalette(palette)
+        else:
+            self.title_color_preview.setPalette(QApplication.style().standardPalette())
+
+        # Update time background color preview
+        if self._temp_selected_time_bg_color: # Renamed variable
+            palette = self.time_bg_color_preview.palette() # Renamed preview widget
+            palette.setColor(QPalette.ColorRole.Window, QColor(self._temp_selected_time_bg_color)) # Renamed variable
+            self.time_bg_color_preview.setPalette(palette) # Renamed preview widget
+        else:
+            self.time_bg_color_preview.setPalette(QApplication.style().standardPalette()) # Renamed preview widget
+
+        # Update time text color preview
+        if self._temp_selected_time_text_color:
+            palette = self.time_text_color_preview.palette()
+            # Set background to something contrasting to see the text color
+            # For simplicity, let's use the time background color, or white if not set
+            bg_for_text_preview = QColor(self._temp_selected_time_bg_color if self._temp_selected_time_bg_color else "#FFFFFF")
+            palette.setColor(QPalette.ColorRole.Window, bg_for_text_preview)
+            palette.setColor(QPalette.ColorRole.WindowText, QColor(self._temp_selected_time_text_color))
+            self.time_text_color_preview.setPalette(palette)
+            self.time_text_color_preview.setText("Text") # Show sample text
+        else:
+            self.time_text_color_preview.setPalette(QApplication.style().standardPalette())
+            self.time_text_color_preview.setText("Preview")
+
+    def _update_repeat_controls(self):
+        self.repeat_interval_spinbox.setEnabled(self.repeat_combo.currentData() is not None)
+
+    def _selected_recurrence(self):
+        freq = self.repeat_combo.currentData()
+        if freq is None:
+            return None
+        return {"freq": freq, "interval": self.repeat_interval_spinbox.value()}
+
+    def _selected_count_mode(self):
+        return COUNT_MODE_BUSINESS if self.business_days_checkbox.isChecked() else COUNT_MODE_CALENDAR
+
+    def _toggle_bold(self, checked):
+        fmt = QTextCharFormat()
+        fmt.setFontWeight(QFont.Weight.Bold if checked else QFont.Weight.Normal)
+        self.comment_textbox.mergeCurrentCharFormat(fmt)
+
+    def _toggle_italic(self, checked):
+        fmt = QTextCharFormat()
+        fmt.setFontItalic(checked)
+        self.comment_textbox.mergeCurrentCharFormat(fmt)
+
+    def _toggle_underline(self, checked):
+        fmt = QTextCharFormat()
+        fmt.setFontUnderline(checked)
+        self.comment_textbox.mergeCurrentCharFormat(fmt)
+
+    def _update_format_actions_state(self):
+        fmt = self.comment_textbox.currentCharFormat()
+        self.action_bold.setChecked(fmt.fontWeight() == QFont.Weight.Bold)
+        self.action_italic.setChecked(fmt.fontItalic())
+        self.action_underline.setChecked(fmt.fontUnderline())
+
+    def _choose_title_region_color(self):
+        initial_color = QColor(self._temp_selected_title_color) if self._temp_selected_title_color else Qt.GlobalColor.white
+        color = QColorDialog.getColor(initial_color, self, "Choose title region background color")
+        if color.isValid():
+            self._temp_selected_title_color = color.name()
+            self._update_color_previews()
+
+    def _choose_time_bg_color(self): # Renamed method
+        initial_color = QColor(self._temp_selected_time_bg_color) if self._temp_selected_time_bg_color else Qt.GlobalColor.white # Renamed variable
+        color = QColorDialog.getColor(initial_color, self, "Choose time region background color")
+        if color.isValid():
+            self._temp_selected_time_bg_color = color.name() # Renamed variable
+            self._update_color_previews()
+
+    def _choose_time_text_color(self): # New method
+        initial_color = QColor(self._temp_selected_time_text_color) if self._temp_selected_time_text_color else Qt.GlobalColor.black
+        color = QColorDialog.getColor(initial_color, self, "Choose time text color")
+        if color.isValid():
+            self._temp_selected_time_text_color = color.name()
+            self._update_color_previews()
+
+    def accept(self):
+        # Update the timer card's local config
+        self.current_config["title"] = self.title_entry.text()
+        
+        qdate_val = self.date_edit.date()
+        dt_obj = datetime(qdate_val.year(), qdate_val.month(), qdate_val.day(), 0, 0, 0)
+        self.current_config["end_date"] = dt_obj.strftime("%Y-%m-%d %H:%M:%S")
+
+        self.current_config["font_size_time"] = self.time_font_size_spinbox.value()
+        self.current_config["recurrence"] = self._selected_recurrence()
+        self.current_config["count_mode"] = self._selected_count_mode()
+        self.current_config["group"] = self.group_combo.currentText().strip()
+        # self.current_config["comment"] = self.comment_textbox.toPlainText() # Old plain text
+        self.current_config["comment"] = self.comment_textbox.toHtml() # Use toHtml() for rich text
+        
+        self.current_config["bg_color_title"] = self._temp_selected_title_color
+        self.current_config["bg_color_time"] = self._temp_selected_time_bg_color # Renamed variable
+        self.current_config["text_color_time"] = self._temp_selected_time_text_color # New
+
+        if self.set_default_font_size_checkbox.isChecked():
+            if hasattr(self.app_ref, 'update_global_default_time_font_size'):
+                self.app_ref.update_global_default_time_font_size(self.time_font_size_spinbox.value())
+        
+        if self.set_default_title_color_checkbox.isChecked():
+            if hasattr(self.app_ref, 'update_global_default_title_color'):
+                self.app_ref.update_global_default_title_color(self._temp_selected_title_color)
+
+        if self.set_default_time_bg_color_checkbox.isChecked(): # Renamed checkbox
+            if hasattr(self.app_ref, 'update_global_default_time_color'): # Existing method in main_app for time BG
+                self.app_ref.update_global_default_time_color(self._temp_selected_time_bg_color) # Renamed variable
+
+        if self.set_default_time_text_color_checkbox.isChecked(): # New checkbox
+            if hasattr(self.app_ref, 'update_global_default_time_text_color'): # New method needed in main_app
+                self.app_ref.update_global_default_time_text_color(self._temp_selected_time_text_color)
+
+        # Update main window transparency settings
+        if hasattr(self.app_ref, 'update_global_main_window_transparency'):
+            self.app_ref.update_global_main_window_transparency(self.main_window_transparent_checkbox.isChecked())
+        
+        if hasattr(self.app_ref, 'update_global_main_window_opacity'):
+            opacity_percent = self.main_window_opacity_spinbox.value()
+            self.app_ref.update_global_main_window_opacity(opacity_percent / 100.0)
+
+        if hasattr(self.app_ref, 'update_remember_window_position'):
+            self.app_ref.update_remember_window_position(self.remember_window_pos_checkbox.isChecked())
+
+        super().accept()
+
+    def _reset_settings(self):
+        self._load_settings(self.parent_card.config)
+
+    def _tomorrow(self):
+        tomorrow = getattr(self.app_ref, 'clock', SYSTEM_CLOCK).today() + timedelta(days=1)
+        return QDate(tomorrow.year, tomorrow.month, tomorrow.day)
+
+    def _load_settings(self, config):
+        self.title_entry.setText(config.get("title", ""))
+        original_end_date_str = config.get("end_date")
+        if original_end_date_str:
+            try:
+                dt_obj = datetime.strptime(original_end_date_str, "%Y-%m-%d %H:%M:%S")
+                self.date_edit.setDate(QDate(dt_obj.year, dt_obj.month, dt_obj.day))
+            except ValueError:
+                self.date_edit.setDate(self._tomorrow())
+        else:
+            self.date_edit.setDate(self._tomorrow())
+        rule = parse_rule(config.get("recurrence"))
+        self.repeat_combo.setCurrentIndex(max(0, self.repeat_combo.findData(rule["freq"] if rule else None)))
+        self.repeat_interval_spinbox.setValue(rule["interval"] if rule else 1)
+        self._update_repeat_controls()
+        self.business_days_checkbox.setChecked(config.get("count_mode") == COUNT_MODE_BUSINESS)
+        self.group_combo.clear()
+        self.group_combo.addItem("")
+        if hasattr(self.app_ref, 'group_names'):
+            self.group_combo.addItems(self.app_ref.group_names())
+        self.group_combo.setCurrentText(group_of(config))
+        # Use setHtml for rich text; it also clears the undo history left by the previous card
+        self.comment_textbox.setHtml(config.get("comment") or "")
+        
+        self._temp_selected_title_color = config.get("bg_color_title") or DEFAULT_TITLE_BG_COLOR
+        self._temp_selected_time_bg_color = config.get("bg_color_time") or DEFAULT_TIME_BG_COLOR # Renamed
+        self._temp_selected_time_text_color = config.get("text_color_time") or DEFAULT_TIME_TEXT_COLOR # New
+        self.time_font_size_spinbox.setValue(config.get("font_size_time") or DEFAULT_TIME_FONT_SIZE)
+            
+        self._update_color_previews()
+        
+        initial_remember_pos = False
+        if hasattr(self.app_ref, 'global_settings') and \
+           isinstance(self.app_ref.global_settings, dict):
+            initial_remember_pos = self.app_ref.global_settings.get("remember_window_position", False)
+        self.remember_window_pos_checkbox.setChecked(initial_remember_pos)
+
+        # Reset main window transparency controls
+        initial_transparent_bg = self.app_ref.global_settings.get("main_window_transparent_background", False)
+        self.main_window_transparent_checkbox.setChecked(initial_transparent_bg)
+        initial_opacity_percent = int(self.app_ref.global_settings.get("main_window_opacity_level", 1.0) * 100)
+        self.main_window_opacity_spinbox.setValue(initial_opacity_percent)
+        self.main_window_opacity_spinbox.setEnabled(initial_transparent_bg)
+
+    def _delete_timer_from_dialog_button(self):
+        # This method is called specifically by the "Delete Timer" button in the QDialogButtonBox
+        # It reuses the _delete_timer logic which shows a confirmation.
+        # If confirmed, _delete_timer calls self.done(QDialog.DialogCode.Accepted + 1)
+        self._delete_timer()
+
+    def _handle_button_click(self, button):
+        # This method might still be useful if you have other custom roles,
+        # but for the specific "Delete Timer" button, direct connection is clearer.
+        if self.button_box.buttonRole(button) == QDialogButtonBox.ButtonRole.DestructiveRole:
+            # This will now call _delete_timer_from_dialog_button if the DestructiveRole button is clicked
+            # and not directly connected. However, direct connection is preferred.
+            pass # Or call self._delete_timer() if not directly connected
+
+    def _delete_timer(self):
+        reply = QMessageBox.question(self, "Delete Timer",
+                                     f"Are you sure you want to delete '{self.current_config.get('title', 'this timer')}'?",
+                                     QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No,
+                                     QMessageBox.StandardButton.No)
+        if reply == QMessageBox.StandardButton.Yes:
+            self.parent_card.app_ref.delete_timer_config_and_card(self.parent_card.card_id)
+            self.done(QDialog.DialogCode.Accepted + 1) # Custom code to indicate deletion
+
+    def get_updated_config(self):
+        qdate = self.date_edit.date()
+        year = qdate.year()
+        month = qdate.month()
+        day = qdate.day()
+        end_date_str = datetime(year, month, day, 0, 0, 0).strftime("%Y-%m-%d %H:%M:%S")
+        
+        # comment_from_textbox = self.comment_textbox.toPlainText() # Old plain text
+        comment_from_textbox = self.comment_textbox.toHtml() # Use toHtml() for rich text
+        # print(f"DEBUG Dialog Save (get_updated_config): Comment from textbox is '{comment_from_textbox}' (repr: {repr(comment_from_textbox)})") # Debug print removed
+        
+        # Normalize the doubled newlines from toPlainText(). # Removed this logic as it's for plain text
+        # normalized_comment = comment_from_textbox.replace('\\n\\n', '\\n')
+        # print(f"DEBUG Dialog Save (get_updated_config): Normalized comment is '{normalized_comment}' (repr: {repr(normalized_comment)})") # Debug print removed
+
+        return {
+            "title": self.title_entry.text(),
+            "end_date": end_date_str,
+            "comment": comment_from_textbox, # Use HTML comment directly
+            "bg_color_title": self._temp_selected_title_color,
+            "bg_color_time": self._temp_selected_time_bg_color, # Renamed
+            "text_color_time": self._temp_selected_time_text_color, # New
+            "font_size_time": self.time_font_size_spinbox.value(),
+            "recurrence": self._selected_recurrence(),
+            "count_mode": self._selected_count_mode(),
+            "group": self.group_combo.currentText().strip(),
+            "set_default_font_size": self.set_default_font_size_checkbox.isChecked(),
+            "set_default_title_color": self.set_default_title_color_checkbox.isChecked(),
+            "set_default_time_color": self.set_default_time_bg_color_checkbox.isChecked(), # Renamed
+            "set_default_time_text_color": self.set_default_time_text_color_checkbox.isChecked() # New
+        }
@@ -0,0 +1,76 @@
+from datetime import datetime, time, timedelta
+
+from PySide6.QtWidgets import QMenu, QSystemTrayIcon
+from PySide6.QtCore import QTimer
+
+# Tray icon for tray mode (App.enter_tray_mode). With the window and its cards destroyed, the
+# icon's tooltip and menu list the nearest deadlines, computed from the timer records. The
+# tooltip is refreshed when the records change and once a day at midnight; the menu is built
+# each time it opens.
+TOOLTIP_TIMERS = 3
+MENU_TIMERS = 8
+ROLLOVER_SLACK_MS = 1000 # Fire just after midnight rather than just before it
+
+
+def countdown_line(title, days):
+    if days == 0:
+        return f"{title}: today"
+    return f"{title}: {days} day" + ("" if days == 1 else "s")
+
+
+class TrayController:
+    def __init__(self, app, tray_icon):
+        self.app = app
+        self.tray_icon = tray_icon
+        self.menu = QMenu() # No parent: the window it would belong to is destroyed in tray mode
+        self.menu.aboutToShow.connect(self.rebuild_menu)
+        tray_icon.setContextMenu(self.menu)
+        tray_icon.activated.connect(self._on_activated)
+        self.rollover_timer = QTimer(app)
+        self.rollover_timer.setSingleShot(True)
+        self.rollover_timer.timeout.connect(self._on_rollover)
+
+    def enter(self):
+        self.update_tooltip()
+        self._arm_rollover()
+
+    def leave(self):
+        self.rollover_timer.stop()
+        self.tray_icon.setToolTip(self.app.windowTitle())
+
+    def update_tooltip(self):
+        lines = [self.app.windowTitle()]
+        lines += [countdown_line(self._title(card_id), days) for days, card_id in self.app.nearest_timers(TOOLTIP_TIMERS)]
+        self.tray_icon.setToolTip("\n".join(lines))
+
+    def rebuild_menu(self):
+        self.menu.clear()
+        open_action = self.menu.addAction("Open Countdown Timer")
+        open_action.triggered.connect(self.app.show_window)
+        self.menu.setDefaultAction(open_action)
+        self.menu.addSeparator()
+        nearest = self.app.nearest_timers(MENU_TIMERS)
+        for days, card_id in nearest:
+            action = self.menu.addAction(countdown_line(self._title(card_id), days))
+            action.triggered.connect(self.app.show_window)
+        if not nearest:
+            self.menu.addAction("No upcoming timers").setEnabled(False)
+        self.menu.addSeparator()
+        self.menu.addAction("Quit").triggered.connect(self.app.quit_application)
+
+    def _title(self, card_id):
+        return self.app.timer_configs.get(card_id, {}).get("title", "Timer")
+
+    def _on_activated(self, reason):
+        if reason in (QSystemTrayIcon.ActivationReason.Trigger, QSystemTrayIcon.ActivationReason.DoubleClick):
+            self.app.show_window()
+
+    def _arm_rollover(self):
+        now = self.app.clock.now()
+        midnight = datetime.combine(now.date() + timedelta(days=1), time.min)
+        self.rollover_timer.start(int((midnight - now).total_seconds() * 1000) + ROLLOVER_SLACK_MS)
+
+    def _on_rollover(self):
+        self.app.refresh_countdowns() # The daily holiday reload and archiving, with no cards to update
+        self.update_tooltip()
+        self._arm_rollover()
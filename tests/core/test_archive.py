@@ -0,0 +1,72 @@
+import json
+import os
+import tempfile
+import unittest
+from datetime import date
+
+from src.core.archive import ArchiveStore, select_expired, RESTORED_ON_KEY
+
+TODAY = date(2025, 12, 19).toordinal()
+
+
+def timer(days_ago, **extra):
+    config = {"title": f"ended {days_ago}", "end_date": date.fromordinal(TODAY - days_ago).strftime("%Y-%m-%d 00:00:00")}
+    config.update(extra)
+    return config
+
+
+class TestSelectExpired(unittest.TestCase):
+    def test_grace_period_recurrence_and_restore(self):
+        configs = {
+            "old": timer(8),
+            "recent": timer(7),
+            "future": timer(-3),
+            "recurring": timer(30, recurrence={"freq": "monthly"}),
+            "restored": timer(30, **{RESTORED_ON_KEY: date.fromordinal(TODAY - 2).isoformat()}),
+        }
+        self.assertEqual(select_expired(configs, TODAY, 7), ["old"])
+        self.assertEqual(select_expired(configs, TODAY, None), [])
+
+
+class TestArchiveStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp_dir.name, "archive.jsonl")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_append_does_not_load_and_take_rewrites(self):
+        store = ArchiveStore(self.path)
+        store.append({"a": timer(10), "b": timer(9)}, "2025-12-19")
+        store.append({"c": timer(8)}, "2025-12-20")
+        self.assertIsNone(store._entries)
+
+        reopened = ArchiveStore(self.path)
+        self.assertEqual(sorted(reopened.load()), ["a", "b", "c"])
+        self.assertEqual(reopened.take(["b", "missing"]), {"b": timer(9)})
+        reopened.unload()
+        self.assertEqual(sorted(reopened.load()), ["a", "c"])
+        self.assertEqual(reopened.load()["c"].archived_on, "2025-12-20")
+
+    def test_unreadable_lines_are_skipped(self):
+        with open(self.path, 'w') as f:
+            f.write('{"id": "a", "archived_on": "2025-12-19", "config": {"title": "x"}}\nnot json\n\n')
+        self.assertEqual(list(ArchiveStore(self.path).load()), ["a"])
+
+    def test_unreadable_lines_survive_a_rewrite(self):
+        with open(self.path, 'w') as f:
+            f.write('{"id": "a", "archived_on": "2025-12-19", "config": {"title": "x"}}\nnot json\n{"id": "b"}\n'
+                    '{"id": "c", "archived_on": "2025-12-19", "config": {"title": "y"}}\n{"id": "d", "trunc')
+        store = ArchiveStore(self.path)
+        self.assertEqual(store.take(["a"]), {"a": {"title": "x"}})
+        with open(self.path, 'r') as f:
+            lines = f.read().splitlines()
+        self.assertEqual(lines[:3], ['not json', '{"id": "b"}', '{"id": "d", "trunc'])
+        self.assertEqual([json.loads(line)["id"] for line in lines[3:]], ["c"])
+        store.unload()
+        self.assertEqual(list(store.load()), ["c"])
+
+
+if __name__ == '__main__':
+    unittest.main()
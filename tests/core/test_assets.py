@@ -0,0 +1,68 @@
+import base64
+import json
+import os
+import tempfile
+import unittest
+
+from src.core.assets import AssetStore, asset_references, mentioned_assets, replace_asset_references
+
+PNG_BYTES = b"\x89PNG\r\n\x1a\nnot really a png"
+
+
+def data_uri(data, mime="image/png"):
+    return f"data:{mime};base64,{base64.b64encode(data).decode('ascii')}"
+
+
+class TestAssetStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.store = AssetStore(os.path.join(self.tmp_dir.name, "assets"))
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_moves_inline_images_into_the_store_once(self):
+        html = f'<p>Plan</p><img src="{data_uri(PNG_BYTES)}" /><img src=\'{data_uri(PNG_BYTES)}\'>'
+        stored = self.store.externalize(html)
+        names = asset_references(stored)
+        self.assertEqual(len(names), 2)
+        self.assertEqual(names[0], names[1]) # Content-addressed: the same bytes get the same name
+        self.assertTrue(names[0].endswith(".png"))
+        self.assertNotIn("base64", stored)
+        self.assertIn(f'<img src="assets/{names[0]}" />', stored)
+        self.assertEqual(os.listdir(self.store.directory), [names[0]])
+        with open(self.store.path(names[0]), 'rb') as f:
+            self.assertEqual(f.read(), PNG_BYTES)
+        self.assertEqual(self.store.externalize(stored), stored)
+
+    def test_leaves_what_it_cannot_store_inline(self):
+        html = (f'<img src="{data_uri(b"<svg/>", "image/x-unknown")}">'
+                '<img src="data:image/png;base64,abc">' # Truncated base64
+                '<img src="https://example.com/a.png">')
+        self.assertEqual(self.store.externalize(html), html)
+        self.assertFalse(os.path.exists(self.store.directory))
+
+    def test_sweep_removes_unreferenced_images_and_their_thumbnails(self):
+        kept = self.store.put(b"kept", "png")
+        dropped = self.store.put(b"dropped", "png")
+        thumbs = os.path.join(self.store.directory, "thumbs")
+        os.makedirs(thumbs)
+        for name in (kept, dropped):
+            open(os.path.join(thumbs, name.replace(".png", "-160.png")), 'w').close()
+        open(os.path.join(self.store.directory, "notes.txt"), 'w').close() # Not an asset name
+        self.assertEqual(self.store.sweep({kept}), [dropped])
+        self.assertEqual(sorted(os.listdir(self.store.directory)), sorted([kept, "notes.txt", "thumbs"]))
+        self.assertEqual(os.listdir(thumbs), [kept.replace(".png", "-160.png")])
+
+    def test_mentions_are_found_in_escaped_text(self):
+        escaped = json.dumps({"comment": '<img src="assets/0a1b.png" />'})
+        self.assertEqual(mentioned_assets(escaped), {"0a1b.png"})
+
+    def test_replace_references(self):
+        html = '<img src="assets/0a1b.png"><img src="assets/ffff.jpg"><img src="other/0a1b.png">'
+        replaced = replace_asset_references(html, lambda name: "/thumbs/" + name if name.endswith(".png") else None)
+        self.assertEqual(replaced, '<img src="/thumbs/0a1b.png"><img src="assets/ffff.jpg"><img src="other/0a1b.png">')
+
+
+if __name__ == '__main__':
+    unittest.main()
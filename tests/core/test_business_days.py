@@ -0,0 +1,78 @@
+import json
+import os
+import tempfile
+import unittest
+from datetime import date, timedelta
+
+from src.core import business_days
+from src.core.business_days import HolidayCalendar, load_holiday_calendar
+from src.core.countdown import CountdownBoard, ENDED
+
+START = date(2025, 12, 19) # Friday
+CHRISTMAS = date(2025, 12, 25).toordinal()
+
+
+def brute_force_count(start, end, holidays):
+    day, count = start, 0
+    while day < end:
+        if day.weekday() < 5 and day.toordinal() not in holidays:
+            count += 1
+        day += timedelta(days=1)
+    return count
+
+
+class TestHolidayCalendar(unittest.TestCase):
+    def test_count_matches_brute_force(self):
+        calendar = HolidayCalendar([CHRISTMAS, date(2025, 12, 27).toordinal()]) # 27th is a Saturday
+        self.assertEqual(len(calendar), 1)
+        for offset in range(0, 40):
+            end = START + timedelta(days=offset)
+            self.assertEqual(calendar.count(START.toordinal(), end.toordinal()),
+                             brute_force_count(START, end, {CHRISTMAS}), end)
+
+    @unittest.skipIf(business_days.load_numpy() is None, "NumPy is not installed")
+    def test_count_many_matches_scalar_count(self):
+        np = business_days.load_numpy()
+        calendar = HolidayCalendar([CHRISTMAS])
+        ends = np.arange(START.toordinal(), START.toordinal() + 40, dtype=np.int64)
+        expected = [calendar.count(START.toordinal(), int(end)) for end in ends]
+        self.assertEqual(calendar.count_many(START.toordinal(), ends).tolist(), expected)
+
+    def test_load_is_cached_until_file_changes(self):
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "holidays.json")
+            with open(path, 'w') as f:
+                json.dump({"holidays": ["2025-12-25"]}, f)
+            first = load_holiday_calendar(path)
+            self.assertIs(load_holiday_calendar(path), first)
+            with open(path, 'w') as f:
+                json.dump(["2025-12-25", "2025-12-26"], f)
+            os.utime(path, (0, os.path.getmtime(path) + 10))
+            self.assertEqual(len(load_holiday_calendar(path)), 2)
+            self.assertEqual(len(load_holiday_calendar(os.path.join(tmp_dir, "missing.json"))), 0)
+
+
+class TestBusinessDayBoardRows(unittest.TestCase):
+    def check_board(self, use_numpy):
+        board = CountdownBoard(use_numpy=use_numpy)
+        board.set_calendar(HolidayCalendar([CHRISTMAS]))
+        end = (START + timedelta(days=10)).toordinal()
+        board.set("work", end, business_days=True)
+        board.set("calendar", end)
+        board.set("past", START.toordinal() - 1, business_days=True)
+        diff = board.refresh(START.toordinal())
+        self.assertEqual(dict(diff.changed), {"work": 5, "calendar": 10, "past": ENDED})
+        self.assertEqual(dict(board.refresh(START.toordinal() + 1).changed), {"work": 4, "calendar": 9})
+        # Saturday to Sunday: the working-day count does not move, so it is not reported
+        self.assertEqual(dict(board.refresh(START.toordinal() + 2).changed), {"calendar": 8})
+
+    def test_pure_python(self):
+        self.check_board(use_numpy=False)
+
+    @unittest.skipIf(business_days.load_numpy() is None, "NumPy is not installed")
+    def test_numpy(self):
+        self.check_board(use_numpy=True)
+
+
+if __name__ == '__main__':
+    unittest.main()
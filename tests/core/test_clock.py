@@ -0,0 +1,50 @@
+import unittest
+from datetime import date, datetime, timedelta
+
+from src.core.clock import SimulatedClock
+from src.core.countdown import ENDED, CountdownBoard
+from src.core.expiry_scheduler import ExpiryScheduler
+
+START = datetime(2025, 1, 1, 9, 0, 0)
+
+
+class TestSimulatedClock(unittest.TestCase):
+    def test_advance_notifies_listeners(self):
+        clock = SimulatedClock(START)
+        seen = []
+        clock.subscribe(lambda: seen.append(clock.now()))
+        clock.advance(days=1, hours=2)
+        clock.advance(timedelta(minutes=5))
+        self.assertEqual(seen, [START + timedelta(days=1, hours=2), START + timedelta(days=1, hours=2, minutes=5)])
+        self.assertEqual(clock.today(), date(2025, 1, 2))
+
+    def test_replay_stops_exactly_at_the_end(self):
+        clock = SimulatedClock(START)
+        steps = clock.replay(START + timedelta(hours=10), timedelta(hours=4))
+        self.assertEqual(steps, 3)
+        self.assertEqual(clock.now(), START + timedelta(hours=10))
+
+    def test_year_of_daily_ticks_over_a_large_board(self):
+        # Every timer counts down to zero and then ends; each expiry fires exactly once
+        clock = SimulatedClock(START)
+        board = CountdownBoard()
+        scheduler = ExpiryScheduler(lead_days=())
+        count = 2000
+        for i in range(count):
+            end = datetime.combine(START.date() + timedelta(days=1 + i % 365), datetime.min.time())
+            board.set(f"t{i}", end.toordinal())
+            scheduler.schedule(f"t{i}", end, clock.now())
+        board.refresh(clock.today().toordinal())
+        fired = []
+
+        def tick():
+            fired.extend(scheduler.pop_due(clock.now()))
+            board.refresh(clock.today().toordinal())
+
+        clock.replay(START + timedelta(days=366), timedelta(days=1), tick)
+        self.assertEqual(len(fired), count)
+        self.assertTrue(all(board.value(f"t{i}") == ENDED for i in range(count)))
+
+
+if __name__ == '__main__':
+    unittest.main()
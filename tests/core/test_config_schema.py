@@ -0,0 +1,96 @@
+import unittest
+
+from src.core.config_schema import QUARANTINE_KEY, SCHEMA_VERSION, SCHEMA_VERSION_KEY, normalize_document, normalize_end_date, normalize_timer_config
+
+DEFAULTS = {
+    "default_bg_color_title": "#696969",
+    "default_bg_color_time": "#D3D3D3",
+    "default_time_text_color": "#000000",
+    "default_time_font_size": 48,
+}
+
+
+class TestNormalizeDocument(unittest.TestCase):
+    def test_v1_document_is_migrated_and_completed(self):
+        data = {
+            "global_settings": {"default_time_font_size": 30},
+            "timers": {
+                "a": {"title": "New", "end_date": "2025-07-24 00:00:00", "time_text_color": "#FF0000", "sort_order": 2},
+                "b": {"title": "Edited", "end_date": "2025-07-25", "text_color_time": None,
+                      "set_default_font_size": False, "remember_window_position": True, "group": "  "},
+                "bad": {"title": "Broken", "end_date": "someday"},
+            },
+        }
+        settings, timers, changed, quarantined = normalize_document(data, DEFAULTS)
+        self.assertTrue(changed)
+        self.assertEqual(settings["default_time_font_size"], 30)
+        self.assertEqual(set(timers), {"a", "b"})
+        self.assertEqual(quarantined, {"bad": {"title": "Broken", "end_date": "someday"}})
+        self.assertEqual(timers["a"]["text_color_time"], "#FF0000")
+        self.assertNotIn("time_text_color", timers["a"])
+        self.assertEqual(timers["b"], {
+            "title": "Edited", "end_date": "2025-07-25 00:00:00", "comment": "", "text_color_time": "#000000",
+            "bg_color_title": "#696969", "bg_color_time": "#D3D3D3", "font_size_time": 30, "sort_order": 3,
+        })
+
+    def test_current_document_round_trips_unchanged(self):
+        data = {"global_settings": {}, "timers": {"a": {"title": "x", "end_date": "2025-07-24"}}}
+        _, timers, _, _ = normalize_document(data, DEFAULTS)
+        saved = {SCHEMA_VERSION_KEY: SCHEMA_VERSION, "global_settings": {}, "timers": timers}
+        _, timers_again, changed, _ = normalize_document(saved, DEFAULTS)
+        self.assertFalse(changed)
+        self.assertEqual(timers_again, timers)
+
+    def test_quarantined_records_are_kept_across_loads(self):
+        data = {SCHEMA_VERSION_KEY: SCHEMA_VERSION, "global_settings": {}, "timers": {"c": "not a record"},
+                QUARANTINE_KEY: {"bad": {"end_date": "someday"}}}
+        _, timers, changed, quarantined = normalize_document(data, DEFAULTS)
+        self.assertTrue(changed)
+        self.assertEqual(timers, {})
+        self.assertEqual(quarantined, {"bad": {"end_date": "someday"}, "c": "not a record"})
+
+    def test_end_date_keeps_its_time_of_day(self):
+        self.assertEqual(normalize_end_date("2025-07-24"), "2025-07-24 00:00:00")
+        self.assertEqual(normalize_end_date("2025-07-24T15:30"), "2025-07-24 15:30:00")
+        self.assertEqual(normalize_end_date("2025-07-24 15:30:45"), "2025-07-24 15:30:45")
+        self.assertIsNone(normalize_end_date("2025-07-24 25:00:00"))
+
+    def test_reminder_lead_days_must_be_whole_days(self):
+        for bad in ("7", [-1], [True], [1.5], None):
+            data = {SCHEMA_VERSION_KEY: SCHEMA_VERSION, "global_settings": {"reminder_lead_days": bad}, "timers": {}}
+            global_settings, _, changed, _ = normalize_document(data, DEFAULTS)
+            self.assertEqual(global_settings["reminder_lead_days"], [7, 1])
+            self.assertTrue(changed)
+        data = {SCHEMA_VERSION_KEY: SCHEMA_VERSION, "global_settings": {"reminder_lead_days": [3, 0]}, "timers": {}}
+        global_settings, _, changed, _ = normalize_document(data, DEFAULTS)
+        self.assertEqual(global_settings["reminder_lead_days"], [3, 0])
+        self.assertFalse(changed)
+
+    def test_snapshot_and_cache_sizes_must_be_positive_numbers(self):
+        defaults = dict(DEFAULTS, snapshot_keep_chains=5, card_render_cache_mb=16)
+        for bad in ("abc", -5, 0, True, None):
+            settings = {"snapshot_keep_chains": bad, "card_render_cache_mb": bad}
+            data = {SCHEMA_VERSION_KEY: SCHEMA_VERSION, "global_settings": settings, "timers": {}}
+            global_settings, _, changed, _ = normalize_document(data, defaults)
+            self.assertEqual((global_settings["snapshot_keep_chains"], global_settings["card_render_cache_mb"]), (5, 16))
+            self.assertTrue(changed)
+        data = {SCHEMA_VERSION_KEY: SCHEMA_VERSION, "global_settings": {"snapshot_keep_chains": 2.5, "card_render_cache_mb": float("inf")}, "timers": {}}
+        global_settings, _, _, _ = normalize_document(data, DEFAULTS) # Defaults without these keys
+        self.assertEqual(global_settings["snapshot_keep_chains"], 5)
+        self.assertNotIn("card_render_cache_mb", global_settings)
+        data = {SCHEMA_VERSION_KEY: SCHEMA_VERSION, "global_settings": {"snapshot_keep_chains": 3, "card_render_cache_mb": 0.5}, "timers": {}}
+        global_settings, _, changed, _ = normalize_document(data, defaults)
+        self.assertEqual((global_settings["snapshot_keep_chains"], global_settings["card_render_cache_mb"]), (3, 0.5))
+        self.assertFalse(changed)
+
+    def test_edit_drops_dialog_flags_and_default_recurrence(self):
+        config = {"title": "x", "end_date": "2025-07-24 00:00:00", "recurrence": None, "count_mode": "calendar",
+                  "set_default_time_color": True}
+        self.assertTrue(normalize_timer_config(config, DEFAULTS))
+        for key in ("recurrence", "count_mode", "set_default_time_color"):
+            self.assertNotIn(key, config)
+        self.assertIsNone(normalize_timer_config({"end_date": None}, DEFAULTS))
+
+
+if __name__ == '__main__':
+    unittest.main()
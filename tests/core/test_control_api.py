@@ -0,0 +1,77 @@
+import itertools
+import unittest
+
+from src.core.control_api import apply_commands, parse_command, prepare_commands
+
+DEFAULTS = {
+    "default_bg_color_title": "#111111",
+    "default_bg_color_time": "#222222",
+    "default_time_text_color": "#FFFFFF",
+    "default_time_font_size": 20,
+}
+
+
+def record(title, sort_order, **fields):
+    config = {"title": title, "end_date": "2030-01-01 00:00:00", "comment": "", "bg_color_title": "#111111",
+              "bg_color_time": "#222222", "text_color_time": "#FFFFFF", "font_size_time": 20, "sort_order": sort_order}
+    config.update(fields)
+    return config
+
+
+class TestControlApi(unittest.TestCase):
+    def setUp(self):
+        self.records = {"timer_a": record("A", 0), "timer_b": record("B", 1)}
+        counter = itertools.count()
+        self.new_id = lambda: f"timer_new{next(counter)}"
+
+    def run_batch(self, *commands):
+        commands = [dict(c) for c in commands]
+        prepare_commands(commands, self.records, self.new_id)
+        return apply_commands(commands, self.records, DEFAULTS)
+
+    def test_upsert_creates_normalized_timer_at_the_end(self):
+        result = self.run_batch({"op": "upsert", "ref": 7, "timer": {"title": "C", "end_date": "2031-02-03"}})
+        self.assertEqual(result.replies, [{"ok": True, "ref": 7, "id": "timer_new0"}])
+        created = self.records["timer_new0"]
+        self.assertEqual(created["end_date"], "2031-02-03 00:00:00")
+        self.assertEqual(created["sort_order"], 2)
+        self.assertEqual(created["bg_color_title"], "#111111")
+        self.assertEqual(result.created, ["timer_new0"])
+
+    def test_upsert_edits_keep_the_shared_record(self):
+        shared = self.records["timer_a"]
+        result = self.run_batch({"op": "upsert", "id": "timer_a", "timer": {"title": "Renamed"}},
+                                {"op": "upsert", "id": "timer_b", "timer": {"title": "B"}})
+        self.assertIs(self.records["timer_a"], shared)
+        self.assertEqual(shared["title"], "Renamed")
+        self.assertEqual(result.updated, {"timer_a": {"title"}}) # timer_b was unchanged
+
+    def test_invalid_commands_fail_alone(self):
+        result = self.run_batch(parse_command(b"{not json"),
+                                {"op": "upsert", "timer": {"end_date": "soon"}},
+                                {"op": "upsert", "id": "timer_a", "timer": {"colour": "red"}},
+                                {"op": "delete", "id": "timer_missing"},
+                                {"op": "delete", "id": "timer_b"})
+        self.assertEqual([reply["ok"] for reply in result.replies], [False, False, False, False, True])
+        self.assertEqual(set(self.records), {"timer_a"})
+        self.assertEqual(result.deleted, {"timer_b"})
+
+    def test_reorder_and_group_changes_report_their_fields(self):
+        result = self.run_batch({"op": "reorder", "ids": ["timer_b"]})
+        self.assertEqual(result.updated, {"timer_a": {"sort_order"}, "timer_b": {"sort_order"}})
+        self.assertEqual((self.records["timer_b"]["sort_order"], self.records["timer_a"]["sort_order"]), (0, 1))
+        result = self.run_batch({"op": "upsert", "id": "timer_a", "timer": {"group": "Work"}})
+        self.assertEqual(result.updated, {"timer_a": {"group"}})
+        result = self.run_batch({"op": "upsert", "id": "timer_a", "timer": {"group": None}})
+        self.assertNotIn("group", self.records["timer_a"])
+
+    def test_created_then_deleted_in_one_batch_leaves_no_trace(self):
+        result = self.run_batch({"op": "upsert", "id": "timer_tmp", "timer": {"end_date": "2030-05-05"}},
+                                {"op": "delete", "id": "timer_tmp"},
+                                {"op": "list"})
+        self.assertEqual(result.changed_ids(), set())
+        self.assertEqual(set(result.replies[2]["timers"]), {"timer_a", "timer_b"})
+
+
+if __name__ == '__main__':
+    unittest.main()
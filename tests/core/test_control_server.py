@@ -0,0 +1,52 @@
+import json
+import os
+import socket
+import tempfile
+import unittest
+from concurrent.futures import Future
+
+from src.core.control_server import ControlServer, parse_address
+
+
+class TestParseAddress(unittest.TestCase):
+    def test_forms(self):
+        self.assertEqual(parse_address("/tmp/x.sock"), ("unix", "/tmp/x.sock"))
+        self.assertEqual(parse_address("tcp:4000"), ("tcp", "127.0.0.1", 4000))
+        self.assertEqual(parse_address("tcp:[::1]:4000"), ("tcp", "::1", 4000))
+        with self.assertRaises(ValueError):
+            parse_address("tcp:0.0.0.0:4000")
+
+
+@unittest.skipUnless(hasattr(socket, "AF_UNIX"), "needs Unix sockets")
+class TestControlServer(unittest.TestCase):
+    def test_lines_of_one_write_arrive_as_one_batch(self):
+        batches = []
+
+        def submit(commands):
+            batches.append(commands)
+            future = Future()
+            future.set_result([json.dumps({"ok": True, "op": c.get("op")}) for c in commands])
+            return future
+
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "control.sock")
+            server = ControlServer(path, submit)
+            self.assertTrue(server.start(), server.error)
+            try:
+                with socket.socket(socket.AF_UNIX) as client:
+                    client.connect(path)
+                    client.sendall(b'{"op": "list"}\n{"op": "delete"}\n{"op": "reorder"}')
+                    client.shutdown(socket.SHUT_WR) # The last line needs no newline
+                    data = b""
+                    while chunk := client.recv(4096):
+                        data += chunk
+            finally:
+                server.stop()
+            self.assertFalse(os.path.exists(path))
+        self.assertEqual([len(batch) for batch in batches], [2, 1])
+        replies = [json.loads(line) for line in data.decode().splitlines()]
+        self.assertEqual([reply["op"] for reply in replies], ["list", "delete", "reorder"])
+
+
+if __name__ == '__main__':
+    unittest.main()
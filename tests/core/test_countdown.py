@@ -0,0 +1,80 @@
+import unittest
+from datetime import date
+
+from src.core.business_days import load_numpy
+from src.core.countdown import CountdownBoard, ENDED, end_date_ordinal, format_countdown
+
+TODAY = date(2025, 6, 1).toordinal()
+
+
+class CountdownBoardTests:
+    use_numpy = False
+
+    def make_board(self):
+        return CountdownBoard(use_numpy=self.use_numpy)
+
+    def test_first_refresh_reports_every_row(self):
+        board = self.make_board()
+        board.set("a", TODAY + 3)
+        board.set("b", TODAY - 1)
+        diff = board.refresh(TODAY)
+        self.assertEqual(sorted(diff.changed), [("a", 3), ("b", ENDED)])
+        self.assertEqual(diff.ended, []) # Already ended on load is not a transition
+
+    def test_same_day_refresh_is_empty_until_rows_change(self):
+        board = self.make_board()
+        board.set("a", TODAY + 3)
+        board.refresh(TODAY)
+        self.assertFalse(board.refresh(TODAY))
+        board.set("a", TODAY + 5)
+        self.assertEqual(board.refresh(TODAY).changed, [("a", 5)])
+
+    def test_rollover_reports_changes_and_newly_ended(self):
+        board = self.make_board()
+        board.set("a", TODAY)
+        board.set("b", TODAY + 10)
+        board.refresh(TODAY)
+        diff = board.refresh(TODAY + 1)
+        self.assertEqual(sorted(diff.changed), [("a", ENDED), ("b", 9)])
+        self.assertEqual(diff.ended, ["a"])
+
+    def test_remove_swaps_last_row_into_place(self):
+        board = self.make_board()
+        for i, card_id in enumerate("abc"):
+            board.set(card_id, TODAY + i)
+        board.refresh(TODAY)
+        board.remove("a")
+        self.assertNotIn("a", board)
+        self.assertEqual(len(board), 2)
+        self.assertEqual(board.value("c"), 2)
+        self.assertEqual(sorted(board.refresh(TODAY + 1).changed), [("b", 0), ("c", 1)])
+
+    def test_ended_row_given_a_recurrence_rolls_over(self):
+        board = self.make_board()
+        board.set("a", TODAY - 2)
+        board.refresh(TODAY)
+        board.set("a", TODAY - 2, lambda today: TODAY + 363) # Now yearly
+        diff = board.refresh(TODAY)
+        self.assertEqual(diff.changed, [("a", 363)])
+        self.assertEqual(diff.ended, [])
+        self.assertEqual(board.refresh(TODAY + 1).changed, [("a", 362)])
+
+
+class TestCountdownBoardPurePython(CountdownBoardTests, unittest.TestCase):
+    use_numpy = False
+
+
+@unittest.skipIf(load_numpy() is None, "NumPy is not installed")
+class TestCountdownBoardNumpy(CountdownBoardTests, unittest.TestCase):
+    use_numpy = True
+
+
+class TestHelpers(unittest.TestCase):
+    def test_end_date_ordinal_and_format(self):
+        self.assertEqual(end_date_ordinal("2025-07-24 00:00:00"), date(2025, 7, 24).toordinal())
+        self.assertEqual(format_countdown(ENDED), "Ended")
+        self.assertEqual(format_countdown(0), "0")
+
+
+if __name__ == '__main__':
+    unittest.main()
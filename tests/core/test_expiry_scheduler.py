@@ -0,0 +1,42 @@
+import unittest
+from datetime import datetime, timedelta
+
+from src.core.expiry_scheduler import ExpiryScheduler
+
+NOW = datetime(2025, 6, 1, 12, 0, 0)
+
+
+class TestExpiryScheduler(unittest.TestCase):
+    def test_reminders_and_expiry_fire_in_order(self):
+        scheduler = ExpiryScheduler(lead_days=(7, 1))
+        end = datetime(2025, 6, 10)
+        scheduler.schedule("a", end, NOW)
+        self.assertEqual(scheduler.next_fire_time(), end - timedelta(days=7))
+        self.assertEqual(scheduler.pop_due(end - timedelta(days=1)), [("a", 7), ("a", 1)])
+        self.assertEqual(scheduler.next_fire_time(), end)
+        self.assertEqual(scheduler.pop_due(end), [("a", 0)])
+        self.assertIsNone(scheduler.next_fire_time())
+
+    def test_past_entries_are_not_scheduled(self):
+        scheduler = ExpiryScheduler(lead_days=(7,))
+        scheduler.schedule("a", NOW + timedelta(days=2), NOW) # 7-day reminder already passed
+        self.assertEqual(scheduler.pop_due(NOW + timedelta(days=30)), [("a", 0)])
+
+    def test_reschedule_and_unschedule_drop_stale_entries(self):
+        scheduler = ExpiryScheduler(lead_days=())
+        scheduler.schedule("a", NOW + timedelta(days=1), NOW)
+        scheduler.schedule("b", NOW + timedelta(days=2), NOW)
+        scheduler.schedule("a", NOW + timedelta(days=5), NOW)
+        scheduler.unschedule("b")
+        self.assertEqual(scheduler.next_fire_time(), NOW + timedelta(days=5))
+        self.assertEqual(scheduler.pop_due(NOW + timedelta(days=10)), [("a", 0)])
+
+    def test_set_lead_days_rebuilds_from_end_times(self):
+        scheduler = ExpiryScheduler(lead_days=())
+        scheduler.schedule("a", NOW + timedelta(days=10), NOW)
+        scheduler.set_lead_days([3], NOW)
+        self.assertEqual(scheduler.next_fire_time(), NOW + timedelta(days=7))
+
+
+if __name__ == '__main__':
+    unittest.main()
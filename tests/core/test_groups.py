@@ -0,0 +1,62 @@
+import unittest
+from datetime import date
+
+from src.core.business_days import HolidayCalendar
+from src.core.countdown import ENDED
+from src.core.groups import group_of, nearest_timers, ordered_groups, split_by_group, summarize_group
+
+TODAY = date(2025, 12, 19).toordinal() # Friday
+
+
+def timer(days, group=None, **extra):
+    config = {"end_date": date.fromordinal(TODAY + days).strftime("%Y-%m-%d 00:00:00")}
+    if group is not None:
+        config["group"] = group
+    config.update(extra)
+    return config
+
+
+class TestGrouping(unittest.TestCase):
+    def test_configured_order_then_unlisted_groups_by_name(self):
+        configs = {"a": timer(1, "work"), "b": timer(1, "Home"), "c": timer(1), "d": timer(1, "  ")}
+        self.assertEqual(ordered_groups(["Trips", "work", "Trips"], configs), ["Trips", "work", "Home"])
+        self.assertEqual(group_of(configs["d"]), "")
+
+    def test_split_keeps_display_order(self):
+        items = [("a", timer(1, "x")), ("b", timer(1)), ("c", timer(1, "x"))]
+        self.assertEqual({g: [i for i, _ in pairs] for g, pairs in split_by_group(items).items()},
+                         {"x": ["a", "c"], "": ["b"]})
+
+
+class TestGroupSummary(unittest.TestCase):
+    def test_nearest_running_timer(self):
+        summary = summarize_group([timer(-2), timer(9), timer(4)], TODAY)
+        self.assertEqual((summary.count, summary.nearest), (3, 4))
+
+    def test_all_ended_and_empty(self):
+        self.assertEqual(summarize_group([timer(-1)], TODAY).nearest, ENDED)
+        self.assertIsNone(summarize_group([], TODAY).nearest)
+
+    def test_recurring_and_business_day_timers_match_board_values(self):
+        recurring = timer(-10, recurrence={"freq": "weekly"}) # Next occurrence is in 4 days
+        self.assertEqual(summarize_group([recurring], TODAY).nearest, 4)
+        business = timer(10, count_mode="business")
+        calendar = HolidayCalendar([date(2025, 12, 25).toordinal()])
+        self.assertEqual(summarize_group([business], TODAY, calendar, "business").nearest, 5)
+
+
+
+class TestNearestTimers(unittest.TestCase):
+    def test_soonest_running_timers_first(self):
+        configs = {"a": timer(9), "b": timer(-1), "c": timer(2), "d": timer(0), "e": {"title": "no date"}}
+        self.assertEqual(nearest_timers(configs, TODAY, 2), [(0, "d"), (2, "c")])
+        self.assertEqual(nearest_timers(configs, TODAY, 10), [(0, "d"), (2, "c"), (9, "a")])
+
+    def test_recurring_and_business_day_timers(self):
+        configs = {"weekly": timer(-10, recurrence={"freq": "weekly"}), "work": timer(10, count_mode="business")}
+        calendar = HolidayCalendar([date(2025, 12, 25).toordinal()])
+        self.assertEqual(nearest_timers(configs, TODAY, 2, calendar, "business"), [(4, "weekly"), (5, "work")])
+
+
+if __name__ == '__main__':
+    unittest.main()
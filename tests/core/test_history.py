@@ -0,0 +1,95 @@
+import unittest
+
+from src.core.history import UndoHistory
+
+
+def board():
+    return {
+        "a": {"title": "A", "sort_order": 0},
+        "b": {"title": "B", "sort_order": 1, "group": "Work"},
+    }
+
+
+class TestUndoHistory(unittest.TestCase):
+    def setUp(self):
+        self.records = board()
+        self.settings = {"groups": ["Work"]}
+        self.history = UndoHistory()
+
+    def change(self, label, card_ids, mutate, settings_keys=()):
+        snapshot = self.history.snapshot(self.records, card_ids, self.settings, settings_keys)
+        mutate()
+        return self.history.record(label, snapshot, self.records, self.settings)
+
+    def test_edit_stores_only_changed_fields(self):
+        def edit():
+            self.records["b"]["title"] = "Renamed"
+            del self.records["b"]["group"]
+        step = self.change("Edit", ["a", "b"], edit)
+        self.assertEqual(list(step.changed), ["b"])
+        self.assertEqual(set(step.changed["b"]), {"title", "group"})
+        self.assertEqual(step.changed["b"]["title"], ("B", "Renamed"))
+        self.history.undo(self.records, self.settings)
+        self.assertEqual(self.records, board())
+        self.history.redo(self.records, self.settings)
+        self.assertEqual(self.records["b"], {"title": "Renamed", "sort_order": 1})
+
+    def test_add_delete_and_settings_round_trip(self):
+        self.change("Add", ["c"], lambda: self.records.update(c={"title": "C", "sort_order": 2}))
+        self.change("Delete", ["a"], lambda: self.records.pop("a"))
+        self.change("New Group", [], lambda: self.settings.update(groups=["Work", "Home"]), ("groups",))
+        self.assertEqual(self.history.undo_label(), "New Group")
+
+        for _ in range(3):
+            self.history.undo(self.records, self.settings)
+        self.assertEqual(self.records, board())
+        self.assertEqual(self.settings, {"groups": ["Work"]})
+        self.assertIsNone(self.history.undo(self.records, self.settings))
+
+        self.history.redo(self.records, self.settings)
+        self.history.redo(self.records, self.settings)
+        self.assertEqual(sorted(self.records), ["b", "c"])
+        self.assertEqual(self.history.redo_label(), "New Group")
+
+    def test_restored_records_are_not_shared_with_history(self):
+        self.change("Delete", ["a"], lambda: self.records.pop("a"))
+        self.history.undo(self.records, self.settings)
+        self.records["a"]["title"] = "Changed after undo"
+        self.history.redo(self.records, self.settings)
+        self.history.undo(self.records, self.settings)
+        self.assertEqual(self.records["a"]["title"], "A")
+
+    def test_no_op_is_not_recorded_and_new_step_clears_redo(self):
+        self.assertIsNone(self.change("Nothing", ["a"], lambda: None))
+        self.change("Edit", ["a"], lambda: self.records["a"].update(title="X"))
+        self.history.undo(self.records, self.settings)
+        self.change("Other", ["b"], lambda: self.records["b"].update(title="Y"))
+        self.assertIsNone(self.history.redo_label())
+
+    def test_forgotten_records_leave_every_step(self):
+        def rename_both():
+            self.records["a"]["title"] = "A2"
+            self.records["b"]["title"] = "B2"
+        self.change("Rename Both", ["a", "b"], rename_both)
+        self.change("Rename A", ["a"], lambda: self.records["a"].update(title="A3"))
+        self.change("Delete A", ["a"], lambda: self.records.pop("a"))
+        self.history.undo(self.records, self.settings) # "Delete A" waits on the redo stack
+        self.records.pop("a") # Archived, outside the history
+        self.history.forget(["a"])
+        self.assertIsNone(self.history.redo_label())
+        self.assertEqual(self.history.undo_label(), "Rename Both")
+        self.history.undo(self.records, self.settings)
+        self.assertEqual(self.records, {"b": board()["b"]})
+        self.assertIsNone(self.history.undo(self.records, self.settings))
+
+    def test_limit_drops_oldest_steps(self):
+        history = UndoHistory(limit=2)
+        for title in ("1", "2", "3"):
+            snapshot = history.snapshot(self.records, ["a"])
+            self.records["a"]["title"] = title
+            history.record(title, snapshot, self.records)
+        self.assertEqual([step.label for step in history.undo_stack], ["2", "3"])
+
+
+if __name__ == '__main__':
+    unittest.main()
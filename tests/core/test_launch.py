@@ -0,0 +1,56 @@
+import json
+import os
+import tempfile
+import unittest
+
+from src.core.launch import imported_timers, parse_launch_args, timer_commands
+
+
+class TestParseLaunchArgs(unittest.TestCase):
+    def test_plain_launch_shows_the_window(self):
+        self.assertEqual(parse_launch_args([]), ([{"op": "show"}], []))
+
+    def test_tray_adds_and_imports(self):
+        commands, qt_args = parse_launch_args(["--tray", "--add", "A", "--add", "B", "--end", "2026-12-01", "--import", "t.json"])
+        self.assertEqual(qt_args, [])
+        self.assertEqual(commands[:3], [{"op": "tray"}, {"op": "add", "title": "A", "end_date": "2026-12-01"},
+                                        {"op": "add", "title": "B", "end_date": "2026-12-01"}])
+        self.assertEqual(commands[3], {"op": "import", "path": os.path.abspath("t.json")})
+
+    def test_qt_options_are_left_for_qt(self):
+        commands, qt_args = parse_launch_args(["-platform", "offscreen", "--add", "A", "-style", "fusion"])
+        self.assertEqual(commands, [{"op": "show"}, {"op": "add", "title": "A"}])
+        self.assertEqual(qt_args, ["-platform", "offscreen", "-style", "fusion"])
+
+
+class TestTimerCommands(unittest.TestCase):
+    def test_add_defaults_its_end_date(self):
+        self.assertEqual(timer_commands({"op": "add", "title": "A"}, "2026-01-02 00:00:00"),
+                         [{"op": "upsert", "timer": {"title": "A", "end_date": "2026-01-02 00:00:00"}}])
+
+    def test_import_file_forms(self):
+        timer = {"title": "A", "end_date": "2026-12-01", "sort_order": 4, "extra": 1}
+        expected = [{"title": "A", "end_date": "2026-12-01"}]
+        self.assertEqual(imported_timers([timer]), expected)
+        self.assertEqual(imported_timers({"timer_a": timer}), expected)
+        self.assertEqual(imported_timers({"global_settings": {}, "timers": {"timer_a": timer}}), expected)
+        self.assertEqual(imported_timers(timer), expected)
+        with self.assertRaises(ValueError):
+            imported_timers("nope")
+
+    def test_unreadable_import_file(self):
+        with tempfile.TemporaryDirectory() as temp_dir:
+            path = os.path.join(temp_dir, "timers.json")
+            with open(path, 'w') as f:
+                f.write("{not json")
+            with self.assertRaises(ValueError):
+                timer_commands({"op": "import", "path": path}, None)
+            with open(path, 'w') as f:
+                json.dump([{"title": "A", "end_date": "2026-12-01"}], f)
+            self.assertEqual(len(timer_commands({"op": "import", "path": path}, None)), 1)
+            with self.assertRaises(ValueError):
+                timer_commands({"op": "import", "path": os.path.join(temp_dir, "missing.json")}, None)
+
+
+if __name__ == '__main__':
+    unittest.main()
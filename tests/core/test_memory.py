@@ -0,0 +1,84 @@
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen") # Run without a display
+
+from PySide6.QtWidgets import QApplication
+
+from src import main_app
+from src.core.clock import SimulatedClock
+from src.core.memory import deep_sizeof, memory_report
+
+
+def timers(count):
+    return {f"timer_{i}": {"title": f"Timer {i}", "end_date": "2025-06-01 00:00:00", "sort_order": i} for i in range(count)}
+
+
+class TestDeepSizeof(unittest.TestCase):
+    def test_nested_values_add_to_the_size(self):
+        flat = {"title": "x"}
+        nested = {"title": "x", "recurrence": {"freq": "yearly", "interval": 1}}
+        self.assertGreater(deep_sizeof(nested), deep_sizeof(flat))
+        self.assertGreater(deep_sizeof(["a", "b"]), deep_sizeof([]))
+
+
+class TestMemoryReport(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.qt_app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.original_config_file = main_app.CONFIG_FILE
+        self.original_holiday_file = main_app.HOLIDAY_FILE
+        main_app.CONFIG_FILE = os.path.join(self.temp_dir, "timers_config.json")
+        main_app.HOLIDAY_FILE = os.path.join(self.temp_dir, "holidays.json") # None there: no local holidays
+        self.windows = []
+
+    def tearDown(self):
+        for window in self.windows:
+            window.close()
+            window.deleteLater()
+        self.qt_app.processEvents()
+        main_app.CONFIG_FILE = self.original_config_file
+        main_app.HOLIDAY_FILE = self.original_holiday_file
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def make_app(self, count):
+        with open(main_app.CONFIG_FILE, 'w') as f:
+            json.dump({"global_settings": {}, "timers": timers(count)}, f)
+        window = main_app.App(clock=SimulatedClock(datetime(2025, 3, 1, 9, 30)))
+        self.windows.append(window)
+        return window
+
+    def test_report_counts_each_timer(self):
+        window = self.make_app(3)
+        report = memory_report(window)
+        self.assertEqual(report["timers"], 3)
+        self.assertEqual(set(report["per_timer"]), {"timer_0", "timer_1", "timer_2"})
+        for entry in report["per_timer"].values():
+            self.assertGreater(entry["qobjects"], 1) # The card and its child widgets
+            self.assertGreater(entry["config_bytes"], 0)
+        self.assertEqual(report["qobjects_total"], sum(entry["qobjects"] for entry in report["per_timer"].values()))
+        self.assertEqual(report["qobjects_per_timer"], report["qobjects_total"] / 3)
+        self.assertGreaterEqual(report["config_bytes_total"], sum(entry["config_bytes"] for entry in report["per_timer"].values()))
+        self.assertNotIn("rebuild", report)
+
+    def test_empty_board_reports_zero_per_timer(self):
+        report = memory_report(self.make_app(0), measure_rebuild=True)
+        self.assertEqual(report["timers"], 0)
+        self.assertEqual(report["qobjects_per_timer"], 0.0)
+        self.assertEqual(report["rebuild"]["bytes_per_timer"], 0.0)
+
+    def test_rebuild_cost_grows_with_the_number_of_timers(self):
+        small = memory_report(self.make_app(5), measure_rebuild=True)["rebuild"]
+        large = memory_report(self.make_app(40), measure_rebuild=True)["rebuild"]
+        self.assertEqual((small["cards"], large["cards"]), (5, 40))
+        self.assertGreater(small["bytes_per_timer"], 0)
+        self.assertGreater(large["bytes_per_timer"], 0)
+        self.assertGreater(large["python_heap_bytes"], small["python_heap_bytes"])
+        self.assertEqual(large["bytes_per_timer"], large["python_heap_bytes"] / 40)
@@ -0,0 +1,47 @@
+import json
+import os
+import tempfile
+import unittest
+
+from src.core.metrics import Metrics, Histogram
+
+
+class TestHistogram(unittest.TestCase):
+    def test_observe_buckets_and_summary(self):
+        hist = Histogram(buckets=(1, 10))
+        for value in (0.5, 1, 5, 50):
+            hist.observe(value)
+        summary = hist.to_dict()
+        self.assertEqual(summary["count"], 4)
+        self.assertEqual(summary["min"], 0.5)
+        self.assertEqual(summary["max"], 50)
+        self.assertEqual(summary["buckets"], {"<=1": 2, "<=10": 1, ">10": 1})
+
+
+class TestMetrics(unittest.TestCase):
+    def test_counters_gauges_and_timed(self):
+        registry = Metrics()
+        registry.incr("tick.callbacks")
+        registry.incr("tick.callbacks", 2)
+        registry.set_gauge("cards.count", 7)
+        with registry.timed("save.latency_ms"):
+            pass
+        snapshot = registry.snapshot()
+        self.assertEqual(snapshot["counters"]["tick.callbacks"], 3)
+        self.assertEqual(snapshot["gauges"]["cards.count"], 7)
+        self.assertEqual(snapshot["histograms"]["save.latency_ms"]["count"], 1)
+
+    def test_dump_writes_json_and_reset_clears(self):
+        registry = Metrics()
+        registry.incr("save.count")
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            path = os.path.join(tmp_dir, "metrics.json")
+            registry.dump(path)
+            with open(path) as f:
+                self.assertEqual(json.load(f)["counters"], {"save.count": 1})
+        registry.reset()
+        self.assertEqual(registry.snapshot()["counters"], {})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,59 @@
+import unittest
+from datetime import date
+
+from src.core.countdown import CountdownBoard, ENDED
+from src.core.recurrence import next_occurrence, parse_rule, rollover_for
+
+
+def rule(freq, interval=1):
+    return parse_rule({"freq": freq, "interval": interval})
+
+
+class TestNextOccurrence(unittest.TestCase):
+    def test_before_anchor_returns_anchor(self):
+        self.assertEqual(next_occurrence(rule("yearly"), date(2025, 7, 24), date(2025, 1, 1)), date(2025, 7, 24))
+
+    def test_yearly_including_today_and_leap_day(self):
+        anchor = date(2025, 7, 24)
+        self.assertEqual(next_occurrence(rule("yearly"), anchor, date(2026, 7, 24)), date(2026, 7, 24))
+        self.assertEqual(next_occurrence(rule("yearly"), anchor, date(2026, 7, 25)), date(2027, 7, 24))
+        self.assertEqual(next_occurrence(rule("yearly"), date(2024, 2, 29), date(2024, 3, 1)), date(2025, 2, 28))
+        self.assertEqual(next_occurrence(rule("yearly", 2), anchor, date(2025, 8, 1)), date(2027, 7, 24))
+
+    def test_monthly_clamps_to_month_length(self):
+        anchor = date(2025, 1, 31)
+        self.assertEqual(next_occurrence(rule("monthly"), anchor, date(2025, 2, 1)), date(2025, 2, 28))
+        self.assertEqual(next_occurrence(rule("monthly"), anchor, date(2025, 3, 1)), date(2025, 3, 31))
+        self.assertEqual(next_occurrence(rule("monthly", 3), anchor, date(2025, 2, 1)), date(2025, 4, 30))
+
+    def test_weekly_and_every_n_days(self):
+        anchor = date(2025, 6, 2) # Monday
+        self.assertEqual(next_occurrence(rule("weekly"), anchor, date(2025, 6, 3)), date(2025, 6, 9))
+        self.assertEqual(next_occurrence(rule("daily", 10), anchor, date(2025, 6, 13)), date(2025, 6, 22))
+        self.assertEqual(next_occurrence(rule("daily", 10), anchor, date(2025, 6, 12)), date(2025, 6, 12))
+
+    def test_last_weekday_of_month(self):
+        anchor = date(2025, 6, 6) # Friday
+        self.assertEqual(next_occurrence(rule("last_weekday"), anchor, date(2025, 6, 1)), date(2025, 6, 27))
+        self.assertEqual(next_occurrence(rule("last_weekday"), anchor, date(2025, 6, 28)), date(2025, 7, 25))
+
+    def test_parse_rule_rejects_unknown(self):
+        self.assertIsNone(parse_rule(None))
+        self.assertIsNone(parse_rule({"freq": "hourly"}))
+        self.assertEqual(parse_rule({"freq": "weekly", "interval": "0"}), {"freq": "weekly", "interval": 1})
+
+
+class TestRecurringBoardRows(unittest.TestCase):
+    def test_passed_occurrence_rolls_forward_instead_of_ending(self):
+        anchor = date(2025, 7, 24)
+        board = CountdownBoard(use_numpy=False)
+        board.set("birthday", anchor.toordinal(), rollover_for({"freq": "yearly"}, anchor))
+        board.set("once", anchor.toordinal())
+        board.refresh(anchor.toordinal())
+        diff = board.refresh(anchor.toordinal() + 1)
+        self.assertEqual(dict(diff.changed), {"birthday": 364, "once": ENDED})
+        self.assertEqual(diff.ended, ["once"])
+
+
+if __name__ == '__main__':
+    unittest.main()
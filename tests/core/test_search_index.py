@@ -0,0 +1,52 @@
+import unittest
+
+from src.core.search_index import TimerSearchIndex, html_to_text
+
+COMMENT_HTML = ('<html><head><meta name="qrichtext" content="1" /><style type="text/css">p { margin: 0 }</style>'
+                '</head><body><p>Book the <b>dentist</b> &amp; pharmacy</p>'
+                '<img src="data:image/png;base64,iVBORw0KGgo=" /></body></html>')
+
+
+class TestHtmlToText(unittest.TestCase):
+    def test_strips_markup_styles_and_images(self):
+        text = html_to_text(COMMENT_HTML)
+        self.assertIn("dentist", text)
+        self.assertIn("& pharmacy", text)
+        self.assertNotIn("margin", text)
+        self.assertNotIn("base64", text)
+        self.assertEqual(html_to_text("plain <3 text"), "plain <3 text")
+
+
+class TestTimerSearchIndex(unittest.TestCase):
+    def setUp(self):
+        self.index = TimerSearchIndex()
+        self.index.rebuild({
+            "a": {"title": "Birthday", "comment": COMMENT_HTML},
+            "b": {"title": "Product launch", "comment": "Release day"},
+            "c": {"title": "Passport renewal", "comment": ""},
+        })
+
+    def test_title_and_comment_terms(self):
+        self.assertEqual(self.index.search("birth"), {"a"})
+        self.assertEqual(self.index.search("DENTIST"), {"a"})
+        self.assertEqual(self.index.search("re"), {"b", "c"}) # Short terms use a substring scan
+        self.assertEqual(self.index.search("release launch"), {"b"})
+        self.assertEqual(self.index.search("launch passport"), set())
+        self.assertIsNone(self.index.search("   "))
+
+    def test_trigram_candidates_are_verified(self):
+        # "day" and "ayb" both occur in "Birthday" but not as "dayb"
+        self.assertEqual(self.index.search("dayb"), set())
+
+    def test_incremental_update_and_remove(self):
+        self.index.update("c", "Dentist follow-up", "")
+        self.assertEqual(self.index.search("dentist"), {"a", "c"})
+        self.assertEqual(self.index.search("passport"), set())
+        self.index.remove("a")
+        self.assertEqual(self.index.search("dentist"), {"c"})
+        self.assertNotIn("a", self.index)
+        self.assertEqual(len(self.index), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import json
+import os
+import socket
+import tempfile
+import unittest
+from concurrent.futures import Future
+
+from src.core.control_server import ControlServer
+from src.core.single_instance import claim, forward
+
+
+@unittest.skipUnless(hasattr(socket, "AF_UNIX"), "needs Unix sockets")
+class TestSingleInstance(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.temp_dir.name, "data", "instance.sock")
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def test_second_claim_finds_the_first(self):
+        listener = claim(self.path)
+        try:
+            self.assertIsNotNone(listener)
+            self.assertIsNone(claim(self.path))
+        finally:
+            listener.close()
+
+    def test_socket_file_of_a_dead_instance_is_replaced(self):
+        claim(self.path).close() # Closed without removing its file, as after a crash
+        self.assertTrue(os.path.exists(self.path))
+        listener = claim(self.path)
+        self.assertIsNotNone(listener)
+        listener.close()
+
+    def test_forward_reaches_a_server_on_the_claimed_socket(self):
+        received = []
+
+        def submit(commands):
+            received.append(commands)
+            future = Future()
+            future.set_result([json.dumps({"ok": True}) for _ in commands])
+            return future
+
+        server = ControlServer(self.path, submit, sock=claim(self.path))
+        self.assertTrue(server.start(), server.error)
+        try:
+            replies = forward(self.path, [{"op": "show"}, {"op": "add", "title": "A"}])
+        finally:
+            server.stop()
+        self.assertEqual(replies, [{"ok": True}, {"ok": True}])
+        self.assertEqual(received, [[{"op": "show"}, {"op": "add", "title": "A"}]])
+        self.assertFalse(os.path.exists(self.path))
+
+    def test_forward_without_a_running_instance_fails(self):
+        with self.assertRaises(OSError):
+            forward(self.path, [{"op": "show"}], timeout=1.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
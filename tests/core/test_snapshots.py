@@ -0,0 +1,74 @@
+import json
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+
+from src.core.snapshots import SnapshotStore, apply_delta, document_delta, KIND_BASE, KIND_DELTA
+
+START = datetime(2025, 12, 19, 9, 0, 0)
+
+
+def document(titles, **settings):
+    return {"global_settings": dict(settings), "timers": {card_id: {"title": title} for card_id, title in titles.items()}}
+
+
+class TestDocumentDelta(unittest.TestCase):
+    def test_round_trip_holds_only_changes(self):
+        before = document({"a": "A", "b": "B", "c": "C"}, theme="dark", opacity=1.0)
+        after = document({"a": "A", "b": "B2", "d": "D"}, theme="dark")
+        delta = document_delta(before, after)
+        self.assertEqual(delta, {"settings_set": {}, "settings_unset": ["opacity"],
+                                 "timers_set": {"b": {"title": "B2"}, "d": {"title": "D"}},
+                                 "timers_removed": ["c"]})
+        self.assertEqual(apply_delta(json.loads(json.dumps(before)), delta), after)
+        self.assertIsNone(document_delta(after, after))
+
+    def test_other_top_level_keys_are_kept(self):
+        before = document({"a": "A"})
+        after = dict(document({"a": "A"}), quarantined_timers={"x": {"end_date": "someday"}})
+        delta = document_delta(before, after)
+        self.assertEqual(delta["document_set"], {"quarantined_timers": {"x": {"end_date": "someday"}}})
+        self.assertEqual(apply_delta(json.loads(json.dumps(before)), delta), after)
+        delta = document_delta(after, before)
+        self.assertEqual(delta["document_unset"], ["quarantined_timers"])
+        self.assertEqual(apply_delta(json.loads(json.dumps(after)), delta), before)
+
+
+class TestSnapshotStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.directory = os.path.join(self.tmp_dir.name, "snapshots")
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def take_all(self, store, documents):
+        return [store.take(json.dumps(doc), START + timedelta(minutes=i)) for i, doc in enumerate(documents)]
+
+    def test_bases_deltas_and_materialize(self):
+        store = SnapshotStore(self.directory, deltas_per_base=2)
+        docs = [document({"a": f"A{i}"}) for i in range(5)]
+        infos = self.take_all(store, docs)
+        self.assertEqual([info.kind for info in infos], [KIND_BASE, KIND_DELTA, KIND_DELTA, KIND_BASE, KIND_DELTA])
+        self.assertIsNone(store.take(json.dumps(docs[-1])))
+        for info, doc in zip(infos, docs):
+            self.assertEqual(store.materialize(info.seq), doc)
+        self.assertEqual([info.taken_at for info in store.list()], [START + timedelta(minutes=i) for i in range(5)])
+
+    def test_new_store_continues_the_chain_on_disk(self):
+        self.take_all(SnapshotStore(self.directory), [document({"a": "A"}), document({"a": "B"})])
+        reopened = SnapshotStore(self.directory)
+        info = reopened.take(json.dumps(document({"a": "C"})))
+        self.assertEqual((info.seq, info.kind), (3, KIND_DELTA))
+        self.assertEqual(reopened.materialize(3), document({"a": "C"}))
+
+    def test_retention_drops_whole_old_chains(self):
+        store = SnapshotStore(self.directory, deltas_per_base=1, keep_chains=2)
+        self.take_all(store, [document({"a": str(i)}) for i in range(7)])
+        self.assertEqual([(info.seq, info.kind) for info in store.list()],
+                         [(5, KIND_BASE), (6, KIND_DELTA), (7, KIND_BASE)])
+
+
+if __name__ == '__main__':
+    unittest.main()
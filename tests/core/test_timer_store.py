@@ -0,0 +1,58 @@
+import unittest
+
+from src.core.timer_store import TimerStore
+
+
+class TestTimerStore(unittest.TestCase):
+    def setUp(self):
+        self.scheduled = []
+        self.store = TimerStore({"a": {"title": "A", "sort_order": 0}, "b": {"title": "B", "sort_order": 1}},
+                                schedule_flush=self.scheduled.append)
+        self.received = []
+        self.store.subscribe(self.received.append)
+
+    def test_changes_are_coalesced_into_one_flush(self):
+        self.store.update_fields("a", {"title": "A2"})
+        self.store.update_fields("a", {"sort_order": 5})
+        self.store["c"] = {"title": "C", "sort_order": 2}
+        self.store.update_fields("c", {"title": "C2"}) # Still just "added"
+        del self.store["b"]
+        self.assertEqual(len(self.scheduled), 1)
+        self.scheduled.pop()()
+        self.assertEqual(len(self.received), 1)
+        changes = self.received[0]
+        self.assertEqual(changes.added, {"c"})
+        self.assertEqual(changes.removed, {"b"})
+        self.assertEqual(changes.updated, {"a": {"title", "sort_order"}})
+        self.assertEqual(changes.moved(), {"a"})
+
+    def test_unchanged_values_and_add_then_remove_deliver_nothing(self):
+        self.assertEqual(self.store.update_fields("a", {"title": "A"}), set())
+        self.store["tmp"] = {"title": "T"}
+        del self.store["tmp"]
+        self.store.flush()
+        self.assertEqual(self.received, [])
+
+    def test_subscribers_only_see_fields_they_asked_for(self):
+        titles = []
+        settings = []
+        self.store.subscribe(titles.append, fields=("title",))
+        self.store.subscribe(settings.append, fields=(), settings=True)
+        self.store.update_fields("a", {"sort_order": 3})
+        self.store.flush()
+        self.assertEqual((len(self.received), titles, settings), (1, [], []))
+        self.store.settings_changed("groups")
+        self.store.flush()
+        self.assertEqual(len(settings), 1)
+        self.assertEqual(len(self.received), 1) # Settings-only changes skip record subscribers
+
+    def test_replace_all_is_a_reset(self):
+        self.store.update_fields("a", {"title": "X"})
+        self.store.replace_all({"z": {"title": "Z"}})
+        changes = self.store.flush()
+        self.assertTrue(changes.reset)
+        self.assertEqual(list(self.store), ["z"])
+
+
+if __name__ == '__main__':
+    unittest.main()
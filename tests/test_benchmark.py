@@ -0,0 +1,38 @@
+import unittest
+
+from scripts.benchmark import compare, synthetic_config
+from src.core.config_schema import normalize_document
+
+
+def results(**metrics):
+    return {"scenarios": {"1000-plain": metrics}}
+
+
+class TestSyntheticConfig(unittest.TestCase):
+    def test_is_deterministic_and_already_normalized(self):
+        document = synthetic_config(200, html_comments=True)
+        self.assertEqual(document, synthetic_config(200, html_comments=True))
+        defaults = {"default_bg_color_title": "#000000", "default_bg_color_time": "#000000",
+                    "default_time_text_color": "#FFFFFF", "default_time_font_size": 20}
+        # Loading it must not trigger a migration save, which would skew the load timings
+        _, timers, changed, _ = normalize_document(document, defaults)
+        self.assertFalse(changed)
+        self.assertEqual(len(timers), 200)
+        self.assertGreater(min(len(config["comment"]) for config in timers.values()), 8 * 1024)
+
+
+class TestCompare(unittest.TestCase):
+    def test_flags_only_slowdowns_beyond_tolerance_and_min_delta(self):
+        baseline = results(load_ms=100.0, save_ms=1.0, create_cards_ms=500.0, tick_cpu_ms=0.01)
+        current = results(load_ms=130.0, save_ms=2.5, create_cards_ms=400.0, tick_cpu_ms=0.05)
+        self.assertEqual(compare(current, baseline, tolerance=0.25, min_delta_ms=2.0),
+                         [("1000-plain", "load_ms", 100.0, 130.0)])
+
+    def test_skips_scenarios_and_metrics_missing_on_either_side(self):
+        baseline = {"scenarios": {"1000-plain": {"load_ms": 1.0}, "10-html": {"load_ms": 1.0}}}
+        current = results(save_ms=50.0)
+        self.assertEqual(compare(current, baseline), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
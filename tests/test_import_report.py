@@ -0,0 +1,30 @@
+import unittest
+
+from scripts.import_report import deferred_imports, parse_importtime, startup_imports, total_ms
+
+SAMPLE = """import time: self [us] | cumulative | imported package
+import time:       120 |        120 |     _io
+import time:      2355 |      91398 |   numpy
+import time:     50699 |     181703 | src.main_app
+"""
+
+
+class TestParseImporttime(unittest.TestCase):
+    def test_reads_times_and_nesting(self):
+        records = parse_importtime(SAMPLE + "some other stderr line\n")
+        self.assertEqual([(r.module, r.self_us, r.cumulative_us, r.depth) for r in records],
+                         [("_io", 120, 120, 2), ("numpy", 2355, 91398, 1), ("src.main_app", 50699, 181703, 0)])
+        self.assertAlmostEqual(total_ms(records), 53.174)
+        self.assertEqual(deferred_imports(records), ["numpy"])
+
+
+class TestStartupImports(unittest.TestCase):
+    def test_on_demand_modules_stay_out_of_startup(self):
+        records = startup_imports()
+        modules = {record.module for record in records}
+        self.assertIn("src.main_app", modules)
+        self.assertEqual(deferred_imports(records), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
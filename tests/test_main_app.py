@@ -1,63 +1,456 @@
-import unittest
-import os
+import base64
 import json
-from datetime import datetime, timedelta
-
-# Add src to path to allow importing gui
-import sys
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'src')))
-
-from gui import TimerCard, App # Assuming your main GUI file is gui.py
-
-class TestTimerCard(unittest.TestCase):
-    def test_timer_card_creation(self):
-        # Create a dummy master widget for testing
-        master = App() # Or a simpler tk.Tk() if App has too many dependencies
-        title = "Test Event"
-        # Set end_date to tomorrow
-        end_date = (datetime.now() + timedelta(days=1)).strftime("%Y-%m-%d")
-        card = TimerCard(master, title, end_date)
-        self.assertEqual(card.title, title)
-        self.assertEqual(card.days_remaining, 1)
-        master.destroy() # Clean up the master widget
-
-class TestApp(unittest.TestCase):
-    def setUp(self):
-        # Create a dummy timers.json for testing
-        self.test_timers_file = "test_timers.json"
-        self.sample_data = [
-            {"title": "Test1", "end_date": (datetime.now() + timedelta(days=5)).strftime("%Y-%m-%d")},
-            {"title": "Test2", "end_date": (datetime.now() + timedelta(days=10)).strftime("%Y-%m-%d")}
-        ]
-        with open(self.test_timers_file, "w") as f:
-            json.dump(self.sample_data, f)
+import os
+import shutil
+import tempfile
+import unittest
+from datetime import datetime
+from unittest import mock
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen") # Run without a display
+
+from PySide6.QtCore import QMimeData, QPointF, Qt
+from PySide6.QtGui import QDropEvent
+from PySide6.QtTest import QTest
+from PySide6.QtWidgets import QApplication, QDialog, QSystemTrayIcon
 
-        # Temporarily replace the original timers.json path in the App
-        self.original_timers_json_path = App.load_timers.__globals__['open']
-        App.load_timers.__globals__['open'] = lambda path, mode: open(self.test_timers_file if path == "timers.json" else path, mode)
+from src import main_app
+from src.core.assets import asset_references
+from src.core.clock import SimulatedClock
+from src.components.timer_card import TimerCard
 
+NOW = datetime(2025, 3, 1, 9, 30)
+
+
+def timer(title, end_date, sort_order):
+    return {"title": title, "end_date": end_date, "sort_order": sort_order}
+
+
+class AppTestCase(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.qt_app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.original_config_file = main_app.CONFIG_FILE
+        self.original_holiday_file = main_app.HOLIDAY_FILE
+        main_app.CONFIG_FILE = os.path.join(self.temp_dir, "timers_config.json")
+        main_app.HOLIDAY_FILE = os.path.join(self.temp_dir, "holidays.json") # None there: no local holidays
+        self.windows = []
 
     def tearDown(self):
-        # Clean up the dummy timers.json
-        if os.path.exists(self.test_timers_file):
-            os.remove(self.test_timers_file)
-        # Restore the original open function
-        App.load_timers.__globals__['open'] = self.original_timers_json_path
-
-    def test_app_loads_timers(self):
-        app = App()
-        # Check if cards are created (adjust based on how cards are stored in App)
-        # This is a basic check, more specific checks might be needed
-        self.assertTrue(len(app.winfo_children()) >= len(self.sample_data))
-        app.destroy()
-
-    def test_app_handles_missing_timers_file(self):
-        if os.path.exists(self.test_timers_file):
-            os.remove(self.test_timers_file)
-        app = App()
-        # Check that the app starts without errors and no cards are loaded
-        self.assertEqual(len(app.winfo_children()), 0) # Assuming no other widgets are added by default
-        app.destroy()
+        for window in self.windows:
+            window.close()
+            window.deleteLater()
+        self.qt_app.processEvents()
+        main_app.CONFIG_FILE = self.original_config_file
+        main_app.HOLIDAY_FILE = self.original_holiday_file
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def write_config(self, timers, settings=None):
+        with open(main_app.CONFIG_FILE, 'w') as f:
+            json.dump({"global_settings": settings or {}, "timers": timers}, f)
+
+    def saved_timers(self):
+        with open(main_app.CONFIG_FILE, 'r') as f:
+            return json.load(f)["timers"]
+
+    def make_app(self):
+        window = main_app.App(clock=SimulatedClock(NOW))
+        self.windows.append(window)
+        return window
+
+
+class TestApp(AppTestCase):
+    def test_loads_timers_into_cards_in_order(self):
+        self.write_config({
+            "timer_b": timer("Second", "2025-03-11 00:00:00", 1),
+            "timer_a": timer("First", "2025-03-06", 0), # Non-canonical dates are normalized on load
+        })
+        window = self.make_app()
+        self.assertEqual(window.timer_configs["timer_a"]["end_date"], "2025-03-06 00:00:00")
+        first_card = window.timers_layout.itemAt(0).widget()
+        self.assertEqual(first_card.card_id, "timer_a")
+        self.assertEqual(first_card.time_label.text(), "5")
+        self.assertEqual(window.timers["timer_b"].time_label.text(), "10")
+
+    def test_starts_empty_without_a_config_file(self):
+        window = self.make_app()
+        self.assertEqual(len(window.timer_configs), 0)
+        self.assertEqual(window.timers, {})
+
+    def test_add_and_delete_are_saved_once_the_store_flushes(self):
+        window = self.make_app()
+        window.add_new_timer_action(title="Launch")
+        self.qt_app.processEvents()
+        (card_id, saved), = self.saved_timers().items()
+        self.assertEqual(saved["title"], "Launch")
+        self.assertEqual(saved["end_date"], "2025-03-02 00:00:00") # Tomorrow on the app's clock
+        self.assertIn(card_id, window.timers)
+
+        window.delete_timer_config_and_card(card_id)
+        self.qt_app.processEvents()
+        self.assertEqual(self.saved_timers(), {})
+        self.assertNotIn(card_id, window.timers)
+
+    def test_unreadable_timers_are_set_aside_not_deleted(self):
+        self.write_config({"timer_a": timer("Fine", "2025-03-03 00:00:00", 0),
+                           "timer_b": {"title": "Broken", "end_date": "someday"}})
+        with mock.patch.object(main_app.QMessageBox, "warning") as warning:
+            window = self.make_app()
+            window.take_snapshot().result()
+            self.qt_app.processEvents()
+        self.assertEqual(list(window.timers), ["timer_a"])
+        self.assertIn("1 timer could not be read", warning.call_args.args[2])
+        with open(main_app.CONFIG_FILE, 'r') as f:
+            saved = json.load(f)
+        self.assertEqual(saved["quarantined_timers"], {"timer_b": {"title": "Broken", "end_date": "someday"}})
+        oldest = window.snapshot_store.list()[0] # The file as it was before the rewrite
+        self.assertIn("timer_b", window.snapshot_store.materialize(oldest.seq)["timers"])
+
+    def test_file_from_a_newer_version_is_never_overwritten(self):
+        document = {"schema_version": 99, "global_settings": {"card_render_cache_mb": "abc"},
+                    "timers": {"timer_a": dict(timer("Soon", "2025-03-11", 0), new_field=[1, 2])}, "new_section": {}}
+        with open(main_app.CONFIG_FILE, 'w') as f:
+            json.dump(document, f)
+        with mock.patch.object(main_app.QMessageBox, "warning") as warning:
+            window = self.make_app()
+            self.qt_app.processEvents()
+        self.assertIn("read-only", warning.call_args.args[2])
+        self.assertEqual(window.timers["timer_a"].time_label.text(), "10")
+        window.add_new_timer_action()
+        window.timer_store.flush()
+        window.save_app_settings_and_timers()
+        with open(main_app.CONFIG_FILE, 'r') as f:
+            self.assertEqual(json.load(f), document)
+
+    def test_undoing_an_add_collapses_the_group_again(self):
+        self.write_config({"timer_a": dict(timer("Work item", "2025-03-11 00:00:00", 0), group="Work")},
+                          {"groups": ["Work"], "collapsed_groups": ["Work"]})
+        window = self.make_app()
+        window.add_new_timer_action(group="Work")
+        self.qt_app.processEvents()
+        self.assertEqual(window.global_settings["collapsed_groups"], [])
+        self.assertTrue(window.group_sections["Work"].is_expanded())
+        window.undo()
+        self.qt_app.processEvents()
+        self.assertEqual(list(window.timer_configs), ["timer_a"])
+        self.assertEqual(window.global_settings["collapsed_groups"], ["Work"])
+        self.assertFalse(window.group_sections["Work"].is_expanded())
+
+    def test_clock_moves_update_the_board(self):
+        self.write_config({"timer_a": timer("Soon", "2025-03-03 00:00:00", 0)})
+        window = self.make_app()
+        window.clock.advance(days=1)
+        self.assertEqual(window.timers["timer_a"].time_label.text(), "1")
+        window.clock.advance(days=2)
+        self.assertEqual(window.timers["timer_a"].time_label.text(), "Ended")
+
+    def test_ended_timer_given_a_recurrence_counts_down_again(self):
+        self.write_config({"timer_a": timer("Yearly", "2025-02-27 00:00:00", 0)})
+        window = self.make_app()
+        self.assertEqual(window.timers["timer_a"].time_label.text(), "Ended")
+        window.update_timer_config("timer_a", {"recurrence": {"freq": "yearly", "interval": 1}})
+        self.qt_app.processEvents()
+        self.assertEqual(window.timers["timer_a"].time_label.text(), "363")
+        window.clock.advance(days=1)
+        self.assertEqual(window.timers["timer_a"].time_label.text(), "362")
+
+    def test_reminder_lead_days_follow_the_settings(self):
+        self.write_config({"timer_a": timer("Soon", "2025-03-11 00:00:00", 0)}, {"reminder_lead_days": "7"})
+        window = self.make_app() # A bad value falls back to the default instead of failing startup
+        self.assertEqual(window.expiry_scheduler.lead_days, (7, 1))
+        window.global_settings["reminder_lead_days"] = [3]
+        window.timer_store.settings_changed("reminder_lead_days")
+        window.timer_store.flush()
+        self.assertEqual(window.expiry_scheduler.lead_days, (3,))
+        with mock.patch.object(window, "_notify_expiry") as notify:
+            window.clock.advance(days=7)
+        self.assertEqual(notify.call_args_list, [mock.call("timer_a", 3)])
+        self.write_config({"timer_a": timer("Soon", "2025-03-11 00:00:00", 0)}, {"reminder_lead_days": [2]})
+        window.load_app_settings_and_timers() # A reload brings its own lead times
+        window.timer_store.flush()
+        self.assertEqual(window.expiry_scheduler.lead_days, (2,))
+
+    def test_restoring_a_snapshot_applies_its_settings(self):
+        self.write_config({"timer_a": timer("Soon", "2025-03-11 00:00:00", 0)},
+                          {"reminder_lead_days": [3], "main_window_transparent_background": True, "main_window_opacity_level": 0.5})
+        window = self.make_app()
+        first = window.take_snapshot().result() # The file as loaded, which leaves out most settings
+        window.update_global_main_window_transparency(False)
+        window.global_settings["reminder_lead_days"] = [5]
+        window.global_settings["close_to_tray"] = True
+        window.timer_store.settings_changed("reminder_lead_days", "close_to_tray")
+        window.take_snapshot().result()
+        self.assertEqual(window.expiry_scheduler.lead_days, (5,))
+        window.restore_snapshot(first.seq)
+        window.timer_store.flush()
+        self.assertEqual(window.expiry_scheduler.lead_days, (3,))
+        self.assertAlmostEqual(window.windowOpacity(), 0.5, places=2)
+        self.assertFalse(window.global_settings["close_to_tray"]) # Missing from the snapshot: the default
+        with open(main_app.CONFIG_FILE, 'r') as f:
+            self.assertEqual(json.load(f)["global_settings"]["reminder_lead_days"], [3])
+
+    def test_comment_images_are_moved_to_the_asset_store(self):
+        inline = '<p>Map</p><img src="data:image/png;base64,' + base64.b64encode(b"image bytes").decode() + '" />'
+        self.write_config({"timer_a": dict(timer("Trip", "2025-03-03 00:00:00", 0), comment=inline)})
+        window = self.make_app()
+        saved = self.saved_timers()["timer_a"]["comment"] # Rewritten once on load
+        name, = asset_references(saved)
+        self.assertNotIn("base64", saved)
+        self.assertEqual(window.timer_configs["timer_a"]["comment"], saved)
+        with open(os.path.join(self.temp_dir, "assets", name), 'rb') as f:
+            self.assertEqual(f.read(), b"image bytes")
+
+        edited = '<p>Route</p><img src="data:image/png;base64,' + base64.b64encode(b"other bytes").decode() + '" />'
+        window.update_timer_config("timer_a", {"comment": edited})
+        self.qt_app.processEvents()
+        self.assertNotIn("base64", self.saved_timers()["timer_a"]["comment"])
+        self.assertEqual(len(os.listdir(os.path.join(self.temp_dir, "assets"))), 2)
+
+    def test_unused_comment_images_are_swept(self):
+        store_dir = os.path.join(self.temp_dir, "assets")
+        os.makedirs(store_dir)
+        names = {key: f"{key * 32}.png" for key in "abc"}
+        for name in names.values():
+            open(os.path.join(store_dir, name), 'w').close()
+        comment = lambda key: f'<img src="assets/{names[key]}" />'
+        self.write_config({"timer_a": dict(timer("A", "2025-03-11 00:00:00", 0), comment=comment("a")),
+                           "timer_b": dict(timer("B", "2025-03-12 00:00:00", 1), comment=comment("b"))})
+        window = self.make_app()
+        window.delete_timer_config_and_card("timer_b")
+        self.qt_app.processEvents()
+        self.assertEqual(window.sweep_unused_assets(), [names["c"]]) # b can still be undone
+        window.history.clear()
+        window.take_snapshot().result()
+        self.assertEqual(window.sweep_unused_assets(), []) # The snapshot of the loaded file still holds b
+        self.assertEqual(sorted(os.listdir(store_dir)), [names["a"], names["b"]])
+
+    def test_dragging_a_card_shows_a_placeholder_and_drops_in_one_move(self):
+        self.write_config({f"timer_{i}": timer(f"T{i}", "2025-03-10 00:00:00", i) for i in range(6)})
+        window = self.make_app()
+        window.show()
+        self.qt_app.processEvents()
+        cards = [window.timers_layout.itemAt(i).widget() for i in range(6)]
+        drop_y = (cards[1].geometry().bottom() + cards[2].y()) / 2 # Between the second and third card
+        mime_data = QMimeData()
+        mime_data.setText("timer_5")
+        window.drag_reorder.hover(QPointF(10, drop_y))
+        placeholder = window.drag_reorder.placeholder
+        self.assertTrue(placeholder.isVisible())
+        self.assertTrue(cards[1].geometry().bottom() <= placeholder.geometry().center().y() <= cards[2].y())
+
+        window.dropEvent(QDropEvent(QPointF(10, drop_y), Qt.DropAction.MoveAction, mime_data,
+                                    Qt.MouseButton.LeftButton, Qt.KeyboardModifier.NoModifier))
+        self.assertFalse(placeholder.isVisible())
+        self.assertEqual([window.timers_layout.itemAt(i).widget().card_id for i in range(6)],
+                         ["timer_0", "timer_1", "timer_5", "timer_2", "timer_3", "timer_4"])
+        self.qt_app.processEvents()
+        self.assertEqual(self.saved_timers()["timer_5"]["sort_order"], 2)
+
+    def test_launch_requests_add_and_import_timers_in_one_step(self):
+        window = self.make_app()
+        import_file = os.path.join(self.temp_dir, "import.json")
+        with open(import_file, 'w') as f:
+            json.dump([{"title": "Imported", "end_date": "2025-04-01"}, {"title": "Bad", "end_date": "soon"}], f)
+        replies = window.apply_launch_commands([{"op": "show"}, {"op": "add", "title": "Added"},
+                                                {"op": "import", "path": import_file},
+                                                {"op": "import", "path": os.path.join(self.temp_dir, "missing.json")}])
+        self.assertEqual([reply["ok"] for reply in replies], [True, True, False, False])
+        self.assertEqual(replies[2]["added"], 1)
+        self.assertTrue(window.isVisible())
+        saved = {config["title"]: config for config in self.saved_timers().values()}
+        self.assertEqual(sorted(saved), ["Added", "Imported"])
+        self.assertEqual(saved["Added"]["end_date"], "2025-03-02 00:00:00") # Tomorrow by default
+        window.undo()
+        self.qt_app.processEvents()
+        self.assertEqual(self.saved_timers(), {})
+
+
+class TestSharedSettingsDialog(AppTestCase):
+    def make_app_with_two_timers(self):
+        self.write_config({
+            "timer_a": dict(timer("First", "2025-03-06 00:00:00", 0), comment="<p>About A</p>", bg_color_title="#112233"),
+            "timer_b": timer("Second", "2025-03-11 00:00:00", 1),
+        })
+        return self.make_app()
+
+    def open_settings(self, window, card_id, edit, accept=True):
+        # Runs the card's settings dialog with edit(dialog) standing in for the user
+        def run(dialog):
+            self.assertIs(dialog.parent_card, window.timers[card_id])
+            edit(dialog)
+            if accept:
+                dialog.accept()
+                return QDialog.DialogCode.Accepted
+            dialog.reject()
+            return QDialog.DialogCode.Rejected
+        dialog = window.get_timer_settings_dialog()
+        with mock.patch.object(dialog, "exec", side_effect=lambda: run(dialog)):
+            window.timers[card_id]._open_settings_dialog()
+        self.qt_app.processEvents()
+        return dialog
+
+    def test_one_dialog_is_rebound_to_each_card(self):
+        window = self.make_app_with_two_timers()
+        first = self.open_settings(window, "timer_a", lambda dialog: None, accept=False)
+        self.assertIsNone(first.parent_card) # Unbound once closed
+        second = self.open_settings(window, "timer_b", lambda dialog: None, accept=False)
+        self.assertIs(first, second)
+
+    def test_editing_the_second_card_leaves_the_first_alone(self):
+        window = self.make_app_with_two_timers()
+        self.open_settings(window, "timer_a", lambda dialog: dialog.title_entry.setText("First, renamed"))
+        self.open_settings(window, "timer_b", lambda dialog: dialog.title_entry.setText("Second, renamed"))
+        self.assertEqual(window.timer_configs["timer_a"]["title"], "First, renamed")
+        self.assertEqual(window.timer_configs["timer_b"]["title"], "Second, renamed")
+        self.assertEqual(window.timer_configs["timer_a"]["end_date"], "2025-03-06 00:00:00")
+        self.assertEqual(window.timer_configs["timer_a"]["bg_color_title"], "#112233")
+
+    def test_rebinding_clears_what_the_previous_card_left(self):
+        window = self.make_app_with_two_timers()
+        def edit_without_saving(dialog):
+            dialog.comment_textbox.insertPlainText("unsaved")
+            dialog.set_default_title_color_checkbox.setChecked(True)
+            dialog._temp_selected_time_text_color = "#abcdef"
+        self.open_settings(window, "timer_a", edit_without_saving, accept=False)
+        seen = {}
+        def look(dialog):
+            seen["title"] = dialog.title_entry.text()
+            seen["comment"] = dialog.comment_textbox.toPlainText()
+            seen["undo"] = dialog.comment_textbox.document().isUndoAvailable()
+            seen["set_default"] = dialog.set_default_title_color_checkbox.isChecked()
+            seen["config"] = dialog.get_updated_config()
+        self.open_settings(window, "timer_b", look, accept=False)
+        self.assertEqual(seen["title"], "Second")
+        self.assertEqual(seen["comment"], "")
+        self.assertFalse(seen["undo"])
+        self.assertFalse(seen["set_default"])
+        self.assertEqual(seen["config"]["bg_color_title"], main_app.DEFAULT_TITLE_BG_COLOR)
+        self.assertEqual(seen["config"]["text_color_time"], main_app.DEFAULT_TIME_TEXT_COLOR)
+        self.assertNotIn("About A", window.timer_configs["timer_b"].get("comment") or "")
+
+
+class TestRefreshPausing(AppTestCase):
+    def show(self, window):
+        window.show()
+        QTest.qWaitForWindowExposed(window)
+        self.qt_app.processEvents() # The refresh state follows the expose event on the next pass
+
+    def make_shown_app(self):
+        self.write_config({"timer_a": timer("Soon", "2025-03-05 12:00:00", 0)})
+        window = self.make_app()
+        self.show(window)
+        self.assertTrue(window.tick_timer.isActive())
+        return window
+
+    def test_refreshing_stops_while_hidden_or_minimized(self):
+        window = self.make_shown_app()
+        window.hide()
+        self.qt_app.processEvents()
+        self.assertFalse(window.tick_timer.isActive())
+        self.show(window)
+        self.assertTrue(window.tick_timer.isActive())
+        window.showMinimized()
+        self.qt_app.processEvents()
+        self.assertFalse(window.tick_timer.isActive())
+
+    def test_showing_the_window_catches_the_board_up_at_once(self):
+        window = self.make_shown_app()
+        self.assertEqual(window.timers["timer_a"].time_label.text(), "4")
+        window.hide()
+        self.qt_app.processEvents()
+        # Time passes while hidden without the app hearing of it, as with the system clock
+        window.clock = SimulatedClock(datetime(2025, 3, 3, 9, 30))
+        self.show(window) # Returns long before the next tick would be due
+        self.assertEqual(window.timers["timer_a"].time_label.text(), "2")
+
+    def test_expiry_timer_keeps_running_while_hidden(self):
+        window = self.make_shown_app()
+        self.assertTrue(window.expiry_timer.isActive())
+        window.hide()
+        self.qt_app.processEvents()
+        self.assertTrue(window.expiry_timer.isActive())
+        with mock.patch.object(window, "_notify_expiry") as notify:
+            window.clock.advance(days=5)
+        self.assertIn(mock.call("timer_a", 0), notify.call_args_list)
+
+
+class TestTrayMode(AppTestCase):
+    def test_tray_mode_destroys_the_window_and_rebuilds_it_on_show(self):
+        self.write_config({"timer_a": timer("Later", "2025-03-20 00:00:00", 0),
+                           "timer_b": timer("Soon", "2025-03-04 00:00:00", 1),
+                           "timer_c": timer("Ended", "2025-02-27 00:00:00", 2)})
+        window = self.make_app()
+        window.show()
+        self.qt_app.processEvents()
+        with mock.patch.object(QSystemTrayIcon, "isSystemTrayAvailable", return_value=True):
+            self.assertTrue(window.enter_tray_mode())
+        self.assertEqual(window.timers, {})
+        self.assertIsNone(window.centralWidget())
+        self.assertEqual(window.internalWinId(), 0)
+        self.assertFalse(any(isinstance(w, TimerCard) for w in QApplication.allWidgets()))
+        self.assertFalse(window.tick_timer.isActive())
+        self.assertEqual(window.tray.tray_icon.toolTip().splitlines()[1:], ["Soon: 3 days", "Later: 19 days"])
+
+        window.add_new_timer_action(title="Tomorrow") # Records still change with no board
+        self.qt_app.processEvents()
+        self.assertEqual(window.timers, {})
+        self.assertEqual(window.tray.tray_icon.toolTip().splitlines()[1], "Tomorrow: 1 day")
+
+        window.show_window()
+        self.qt_app.processEvents()
+        self.assertFalse(window.tray_mode)
+        self.assertTrue(window.isVisible())
+        self.assertEqual(len(window.timers), 4)
+        self.assertEqual(window.timers["timer_b"].time_label.text(), "3")
+        self.assertTrue(QApplication.quitOnLastWindowClosed())
+
+    def test_close_to_tray_that_fails_still_closes(self):
+        self.write_config({"timer_a": timer("Soon", "2025-03-04 00:00:00", 0)}, {"close_to_tray": True})
+        window = self.make_app()
+        window.show()
+        self.qt_app.processEvents()
+        with mock.patch.object(QSystemTrayIcon, "isSystemTrayAvailable", return_value=True), \
+                mock.patch.object(window, "enter_tray_mode", return_value=False):
+            window.close()
+            self.assertTrue(window.isVisible()) # The close waits for the tray
+            self.qt_app.processEvents()
+        self.assertTrue(window.shut_down)
+        self.assertFalse(window.isVisible())
+
+    def test_close_without_a_tray_closes(self):
+        self.write_config({"timer_a": timer("Soon", "2025-03-04 00:00:00", 0)}, {"close_to_tray": True})
+        window = self.make_app()
+        window.show()
+        self.qt_app.processEvents()
+        with mock.patch.object(QSystemTrayIcon, "isSystemTrayAvailable", return_value=False):
+            window.close()
+        self.assertTrue(window.shut_down)
+        self.assertFalse(window.isVisible())
+
+    def test_notifications_in_tray_mode_do_not_use_the_destroyed_window(self):
+        self.write_config({"timer_a": timer("Soon", "2025-03-04 00:00:00", 0)})
+        window = self.make_app()
+        with mock.patch.object(QSystemTrayIcon, "isSystemTrayAvailable", return_value=True), \
+                mock.patch.object(QSystemTrayIcon, "supportsMessages", return_value=False):
+            self.assertTrue(window.enter_tray_mode())
+            window.get_notifier().notify("Countdown Timer", "'Soon' is due.")
+        toast = window.notifier.floating_toast
+        self.assertIsNone(toast.parentWidget())
+        self.assertTrue(toast.isVisible())
+        self.assertIn("'Soon' is due.", toast.text())
+        toast.deleteLater()
+
+    def test_stays_a_window_without_a_system_tray(self):
+        self.write_config({"timer_a": timer("Soon", "2025-03-04 00:00:00", 0)})
+        window = self.make_app()
+        with mock.patch.object(QSystemTrayIcon, "isSystemTrayAvailable", return_value=False):
+            self.assertFalse(window.enter_tray_mode())
+        self.assertFalse(window.tray_mode)
+        self.assertIn("timer_a", window.timers)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,55 @@
+import json
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+
+from scripts.import_report import parse_importtime
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RUN_PY = os.path.join(PROJECT_ROOT, "run.py")
+START_TIMEOUT_S = 30
+
+
+@unittest.skipUnless(hasattr(socket, "AF_UNIX"), "needs Unix sockets")
+class TestSecondLaunch(unittest.TestCase):
+    def test_second_launch_forwards_to_the_running_app_without_qt(self):
+        with tempfile.TemporaryDirectory() as work_dir:
+            env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+            first = subprocess.Popen([sys.executable, RUN_PY], cwd=work_dir, env=env,
+                                     stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            try:
+                deadline = time.monotonic() + START_TIMEOUT_S
+                while not os.path.exists(os.path.join(work_dir, "data", "instance.sock")):
+                    self.assertLess(time.monotonic(), deadline, "the first launch never claimed the instance socket")
+                    time.sleep(0.05)
+                second = subprocess.run([sys.executable, "-X", "importtime", RUN_PY, "--add", "From second launch"],
+                                        cwd=work_dir, env=env, capture_output=True, text=True, timeout=START_TIMEOUT_S)
+                self.assertEqual(second.returncode, 0, second.stderr[-2000:])
+                modules = {record.module for record in parse_importtime(second.stderr)}
+                self.assertFalse({module for module in modules if module.startswith("PySide6")})
+                with open(os.path.join(work_dir, "data", "timers_config.json")) as f:
+                    titles = [config["title"] for config in json.load(f)["timers"].values()]
+                self.assertEqual(titles, ["From second launch"])
+            finally:
+                first.terminate()
+                first.wait(START_TIMEOUT_S)
+
+
+class TestQtArguments(unittest.TestCase):
+    def test_qt_options_reach_qt(self):
+        with tempfile.TemporaryDirectory() as work_dir:
+            probe_file = os.path.join(work_dir, "first_window.txt")
+            env = dict(os.environ, COUNTDOWN_STARTUP_PROBE=probe_file)
+            env.pop("QT_QPA_PLATFORM", None) # Only the command line asks for offscreen
+            completed = subprocess.run([sys.executable, RUN_PY, "-platform", "offscreen"], cwd=work_dir, env=env,
+                                       capture_output=True, text=True, timeout=START_TIMEOUT_S)
+            self.assertEqual(completed.returncode, 0, completed.stderr[-2000:])
+            self.assertTrue(os.path.exists(probe_file))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import os
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen") # Run without a display
+
+from PySide6.QtWidgets import QApplication, QWidget
+
+from src.components.card_render_cache import CardRenderCache
+from src.components.timer_card import TimerCard
+
+END_DATE = "2030-01-01 00:00:00"
+
+
+class Board(QWidget):
+    # Stands in for the app: cards pick up its render cache
+    def __init__(self, cache):
+        super().__init__()
+        self.card_render_cache = cache
+
+
+class TestCardRenderCache(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.qt_app = QApplication.instance() or QApplication([])
+
+    def make_card(self, host, title, **config):
+        return TimerCard(None, title, END_DATE, f"timer_{title}", host, dict(config, title=title, end_date=END_DATE))
+
+    def test_cards_that_look_the_same_share_an_image(self):
+        cache = CardRenderCache()
+        board = Board(cache)
+        first, second = self.make_card(board, "Trip"), self.make_card(board, "Trip")
+        first.set_countdown_value(3)
+        second.set_countdown_value(3)
+        self.assertIs(cache.pixmap(first), cache.pixmap(second))
+        second.set_countdown_value(2)
+        self.assertIsNot(cache.pixmap(first), cache.pixmap(second))
+        self.assertEqual(len(cache.pixmaps), 2)
+
+    def test_image_matches_the_uncached_card(self):
+        card = self.make_card(Board(None), "Plain", bg_color_title="#123456", font_size_time=30)
+        cached = self.make_card(Board(CardRenderCache()), "Plain", bg_color_title="#123456", font_size_time=30)
+        for each in (card, cached):
+            each.set_countdown_value(12)
+        self.assertTrue(cached.title_label.isHidden())
+        self.assertEqual(cached.grab().toImage(), card.grab().toImage())
+
+    def test_least_recently_used_images_are_evicted(self):
+        board = Board(None)
+        cards = [self.make_card(board, f"T{i}") for i in range(3)]
+        one_image = CardRenderCache()._cost(CardRenderCache().pixmap(cards[0]))
+        cache = CardRenderCache(max_bytes=2 * one_image)
+        cache.pixmap(cards[0])
+        cache.pixmap(cards[1])
+        cache.pixmap(cards[0]) # Now the most recently used
+        cache.pixmap(cards[2])
+        self.assertEqual([key[4] for key in cache.pixmaps], ["T0", "T2"])
+        self.assertEqual(cache.total_bytes, 2 * one_image)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import os
+import tempfile
+import unittest
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen") # Run without a display
+
+from PySide6.QtCore import QBuffer, QByteArray, QPointF, QUrl
+from PySide6.QtGui import QColor, QEnterEvent, QImage
+from PySide6.QtWidgets import QApplication, QWidget
+
+from src.components.timer_card import TimerCard
+from src.core.assets import AssetStore
+from src.core.metrics import metrics
+from src.ui.comment_preview import THUMBNAIL_MAX_PX, _has_text_cache, comment_has_text, comment_tooltip_html, thumbnail_path
+
+
+def png_bytes(width, height):
+    image = QImage(width, height, QImage.Format.Format_RGB32)
+    image.fill(QColor("#336699"))
+    buffer_data = QByteArray()
+    buffer = QBuffer(buffer_data)
+    buffer.open(QBuffer.OpenModeFlag.WriteOnly)
+    image.save(buffer, "PNG")
+    return bytes(buffer_data)
+
+
+class TestCommentPreview(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.qt_app = QApplication.instance() or QApplication([])
+
+    def setUp(self):
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.store = AssetStore(os.path.join(self.tmp_dir.name, "assets"))
+
+    def tearDown(self):
+        self.tmp_dir.cleanup()
+
+    def test_thumbnails_are_downscaled_and_reused(self):
+        name = self.store.put(png_bytes(800, 400), "png")
+        path = thumbnail_path(self.store, name)
+        self.assertEqual(QImage(path).size().toTuple(), (THUMBNAIL_MAX_PX, THUMBNAIL_MAX_PX // 2))
+        modified = os.path.getmtime(path)
+        self.assertEqual(thumbnail_path(self.store, name), path)
+        self.assertEqual(os.path.getmtime(path), modified)
+        self.assertIsNone(thumbnail_path(self.store, "0000.png")) # Missing asset
+
+    def test_tooltip_shows_thumbnails(self):
+        name = self.store.put(png_bytes(40, 30), "png")
+        html = f'<p>Floor plan</p><img src="assets/{name}" />'
+        tooltip = comment_tooltip_html(html, self.store)
+        self.assertIn(QUrl.fromLocalFile(thumbnail_path(self.store, name)).toString(), tooltip)
+        self.assertIs(comment_tooltip_html(html, self.store), tooltip) # Prepared once per comment
+        self.assertEqual(comment_tooltip_html(html, None), html)
+
+    def test_has_text(self):
+        self.assertTrue(comment_has_text("<p>Bring <b>cake</b></p>"))
+        self.assertFalse(comment_has_text("<p> </p><p></p>"))
+
+    def test_long_comments_are_cached_by_digest(self):
+        html = f'<p>Scan</p><img src="data:image/png;base64,{"A" * 100000}" />'
+        self.assertTrue(comment_has_text(html))
+        self.assertTrue(comment_has_text(html))
+        self.assertNotIn(html, _has_text_cache.entries)
+        self.assertTrue(all(len(key) < 1024 for key in _has_text_cache.entries))
+
+    def test_a_hover_times_the_tooltip_once(self):
+        host = QWidget()
+        end_date = "2030-01-01 00:00:00"
+        card = TimerCard(None, "Trip", end_date, "timer_trip", host, {"title": "Trip", "end_date": end_date, "comment": "<p>Pack</p>"})
+        metrics.reset()
+        card.enterEvent(QEnterEvent(QPointF(1, 1), QPointF(1, 1), QPointF(1, 1)))
+        card._show_comment_tooltip() # What the hover timer runs once it fires
+        self.assertEqual(metrics.histograms["tooltip.prepare_ms"].count, 1)
+        host.deleteLater()
+
+
+if __name__ == '__main__':
+    unittest.main()
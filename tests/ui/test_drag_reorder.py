@@ -0,0 +1,25 @@
+import unittest
+
+from src.components.drag_reorder import AUTOSCROLL_MARGIN, AUTOSCROLL_MAX_STEP, autoscroll_step, insertion_slot
+
+
+class TestDragReorderHelpers(unittest.TestCase):
+    def test_insertion_slot(self):
+        middles = [55.0, 171.0, 287.0]
+        self.assertEqual(insertion_slot(middles, 0), 0)
+        self.assertEqual(insertion_slot(middles, 55), 1) # On the middle: after that card
+        self.assertEqual(insertion_slot(middles, 200), 2)
+        self.assertEqual(insertion_slot(middles, 1000), 3)
+        self.assertEqual(insertion_slot([], 10), 0)
+
+    def test_autoscroll_step(self):
+        self.assertEqual(autoscroll_step(300, 600), 0)
+        self.assertEqual(autoscroll_step(0, 600), -AUTOSCROLL_MAX_STEP)
+        self.assertEqual(autoscroll_step(-40, 600), -AUTOSCROLL_MAX_STEP) # Past the edge: no faster
+        self.assertEqual(autoscroll_step(600, 600), AUTOSCROLL_MAX_STEP)
+        slow = autoscroll_step(600 - AUTOSCROLL_MARGIN + 1, 600)
+        self.assertTrue(0 < slow < AUTOSCROLL_MAX_STEP)
+
+
+if __name__ == '__main__':
+    unittest.main()